@@ -0,0 +1,77 @@
+"""
+Compare archive storage with PNG files, and time archive writes and random reads.
+
+Run from the repository root:
+    python -m qr_code.benchmarks.bench_archive
+"""
+
+import argparse
+import io
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from qr_code.custom_generator import generate_many
+from qr_code.custom_generator.archive import ArchiveReader, ArchiveWriter
+from qr_code.custom_generator.plot_png import write_png
+
+
+def main():
+    """
+    Print storage per code for both formats, then archive timings.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=5000)
+    parser.add_argument("--payload-size", type=int, default=60)
+    parser.add_argument("--reads", type=int, default=100000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    payloads = [
+        f"https://example.com/{index}/".ljust(args.payload_size, "x")
+        for index in range(args.count)
+    ]
+    matrices = [result.matrix for result in generate_many(payloads)]
+
+    png_bytes = 0
+    for matrix in matrices[:100]:
+        f = io.BytesIO()
+        write_png(f, matrix=matrix)
+        png_bytes += len(f.getvalue())
+    png_bytes_per_code = png_bytes / min(100, len(matrices))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "codes.qrar"
+        start = time.perf_counter()
+        with ArchiveWriter(path) as writer:
+            for payload, matrix in zip(payloads, matrices):
+                writer.append(payload, matrix)
+        write_seconds = time.perf_counter() - start
+        archive_bytes_per_code = path.stat().st_size / args.count
+
+        with ArchiveReader(path) as reader:
+            indices = [random.randrange(args.count) for _ in range(args.reads)]
+            start = time.perf_counter()
+            for index in indices:
+                reader[index]
+            read_seconds = (time.perf_counter() - start) / args.reads
+
+            start = time.perf_counter()
+            for index in indices[: args.reads // 10]:
+                reader.get_by_payload(payloads[index])
+            lookup_seconds = (time.perf_counter() - start) / (args.reads // 10)
+
+    print(f"{args.count} codes of {matrices[0].shape[0]} modules, quiet zone included")
+    print(f"PNG     {png_bytes_per_code:>8.0f} bytes per code")
+    print(
+        f"archive {archive_bytes_per_code:>8.0f} bytes per code, "
+        f"{png_bytes_per_code / archive_bytes_per_code:.0f}x smaller"
+    )
+    print(f"write   {1e6 * write_seconds / args.count:>8.1f} us per code")
+    print(f"read    {1e6 * read_seconds:>8.1f} us per random index")
+    print(f"lookup  {1e6 * lookup_seconds:>8.1f} us per payload")
+
+
+if __name__ == "__main__":
+    main()
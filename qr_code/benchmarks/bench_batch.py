@@ -0,0 +1,62 @@
+"""
+Measure generate_many throughput against the number of worker processes.
+
+Run from the repository root:
+    python -m qr_code.benchmarks.bench_batch
+"""
+
+import argparse
+import os
+import random
+import string
+import time
+
+from qr_code.custom_generator import generate_many
+
+
+def get_payloads(count: int) -> list:
+    """
+    Random URL-like payloads of varying lengths.
+    """
+    return [
+        "https://example.com/"
+        + "".join(random.choices(string.ascii_letters, k=random.randint(5, 150)))
+        for _ in range(count)
+    ]
+
+
+def main():
+    """
+    Print throughput and speedup for each worker count.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=64)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="*",
+        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+    )
+    args = parser.parse_args()
+
+    random.seed(0)
+    payloads = get_payloads(args.count)
+    print(f"{'workers':>7} {'seconds':>8} {'codes/s':>8} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        results = generate_many(payloads, workers=workers, chunk_size=args.chunk_size)
+        elapsed = time.perf_counter() - start
+        errors = sum(result.error is not None for result in results)
+        if errors:
+            print(f"{errors} payloads failed")
+        baseline = baseline or elapsed
+        print(
+            f"{workers:>7} {elapsed:>8.2f} {len(payloads) / elapsed:>8.0f} "
+            f"{baseline / elapsed:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
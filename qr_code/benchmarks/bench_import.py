@@ -0,0 +1,117 @@
+"""
+Measure the cold import time of the package entry points, as python -X importtime reports it.
+
+Each statement runs in a fresh interpreter, --repeat times. Its import time is the sum of the
+cumulative times of the top-level imports it triggers, interpreter startup imports excluded;
+the median is reported, with the wall time of the whole process and the heaviest imports.
+
+Run from the repository root:
+    python -m qr_code.benchmarks.bench_import
+    python -m qr_code.benchmarks.bench_import --statements "import qr_code.cli.generate"
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+DEFAULT_STATEMENTS = [
+    "import qr_code.custom_generator",
+    "from qr_code.custom_generator import generate_qr_code",
+    "from qr_code.custom_generator import generate_qr_code; generate_qr_code('https://example.com')",
+    "from qr_code.custom_generator import render",
+    "import qr_code.cli.generate",
+]
+
+
+def run_importtime(statement: str) -> Tuple[List[Tuple[int, int, int, str]], float]:
+    """
+    Run the statement in a fresh interpreter with -X importtime.
+    Return the (depth, self us, cumulative us, module) entries and the process wall time.
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_time, cumulative_time, name = line[len("import time:") :].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((depth, int(self_time), int(cumulative_time), name.strip()))
+    return entries, elapsed
+
+
+def get_import_time(
+    entries: List[Tuple[int, int, int, str]], startup_modules: set
+) -> int:
+    """
+    Sum the cumulative times of the top-level imports, startup imports excluded.
+    """
+    return sum(
+        cumulative_time
+        for depth, _, cumulative_time, name in entries
+        if depth == 0 and name not in startup_modules
+    )
+
+
+def measure(statement: str, repeat: int, startup_modules: set) -> Dict:
+    """
+    Run the statement repeat times, returning median import and wall times
+    and the self time of every import of the last run.
+    """
+    import_times = []
+    wall_times = []
+    for _ in range(repeat):
+        entries, elapsed = run_importtime(statement)
+        import_times.append(get_import_time(entries, startup_modules))
+        wall_times.append(elapsed)
+    return {
+        "import_ms": statistics.median(import_times) / 1000,
+        "wall_ms": statistics.median(wall_times) * 1000,
+        "modules": len([entry for entry in entries if entry[3] not in startup_modules]),
+        "self_times": {
+            name: self_time
+            for _, self_time, _, name in entries
+            if name not in startup_modules
+        },
+    }
+
+
+def main():
+    """
+    Print one line per statement, then its heaviest imports.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--statements", nargs="*", default=DEFAULT_STATEMENTS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="Heaviest imports shown.")
+    args = parser.parse_args()
+
+    startup_entries, startup_wall_time = run_importtime("pass")
+    startup_modules = {name for _, _, _, name in startup_entries}
+    print(f"interpreter startup: {startup_wall_time * 1000:.0f} ms wall")
+
+    for statement in args.statements:
+        result = measure(statement, args.repeat, startup_modules)
+        print(
+            f"{result['import_ms']:>8.1f} ms import {result['wall_ms']:>7.0f} ms wall "
+            f"{result['modules']:>4} modules  {statement}"
+        )
+        heaviest = sorted(
+            result["self_times"].items(), key=lambda item: item[1], reverse=True
+        )
+        for name, self_time in heaviest[: args.top]:
+            print(f"{'':>12}{self_time / 1000:>7.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Compare the mask selection strategies: time per selection and how often
+each one picks the same mask as the exhaustive search.
+
+Run from the repository root:
+    python -m qr_code.benchmarks.bench_mask_strategies
+"""
+
+import argparse
+import random
+import time
+
+from qr_code.custom_generator.qr_generator.qr_matrix import (
+    get_qr_matrix,
+    get_function_patterns,
+    get_mask_grids,
+)
+from qr_code.custom_generator.qr_generator.qr_matrix.mask_selection import (
+    MASK_STRATEGIES,
+)
+
+
+def get_candidates(version: int):
+    """
+    Build the (8, n, n) stack of mask candidates of a symbol filled with random codewords.
+    """
+    protected_matrix = get_function_patterns(version)[1]
+    codewords_count = (protected_matrix.size - int(protected_matrix.sum())) // 8
+    matrix, _ = get_qr_matrix(
+        codewords=random.randbytes(codewords_count), version=version
+    )
+    return matrix ^ get_mask_grids(version)
+
+
+def main():
+    """
+    Print, per version, each strategy mean time and agreement with the exhaustive search.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--samples", type=int, default=50)
+    parser.add_argument(
+        "--versions", type=int, nargs="*", default=[1, 5, 10, 20, 30, 40]
+    )
+    args = parser.parse_args()
+
+    random.seed(0)
+    print(f"{'version':>7} " + " ".join(f"{name:>22}" for name in MASK_STRATEGIES))
+    totals = {name: 0 for name in MASK_STRATEGIES}
+    for version in args.versions:
+        seconds = {name: 0.0 for name in MASK_STRATEGIES}
+        agreements = {name: 0 for name in MASK_STRATEGIES}
+        for _ in range(args.samples):
+            candidates = get_candidates(version)
+            selected = {}
+            for name, select in MASK_STRATEGIES.items():
+                start = time.perf_counter()
+                selected[name] = select(candidates)
+                seconds[name] += time.perf_counter() - start
+            for name in MASK_STRATEGIES:
+                agreements[name] += selected[name] == selected["exhaustive"]
+
+        for name in MASK_STRATEGIES:
+            totals[name] += agreements[name]
+        print(
+            f"{version:>7} "
+            + " ".join(
+                f"{1e3 * seconds[name] / args.samples:>8.2f} ms "
+                f"{100 * agreements[name] / args.samples:>6.1f} % "
+                for name in MASK_STRATEGIES
+            )
+        )
+
+    samples_count = args.samples * len(args.versions)
+    print(
+        "agreement with exhaustive: "
+        + ", ".join(
+            f"{name} {100 * totals[name] / samples_count:.1f} %"
+            for name in MASK_STRATEGIES
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compare the speed of the vectorized penalty engine and of the reference penalty functions
+on the mask candidates of every version. tests/test_penalty.py checks they agree.
+
+Run from the repository root:
+    python -m qr_code.benchmarks.bench_penalty
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from qr_code.custom_generator.qr_generator.qr_matrix import (
+    get_qr_matrix,
+    get_function_patterns,
+    get_mask_grids,
+)
+from qr_code.custom_generator.qr_generator.qr_matrix.mask_matrix import (
+    get_penalty_score,
+)
+from qr_code.custom_generator.qr_generator.qr_matrix.penalty_engine import (
+    get_penalty_scores,
+)
+
+
+def get_candidates(version: int) -> np.array:
+    """
+    Build the (8, n, n) stack of mask candidates of a symbol filled with random codewords.
+    """
+    protected_matrix = get_function_patterns(version)[1]
+    codewords_count = (protected_matrix.size - int(protected_matrix.sum())) // 8
+    matrix, _ = get_qr_matrix(
+        codewords=random.randbytes(codewords_count), version=version
+    )
+    return matrix ^ get_mask_grids(version)
+
+
+def main():
+    """
+    Print the timings of both implementations per version.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--versions", type=int, nargs="*", default=range(1, 41))
+    args = parser.parse_args()
+
+    random.seed(0)
+    print(f"{'version':>7} {'reference ms':>12} {'engine ms':>10} {'speedup':>8}")
+    for version in args.versions:
+        candidates = get_candidates(version)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            [get_penalty_score(candidate) for candidate in candidates]
+        reference_time = (time.perf_counter() - start) / args.repeat
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            get_penalty_scores(candidates)
+        engine_time = (time.perf_counter() - start) / args.repeat
+
+        print(
+            f"{version:>7} {1e3 * reference_time:>12.2f} {1e3 * engine_time:>10.2f} "
+            f"{reference_time / engine_time:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
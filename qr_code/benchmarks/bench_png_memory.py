@@ -0,0 +1,59 @@
+"""
+Compare peak memory and time of the in-memory and streaming PNG render paths.
+
+Run from the repository root:
+    python -m qr_code.benchmarks.bench_png_memory
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from qr_code.custom_generator import generate_qr_code, plot_png
+
+
+def measure(output_file: Path, **kwargs) -> dict:
+    """
+    Render once, returning wall time and peak traced memory.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    plot_png(output_file=output_file, **kwargs)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": elapsed, "peak_mb": peak / 2**20}
+
+
+def main():
+    """
+    Print one line per (bloc_size, render path).
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--payload-size", type=int, default=200)
+    parser.add_argument("--bloc-sizes", type=int, nargs="*", default=[10, 50, 100, 200])
+    args = parser.parse_args()
+
+    matrix = generate_qr_code("x" * args.payload_size)
+    print(f"matrix size {matrix.shape[0]} modules")
+    print(f"{'bloc_size':>9} {'pixels':>7} {'path':>9} {'seconds':>8} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for bloc_size in args.bloc_sizes:
+            for streaming in (False, True):
+                result = measure(
+                    Path(directory) / "output.png",
+                    matrix=matrix,
+                    bloc_size=bloc_size,
+                    streaming=streaming,
+                )
+                print(
+                    f"{bloc_size:>9} {matrix.shape[0] * bloc_size:>7} "
+                    f"{'streaming' if streaming else 'in-memory':>9} "
+                    f"{result['seconds']:>8.2f} {result['peak_mb']:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark Reed-Solomon encoding throughput for every version and error correction level.
+
+Run from the repository root:
+    python -m qr_code.benchmarks.bench_reed_solomon
+"""
+
+import argparse
+import random
+import time
+
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+from qr_code.custom_generator.qr_generator.codewords_count import get_codewords_count
+from qr_code.custom_generator.qr_generator.error_correction import encode_message
+
+
+def benchmark_encode(
+    version: int, error_correction_level: ErrorCorrectionLevel, repeat: int
+) -> dict:
+    """
+    Time encode_message on random data filling the whole symbol.
+    """
+    codewords_count = int(get_codewords_count(version, error_correction_level))
+    data_codewords = random.randbytes(codewords_count)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        encode_message(
+            data_codewords=data_codewords,
+            version=version,
+            error_correction_level=error_correction_level,
+        )
+    elapsed = time.perf_counter() - start
+
+    return {
+        "version": version,
+        "ec_level": error_correction_level.name,
+        "data_codewords": codewords_count,
+        "us_per_code": 1e6 * elapsed / repeat,
+        "codes_per_s": repeat / elapsed,
+        "data_kb_per_s": codewords_count * repeat / elapsed / 1024,
+    }
+
+
+def main():
+    """
+    Print a throughput table, one line per (version, EC level).
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--versions", type=int, nargs="*", default=range(1, 41))
+    args = parser.parse_args()
+
+    random.seed(0)
+    print(
+        f"{'version':>7} {'EC':>2} {'codewords':>9} {'us/code':>10} {'codes/s':>10} {'kB/s':>10}"
+    )
+    for version in args.versions:
+        for error_correction_level in ErrorCorrectionLevel:
+            result = benchmark_encode(version, error_correction_level, args.repeat)
+            print(
+                f"{result['version']:>7} {result['ec_level']:>2} "
+                f"{result['data_codewords']:>9} {result['us_per_code']:>10.1f} "
+                f"{result['codes_per_s']:>10.0f} {result['data_kb_per_s']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
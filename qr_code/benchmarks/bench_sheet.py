@@ -0,0 +1,68 @@
+"""
+Measure time and peak memory of rendering thousands of QR codes on one PNG sheet.
+
+Run from the repository root:
+    python -m qr_code.benchmarks.bench_sheet --count 2000 --columns 40
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from qr_code.custom_generator import generate_many, plot_sheet
+
+
+def main():
+    """
+    Generate the codes, then print the sheet size, render time and peak traced memory.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--columns", type=int, default=40)
+    parser.add_argument("--bloc-size", type=int, default=8)
+    parser.add_argument("--gutter", type=int, default=24)
+    parser.add_argument("--margin", type=int, default=48)
+    parser.add_argument("--dpi", type=int, default=600)
+    args = parser.parse_args()
+
+    results = generate_many(
+        [f"https://example.com/label/{index:06d}" for index in range(args.count)]
+    )
+    matrices = [result.matrix for result in results]
+
+    with tempfile.TemporaryDirectory() as directory:
+        output_file = Path(directory) / "sheet.png"
+        tracemalloc.start()
+        start = time.perf_counter()
+        plot_sheet(
+            output_file=output_file,
+            matrices=matrices,
+            columns=args.columns,
+            bloc_size=args.bloc_size,
+            gutter=args.gutter,
+            margin=args.margin,
+            dpi=args.dpi,
+        )
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        file_size = output_file.stat().st_size
+
+    rows = -(-args.count // args.columns)
+    cell = matrices[0].shape[0] * args.bloc_size
+    width = 2 * args.margin + args.columns * cell + (args.columns - 1) * args.gutter
+    height = 2 * args.margin + rows * cell + (rows - 1) * args.gutter
+    print(
+        f"{args.count} codes, {width}x{height} pixels "
+        f"({width / args.dpi:.1f}x{height / args.dpi:.1f} in at {args.dpi} dpi)"
+    )
+    print(
+        f"{elapsed:.2f}s, {width * height / elapsed / 1e6:.1f} Mpixels/s, "
+        f"peak {peak / 2**20:.1f} MB, file {file_size / 2**20:.1f} MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Time every stage of generate_qr_code and plot_png for all versions and error correction levels.
+
+Payloads fill each version to its Byte capacity. Stages are the ones generate_qr_code and
+write_png report to an instrumentation sink, so they are timed on the production code path,
+segmentation and mask strategy included. Each stage gets its wall time (best of --repeat runs),
+and each call its tracemalloc peak. End-to-end generation plus PNG writing is compared
+against the qrcode library. Results are written as JSON, and --compare flags the stages that
+got slower than a previous run.
+
+Run from the repository root:
+    python -m qr_code.benchmarks.bench_stages --output bench.json
+    python -m qr_code.benchmarks.bench_stages --output new.json --compare bench.json
+"""
+
+import argparse
+import io
+import json
+import platform
+import random
+import string
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from qr_code.custom_generator import generate_qr_code, warmup
+from qr_code.custom_generator.instrumentation import InstrumentationSink
+from qr_code.custom_generator.plot_png import write_png
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+from qr_code.custom_generator.qr_generator.qr_matrix.mask_selection import (
+    MASK_STRATEGIES,
+)
+from qr_code.custom_generator.qr_generator.spec_tables import (
+    MAX_VERSION,
+    get_spec_tables,
+)
+from qr_code import generate_using_custom
+
+try:
+    from qr_code import generate_using_qrcode
+except ImportError:
+    generate_using_qrcode = None
+
+
+class StageRecorder(InstrumentationSink):
+    """
+    Keep the best time of each stage, prefixed by its operation, and the last facts.
+    """
+
+    def __init__(self):
+        self.best_us = {}
+        self.facts = {}
+
+    def emit(self, operation, duration, stages, facts) -> None:
+        for stage, seconds in stages.items():
+            name = f"{operation}.{stage}"
+            self.best_us[name] = min(
+                self.best_us.get(name, 1e6 * seconds), 1e6 * seconds
+            )
+        self.facts[operation] = facts
+
+
+def run_calls(
+    url: str,
+    error_correction_level: ErrorCorrectionLevel,
+    mask_strategy: str,
+    sink: InstrumentationSink = None,
+) -> None:
+    """
+    Generate the QR code then render it as PNG, in memory so that disk speed
+    does not interfere.
+    """
+    matrix = generate_qr_code(
+        url=url,
+        error_correction_level=error_correction_level,
+        mask_strategy=mask_strategy,
+        instrumentation=sink,
+    )
+    write_png(io.BytesIO(), matrix=matrix, instrumentation=sink)
+
+
+def time_stages(
+    url: str,
+    error_correction_level: ErrorCorrectionLevel,
+    mask_strategy: str,
+    repeat: int,
+) -> StageRecorder:
+    """
+    Best wall time of each stage over repeat runs, in microseconds.
+    """
+    recorder = StageRecorder()
+    for _ in range(repeat):
+        run_calls(url, error_correction_level, mask_strategy, recorder)
+    return recorder
+
+
+def trace_calls(
+    url: str, error_correction_level: ErrorCorrectionLevel, mask_strategy: str
+) -> dict:
+    """
+    Peak traced memory of generate_qr_code and of write_png, in kilobytes.
+    """
+    peaks = {}
+    tracemalloc.start()
+    try:
+        start_size, _ = tracemalloc.get_traced_memory()
+        matrix = generate_qr_code(
+            url=url,
+            error_correction_level=error_correction_level,
+            mask_strategy=mask_strategy,
+        )
+        _, peak = tracemalloc.get_traced_memory()
+        peaks["generate_qr_code"] = (peak - start_size) / 1024
+
+        tracemalloc.reset_peak()
+        start_size, _ = tracemalloc.get_traced_memory()
+        write_png(io.BytesIO(), matrix=matrix)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks["plot_png"] = (peak - start_size) / 1024
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def time_end_to_end(generate, url: str, repeat: int, **kwargs) -> float:
+    """
+    Best wall time of a generate(url, output_path) entry point, in microseconds.
+    """
+    best = None
+    with tempfile.TemporaryDirectory() as directory:
+        output_path = str(Path(directory) / "output.png")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            generate(url, output_path, **kwargs)
+            elapsed = 1e6 * (time.perf_counter() - start)
+            best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark(versions, repeat: int, mask_strategy: str) -> list:
+    """
+    Measure all the stages for each version and error correction level.
+    """
+    capacities = get_spec_tables().capacities
+    results = []
+    for version in versions:
+        for error_correction_level in ErrorCorrectionLevel:
+            capacity = capacities[(error_correction_level.name, "Byte")][version - 1]
+            url = "".join(
+                random.choices(string.ascii_letters + string.digits, k=capacity)
+            )
+
+            recorder = time_stages(url, error_correction_level, mask_strategy, repeat)
+            facts = recorder.facts["generate_qr_code"]
+            result = {
+                "version": version,
+                "ec_level": error_correction_level.name,
+                "payload_length": capacity,
+                "generated_version": facts["version"],
+                "mode": facts["mode"],
+                "time_us": recorder.best_us,
+                "peak_kb": trace_calls(url, error_correction_level, mask_strategy),
+                "end_to_end_us": {
+                    "custom": time_end_to_end(
+                        generate_using_custom.generate,
+                        url,
+                        repeat,
+                        error_correction_level=error_correction_level,
+                    )
+                },
+            }
+            if generate_using_qrcode is not None:
+                result["end_to_end_us"]["qrcode"] = time_end_to_end(
+                    generate_using_qrcode.generate,
+                    url,
+                    repeat,
+                    error_correction_level=error_correction_level,
+                )
+            results.append(result)
+            print_result(result)
+    return results
+
+
+def print_result(result: dict) -> None:
+    """
+    Print one line per (version, EC level): stage times then end-to-end comparison.
+    """
+    stages = " ".join(f"{value:>9.0f}" for value in result["time_us"].values())
+    end_to_end = " ".join(
+        f"{key} {value / 1e3:.1f}ms" for key, value in result["end_to_end_us"].items()
+    )
+    print(f"{result['version']:>3} {result['ec_level']} {stages}  {end_to_end}")
+
+
+def compare(results: list, previous_path: str, threshold: float) -> int:
+    """
+    Print stages at least threshold times slower than in the previous run. Return their count.
+    """
+    with open(previous_path, "r", encoding="utf-8") as f:
+        previous = {
+            (result["version"], result["ec_level"]): result
+            for result in json.load(f)["results"]
+        }
+
+    regressions = 0
+    for result in results:
+        old = previous.get((result["version"], result["ec_level"]))
+        if old is None:
+            continue
+        for stage, value in result["time_us"].items():
+            old_value = old["time_us"].get(stage)
+            if old_value and value / old_value >= threshold:
+                regressions += 1
+                print(
+                    f"REGRESSION version {result['version']} {result['ec_level']} {stage}: "
+                    f"{old_value:.0f}us -> {value:.0f}us ({value / old_value:.2f}x)"
+                )
+    print(f"{regressions} regressions above {threshold}x")
+    return regressions
+
+
+def main():
+    """
+    Run the benchmark, write the JSON report and optionally compare with a previous one.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--versions", type=int, nargs="*", default=range(1, MAX_VERSION + 1)
+    )
+    parser.add_argument("--output", default="bench_stages.json")
+    parser.add_argument("--compare", default=None, help="Previous JSON report.")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument(
+        "--mask-strategy", default="exhaustive", choices=list(MASK_STRATEGIES)
+    )
+    args = parser.parse_args()
+
+    random.seed(0)
+    warmup()
+    recorder = time_stages("stages", ErrorCorrectionLevel.H, args.mask_strategy, 1)
+    print(f"stage times in us: {' '.join(recorder.best_us)}")
+    results = benchmark(args.versions, args.repeat, args.mask_strategy)
+
+    report = {
+        "metadata": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "repeat": args.repeat,
+            "mask_strategy": args.mask_strategy,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=1)
+    print(f"Written {args.output}")
+
+    if args.compare:
+        compare(results, args.compare, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
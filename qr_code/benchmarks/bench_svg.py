@@ -0,0 +1,56 @@
+"""
+Compare output size and render time of the SVG and PNG outputs.
+
+Run from the repository root:
+    python -m qr_code.benchmarks.bench_svg
+"""
+
+import argparse
+import io
+import time
+
+from qr_code.custom_generator import generate_qr_code
+from qr_code.custom_generator.plot_png import write_png
+from qr_code.custom_generator.plot_svg import write_svg
+
+
+def measure(write, repeat: int, **kwargs) -> dict:
+    """
+    Render repeat times in memory, returning the best time and the output size.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        f = io.BytesIO()
+        start = time.perf_counter()
+        write(f, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return {"seconds": best, "bytes": len(f.getvalue())}
+
+
+def main():
+    """
+    Print one line per (payload size, bloc_size, output format).
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--payload-sizes", type=int, nargs="*", default=[20, 200, 1000])
+    parser.add_argument("--bloc-sizes", type=int, nargs="*", default=[10, 50])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'payload':>7} {'modules':>7} {'bloc_size':>9} {'format':>6} "
+        f"{'ms':>8} {'KB':>9}"
+    )
+    for payload_size in args.payload_sizes:
+        matrix = generate_qr_code("x" * payload_size)
+        for bloc_size in args.bloc_sizes:
+            for name, write in (("png", write_png), ("svg", write_svg)):
+                result = measure(write, args.repeat, matrix=matrix, bloc_size=bloc_size)
+                print(
+                    f"{payload_size:>7} {matrix.shape[0]:>7} {bloc_size:>9} {name:>6} "
+                    f"{1e3 * result['seconds']:>8.2f} {result['bytes'] / 1024:>9.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
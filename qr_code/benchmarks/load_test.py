@@ -0,0 +1,122 @@
+"""
+Load test the QR code HTTP service on localhost: latency percentiles and requests per second.
+Throughput and latencies are those of served (200) requests: requests rejected
+with a 429 under overload are answered right away, so they are reported apart.
+
+Start the service first, then run from the repository root:
+    python -m qr_code.service.server --port 8080
+    python -m qr_code.benchmarks.load_test --port 8080 --concurrency 16 --requests 2000
+"""
+
+import argparse
+import asyncio
+import random
+import string
+import time
+from collections import Counter
+from http import HTTPStatus
+from urllib.parse import urlencode
+
+
+async def client(
+    host: str, port: int, targets: list, latencies: list, statuses: Counter
+) -> None:
+    """
+    Send requests one after the other over a keep-alive connection.
+    Every status is counted, latencies are only kept for served (200) requests.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while targets:
+            target = targets.pop()
+            start = time.perf_counter()
+            writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+            await writer.drain()
+
+            status = int((await reader.readline()).split()[1])
+            content_length = 0
+            while (line := await reader.readline()) not in (b"\r\n", b""):
+                name, _, value = line.decode().partition(":")
+                if name.lower() == "content-length":
+                    content_length = int(value)
+            await reader.readexactly(content_length)
+
+            if status == HTTPStatus.OK:
+                latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """
+    Nearest-rank percentile of already sorted values.
+    """
+    return sorted_values[
+        min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    ]
+
+
+async def run(args) -> None:
+    """
+    Spread the requests over concurrent clients and print the statistics.
+    """
+    targets = [
+        "/qr?"
+        + urlencode(
+            {
+                "data": "https://example.com/"
+                + "".join(
+                    random.choices(string.ascii_letters, k=random.randint(5, 100))
+                ),
+                "ec": args.ec,
+                "size": args.size,
+            }
+        )
+        for _ in range(args.requests)
+    ]
+    latencies = []
+    statuses = Counter()
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            client(args.host, args.port, targets, latencies, statuses)
+            for _ in range(args.concurrency)
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"requests     {sum(statuses.values())} in {elapsed:.2f} s")
+    print(f"served       {len(latencies)}")
+    print(f"rejected     {statuses[HTTPStatus.TOO_MANY_REQUESTS]} (429)")
+    print(f"served/s     {len(latencies) / elapsed:.0f}")
+    if latencies:
+        print(f"p50 latency  {1e3 * percentile(latencies, 0.50):.1f} ms")
+        print(f"p99 latency  {1e3 * percentile(latencies, 0.99):.1f} ms")
+    print(
+        "statuses     "
+        + ", ".join(f"{key}: {value}" for key, value in sorted(statuses.items()))
+    )
+
+
+def main():
+    """
+    Parse command line arguments and run the load test.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--ec", default="H")
+    parser.add_argument("--size", type=int, default=10)
+    args = parser.parse_args()
+
+    random.seed(0)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
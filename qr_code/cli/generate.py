@@ -0,0 +1,378 @@
+"""
+Generate QR codes in bulk from stdin, a text file (one payload per line) or JSONL records.
+
+Run from the repository root:
+    python -m qr_code.cli.generate payloads.txt --output-dir codes/
+    cat records.jsonl | python -m qr_code.cli.generate - --jsonl --archive codes.qrar --shard 0/4
+
+JSONL records carry the payload as "data" and may override the command line options
+with the keys ec, size, quiet_zone, fg, bg, format and name (output file name).
+Records are numbered from 0 in input order, skipped records of other shards included,
+so file names and shards are the same whatever the machine.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import (
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from qr_code.custom_generator import generate_qr_code, warmup
+from qr_code.custom_generator.archive import ArchiveWriter
+from qr_code.custom_generator.batch import BatchResult
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+from qr_code.custom_generator.render import RENDERERS, render
+
+RECORD_KEYS = {"data", "ec", "size", "quiet_zone", "fg", "bg", "format", "name"}
+
+
+class GenerationJob(NamedTuple):
+    """
+    One record to generate, its options resolved.
+    """
+
+    index: int
+    data: str
+    error_correction_level: str
+    quiet_zone_size: int
+    bloc_size: int
+    front_color: Optional[str]
+    background_color: Optional[str]
+    output_format: str
+    name: Optional[str]
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """
+    Parse a "i/N" shard specification, i being in {0, N - 1}.
+    """
+    try:
+        shard, shards = (int(part) for part in value.split("/"))
+    except ValueError as err:
+        raise argparse.ArgumentTypeError(
+            f"Shard should be formatted as i/N. Got {value}."
+        ) from err
+    if not 0 <= shard < shards:
+        raise argparse.ArgumentTypeError(
+            f"Shard should be in {{0, N - 1}}. Got {value}."
+        )
+    return shard, shards
+
+
+def iter_lines(f: TextIO, shard: Tuple[int, int]) -> Iterator[Tuple[int, str]]:
+    """
+    Yield the (index, line) pairs of the shard, without line ending.
+    Empty lines are skipped, and not numbered.
+    """
+    shard_index, shards = shard
+    index = 0
+    for line in f:
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+        if index % shards == shard_index:
+            yield index, line
+        index += 1
+
+
+def parse_job(
+    index: int, line: str, jsonl: bool, defaults: GenerationJob
+) -> GenerationJob:
+    """
+    Build the job of an input line, a record overriding the defaults in JSONL.
+    Raise ValueError for an invalid record.
+    """
+    if not jsonl:
+        return defaults._replace(index=index, data=line)
+
+    record = json.loads(line)
+    if not isinstance(record, dict) or not isinstance(record.get("data"), str):
+        raise ValueError('Record should be an object with a "data" string.')
+    unknown_keys = record.keys() - RECORD_KEYS
+    if unknown_keys:
+        raise ValueError(f"Unknown record keys {', '.join(sorted(unknown_keys))}.")
+
+    job = defaults._replace(
+        index=index,
+        data=record["data"],
+        error_correction_level=record.get("ec", defaults.error_correction_level),
+        quiet_zone_size=record.get("quiet_zone", defaults.quiet_zone_size),
+        bloc_size=record.get("size", defaults.bloc_size),
+        front_color=record.get("fg", defaults.front_color),
+        background_color=record.get("bg", defaults.background_color),
+        output_format=record.get("format", defaults.output_format),
+        name=record.get("name"),
+    )
+    check_job(job)
+    return job
+
+
+def check_job(job: GenerationJob) -> None:
+    """
+    Check the options of a job, raising ValueError.
+    """
+    if (
+        not isinstance(job.error_correction_level, str)
+        or job.error_correction_level not in ErrorCorrectionLevel.__members__
+    ):
+        raise ValueError(
+            f"Unknown error correction level {job.error_correction_level}."
+        )
+    if not isinstance(job.bloc_size, int) or job.bloc_size < 1:
+        raise ValueError(f"size should be a positive integer. Got {job.bloc_size}.")
+    if not isinstance(job.quiet_zone_size, int) or job.quiet_zone_size < 0:
+        raise ValueError(
+            f"quiet_zone should be a non-negative integer. Got {job.quiet_zone_size}."
+        )
+    if not isinstance(job.output_format, str) or job.output_format not in RENDERERS:
+        raise ValueError(f"Unknown output format {job.output_format}.")
+    if job.name is not None and (
+        not isinstance(job.name, str)
+        or job.name in ("", ".", "..")
+        or Path(job.name).name != job.name
+    ):
+        raise ValueError(f"name should be a plain file name. Got {job.name!r}.")
+
+
+def run_job(
+    job: GenerationJob, output_directory: Optional[str], name_template: str
+) -> BatchResult:
+    """
+    Generate a job. Runs in the worker processes.
+    With output_directory, the code is rendered and written there by the worker,
+    else the matrix, without quiet zone, is sent back to be archived.
+    """
+    try:
+        matrix = generate_qr_code(
+            url=job.data,
+            error_correction_level=ErrorCorrectionLevel[job.error_correction_level],
+            quiet_zone_size=job.quiet_zone_size if output_directory else 0,
+        )
+        if output_directory is None:
+            return BatchResult(index=job.index, payload=job.data, matrix=matrix)
+
+        name = job.name or name_template.format(
+            index=job.index, format=job.output_format
+        )
+        output_file = os.path.join(output_directory, name)
+        content = render(
+            matrix,
+            job.output_format,
+            bloc_size=job.bloc_size,
+            front_color=job.front_color,
+            background_color=job.background_color,
+        )
+        with open(output_file, "wb") as f:
+            f.write(content)
+        return BatchResult(index=job.index, payload=job.data, output_file=output_file)
+    except Exception as err:  # pylint: disable=broad-exception-caught
+        return BatchResult(
+            index=job.index, payload=job.data, error=f"{type(err).__name__}: {err}"
+        )
+
+
+def iter_results(
+    function: Callable[[GenerationJob], BatchResult],
+    items: Iterable[Union[GenerationJob, BatchResult]],
+    workers: int,
+    max_in_flight: int,
+) -> Iterator[BatchResult]:
+    """
+    Run the jobs over a pool of worker processes, yielding results in input order.
+    At most max_in_flight jobs are submitted and not yet yielded, which bounds memory
+    whatever the input size. Items already failed are passed through in order.
+    workers=1 runs in the current process.
+    """
+    if workers == 1:
+        for item in items:
+            yield item if isinstance(item, BatchResult) else function(item)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=warmup) as executor:
+        pending = deque()
+        for item in items:
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+            if isinstance(item, BatchResult):
+                future = Future()
+                future.set_result(item)
+            else:
+                future = executor.submit(function, item)
+            pending.append(future)
+        while pending:
+            yield pending.popleft().result()
+
+
+class ProgressReporter:
+    """
+    Count results and print the throughput to stderr every interval seconds.
+    """
+
+    def __init__(self, interval: float, stream: TextIO = sys.stderr):
+        self.interval = interval
+        self.stream = stream
+        self.start = time.perf_counter()
+        self.last_report = self.start
+        self.done = 0
+        self.failed = 0
+
+    def add(self, result: BatchResult) -> None:
+        """
+        Count a result, reporting its error, and the throughput when due.
+        """
+        self.done += 1
+        if result.error is not None:
+            self.failed += 1
+            print(f"record {result.index}: {result.error}", file=self.stream)
+        now = time.perf_counter()
+        if self.interval and now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report(now)
+
+    def report(self, now: float, final: bool = False) -> None:
+        """
+        Print the counts and the throughput since start.
+        """
+        elapsed = now - self.start
+        rate = self.done / elapsed if elapsed else 0.0
+        print(
+            f"{'total' if final else 'progress'}: {self.done} records, "
+            f"{self.failed} failed, {elapsed:.1f}s, {rate:.0f} codes/s",
+            file=self.stream,
+            flush=True,
+        )
+
+
+def iter_items(
+    lines: Iterable[Tuple[int, str]], jsonl: bool, defaults: GenerationJob
+) -> Iterator[Union[GenerationJob, BatchResult]]:
+    """
+    Parse input lines into jobs, or into failed results for invalid records.
+    """
+    for index, line in lines:
+        try:
+            yield parse_job(index, line, jsonl=jsonl, defaults=defaults)
+        except ValueError as err:
+            yield BatchResult(
+                index=index, payload=line, error=f"{type(err).__name__}: {err}"
+            )
+
+
+def main():
+    """
+    Parse command line arguments and generate every record of the shard.
+    Exit with status 1 if any record failed.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "input", nargs="?", default="-", help="Input file, - (default) for stdin."
+    )
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        default=None,
+        help="Read JSONL records. Default for .jsonl input files.",
+    )
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--output-dir", help="Write one image file per record.")
+    output.add_argument("--archive", help="Write all matrices to an archive file.")
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=(0, 1),
+        help="Only generate records whose index modulo N is i.",
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=None,
+        help="Records submitted to workers and not written yet, 4 per worker by default.",
+    )
+    parser.add_argument("--ec", default="H", choices=ErrorCorrectionLevel.__members__)
+    parser.add_argument("--size", type=int, default=10, help="Pixels per module.")
+    parser.add_argument("--quiet-zone", type=int, default=4)
+    parser.add_argument("--fg", default=None, help="Front CSS color name.")
+    parser.add_argument("--bg", default=None, help="Background CSS color name.")
+    parser.add_argument("--format", default="png", choices=RENDERERS)
+    parser.add_argument(
+        "--name-template",
+        default="{index:06d}.{format}",
+        help="Output file name of records without name.",
+    )
+    parser.add_argument(
+        "--progress-interval",
+        type=float,
+        default=2.0,
+        help="Seconds between throughput reports, 0 to only report the total.",
+    )
+    args = parser.parse_args()
+
+    defaults = GenerationJob(
+        index=0,
+        data="",
+        error_correction_level=args.ec,
+        quiet_zone_size=args.quiet_zone,
+        bloc_size=args.size,
+        front_color=args.fg,
+        background_color=args.bg,
+        output_format=args.format,
+        name=None,
+    )
+    try:
+        check_job(defaults)
+    except ValueError as err:
+        parser.error(str(err))
+    jsonl = args.jsonl if args.jsonl is not None else args.input.endswith(".jsonl")
+    workers = args.workers or os.cpu_count() or 1
+    max_in_flight = args.max_in_flight or 4 * workers
+    if args.output_dir is not None:
+        Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+
+    f = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    archive = ArchiveWriter(args.archive) if args.archive is not None else None
+    reporter = ProgressReporter(interval=args.progress_interval)
+    try:
+        results = iter_results(
+            partial(
+                run_job,
+                output_directory=args.output_dir,
+                name_template=args.name_template,
+            ),
+            iter_items(iter_lines(f, args.shard), jsonl=jsonl, defaults=defaults),
+            workers=workers,
+            max_in_flight=max_in_flight,
+        )
+        for result in results:
+            if archive is not None and result.matrix is not None:
+                archive.append(result.payload, result.matrix)
+            reporter.add(result)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if archive is not None:
+            archive.close()
+        if f is not sys.stdin:
+            f.close()
+    reporter.report(time.perf_counter(), final=True)
+    sys.exit(1 if reporter.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
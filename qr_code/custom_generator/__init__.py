@@ -1,2 +1,28 @@
-from .qr_generator import generate_qr_code
-from .plot_png import plot_png
+from .lazy_exports import install_lazy_exports
+
+# Exported name to the subpackage defining it, imported on first access.
+__all__ = [
+    "generate_qr_code",
+    "warmup",
+    "plot_png",
+    "generate_many",
+    "generate_structured_append",
+    "plot_svg",
+    "render",
+    "render_into",
+    "plot_sheet",
+]
+install_lazy_exports(
+    __name__,
+    {
+        "generate_qr_code": ".qr_generator",
+        "warmup": ".qr_generator",
+        "plot_png": ".plot_png",
+        "generate_many": ".batch",
+        "generate_structured_append": ".batch",
+        "plot_svg": ".plot_svg",
+        "render": ".render",
+        "render_into": ".render",
+        "plot_sheet": ".plot_sheet",
+    },
+)
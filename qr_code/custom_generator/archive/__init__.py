@@ -0,0 +1 @@
+from .archive import ArchiveWriter, ArchiveReader, ArchiveRecord, get_payload_hash
@@ -0,0 +1,224 @@
+import hashlib
+import mmap
+import struct
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from qr_code.custom_generator.qr_generator.decoder.decode_qr_code import (
+    read_format_information,
+    remove_quiet_zone,
+)
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+from qr_code.custom_generator.qr_generator.generate_qr_code import add_quiet_zone
+from qr_code.custom_generator.qr_generator.qr_matrix.get_qr_matrix import (
+    get_matrix_size,
+    get_version_from_size,
+)
+
+# File layout, all integers big-endian:
+#   - header: magic, format version
+#   - records: version, EC level index, mask number, payload hash,
+#     then the symbol without quiet zone, bit-packed one module row after the other,
+#     each row padded to a whole number of bytes
+#   - index: one offset per record in insertion order,
+#     then (payload hash, record index) pairs sorted by hash
+#   - footer: index offset, records count, magic
+MAGIC = b"QRAR"
+FORMAT_VERSION = 1
+HEADER = struct.Struct(">4sH")
+RECORD_HEADER = struct.Struct(">BBB16s")
+FOOTER = struct.Struct(">QQ4s")
+HASH_LENGTH = 16
+OFFSET_DTYPE = np.dtype(">u8")
+HASH_ENTRY_DTYPE = np.dtype([("hash", f"S{HASH_LENGTH}"), ("index", ">u4")])
+ERROR_CORRECTION_LEVELS = list(ErrorCorrectionLevel)
+
+
+class ArchiveRecord(NamedTuple):
+    """
+    One archived symbol.
+    """
+
+    version: int
+    error_correction_level: ErrorCorrectionLevel
+    mask_number: int
+    payload_hash: bytes
+    matrix: np.array
+
+
+def get_payload_hash(payload: str) -> bytes:
+    """
+    Hash identifying a payload in an archive: the first 16 bytes of its SHA-256.
+    """
+    return hashlib.sha256(payload.encode("utf-8")).digest()[:HASH_LENGTH]
+
+
+def get_row_bytes(size: int) -> int:
+    """
+    Number of bytes of a bit-packed module row.
+    """
+    return (size + 7) // 8
+
+
+class ArchiveWriter:
+    """
+    Write matrices from generate_qr_code to an archive file, appending them one by one.
+    The index is written on close, use as a context manager.
+    """
+
+    def __init__(self, path: str):
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION))
+        self.offsets: List[int] = []
+        self.hashes: List[bytes] = []
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def append(self, payload: str, matrix: np.array) -> int:
+        """
+        Append the matrix of the payload, with or without quiet zone.
+        Version, error correction level and mask are read from the matrix.
+        Return the record index.
+        """
+        symbol = remove_quiet_zone(matrix)
+        error_correction_level, mask_number = read_format_information(symbol)
+        payload_hash = get_payload_hash(payload)
+
+        self.offsets.append(self.file.tell())
+        self.hashes.append(payload_hash)
+        self.file.write(
+            RECORD_HEADER.pack(
+                get_version_from_size(symbol.shape[0]),
+                ERROR_CORRECTION_LEVELS.index(error_correction_level),
+                mask_number,
+                payload_hash,
+            )
+        )
+        self.file.write(np.packbits(symbol, axis=1).tobytes())
+        return len(self.offsets) - 1
+
+    def close(self) -> None:
+        """
+        Write the index and the footer, then close the file.
+        """
+        if self.file.closed:
+            return
+        index_offset = self.file.tell()
+        self.file.write(np.array(self.offsets, dtype=OFFSET_DTYPE).tobytes())
+        hash_entries = np.array(
+            list(zip(self.hashes, range(len(self.hashes)))), dtype=HASH_ENTRY_DTYPE
+        )
+        hash_entries.sort(order="hash", kind="stable")
+        self.file.write(hash_entries.tobytes())
+        self.file.write(FOOTER.pack(index_offset, len(self.offsets), MAGIC))
+        self.file.close()
+
+
+class ArchiveReader:
+    """
+    Random access to the records of an archive file, memory-mapped:
+    only the pages of the records read, and of the index, are loaded.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, format_version = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a QR code archive.")
+        index_offset, count, magic = FOOTER.unpack_from(
+            self.map, len(self.map) - FOOTER.size
+        )
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a complete QR code archive.")
+
+        self.count = count
+        self.offsets = np.frombuffer(
+            self.map, dtype=OFFSET_DTYPE, count=count, offset=index_offset
+        )
+        self.hash_entries = np.frombuffer(
+            self.map,
+            dtype=HASH_ENTRY_DTYPE,
+            count=count,
+            offset=index_offset + count * OFFSET_DTYPE.itemsize,
+        )
+
+    def __enter__(self) -> "ArchiveReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> ArchiveRecord:
+        """
+        Read the record at the given index.
+        """
+        if not -self.count <= index < self.count:
+            raise IndexError(f"Record {index} out of {self.count}.")
+        offset = int(self.offsets[index])
+        version, level_index, mask_number, payload_hash = RECORD_HEADER.unpack_from(
+            self.map, offset
+        )
+        size = get_matrix_size(version)
+        rows = np.frombuffer(
+            self.map,
+            dtype=np.uint8,
+            count=size * get_row_bytes(size),
+            offset=offset + RECORD_HEADER.size,
+        ).reshape(size, -1)
+        return ArchiveRecord(
+            version=version,
+            error_correction_level=ERROR_CORRECTION_LEVELS[level_index],
+            mask_number=mask_number,
+            payload_hash=payload_hash,
+            matrix=np.unpackbits(rows, axis=1, count=size).view(bool),
+        )
+
+    def get_matrix(self, index: int, quiet_zone_size: int = 0) -> np.array:
+        """
+        Get the matrix at the given index, surrounded with a quiet zone.
+        """
+        return add_quiet_zone(self[index].matrix, quiet_zone_size=quiet_zone_size)
+
+    def find(self, payload_hash: bytes) -> Optional[int]:
+        """
+        Get the index of the first record with the given payload hash, if any,
+        by bisecting the sorted hash index.
+        """
+        position = int(np.searchsorted(self.hash_entries["hash"], payload_hash))
+        if position == self.count:
+            return None
+        # Fixed-length bytes items come back with their trailing null bytes stripped.
+        found_hash = self.hash_entries[position]["hash"].ljust(HASH_LENGTH, b"\0")
+        if found_hash != payload_hash:
+            return None
+        return int(self.hash_entries[position]["index"])
+
+    def get_by_payload(self, payload: str) -> Optional[ArchiveRecord]:
+        """
+        Get the first record of the given payload, if any.
+        """
+        index = self.find(get_payload_hash(payload))
+        return None if index is None else self[index]
+
+    def close(self) -> None:
+        """
+        Release the memory map.
+        """
+        # Views on the map must be released before closing it.
+        self.offsets = self.hash_entries = None
+        self.map.close()
@@ -0,0 +1,3 @@
+from .generate_many import generate_many, BatchResult
+from .generate_structured_append import generate_structured_append
+from .verify_many import verify_many
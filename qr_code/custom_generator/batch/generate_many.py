@@ -0,0 +1,105 @@
+import concurrent.futures
+from functools import partial
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from qr_code.custom_generator.qr_generator import generate_qr_code, warmup
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+from qr_code.custom_generator.plot_png import plot_png
+
+
+class BatchResult(NamedTuple):
+    """
+    Outcome of one payload of a batch: either a matrix (or written file), or an error.
+    """
+
+    index: int
+    payload: str
+    matrix: Optional[np.array] = None
+    output_file: Optional[str] = None
+    error: Optional[str] = None
+
+
+def generate_many(
+    payloads: Iterable[str],
+    error_correction_level: ErrorCorrectionLevel = ErrorCorrectionLevel.H,
+    quiet_zone_size: int = 4,
+    mode: str = None,
+    verify: bool = False,
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    output_directory: Optional[str] = None,
+    file_name_template: str = "{index:06d}.png",
+    **plot_kwargs,
+) -> List[BatchResult]:
+    """
+    Generate the QR codes of many payloads, spread over a pool of worker processes.
+    Results are in input order. A failing payload gets its error recorded in its result
+    instead of aborting the batch.
+    Without output_directory, results carry the matrices. With it, each code is written as a PNG
+    named after file_name_template, plot_kwargs being passed along to plot_png,
+    and results carry the file paths.
+    With verify, each code is decoded back and a mismatch is recorded as its error.
+    workers defaults to the CPU count; workers=1 runs in the current process.
+    """
+    generate_one_item = partial(
+        generate_one,
+        error_correction_level=error_correction_level,
+        quiet_zone_size=quiet_zone_size,
+        mode=mode,
+        verify=verify,
+        output_directory=output_directory,
+        file_name_template=file_name_template,
+        plot_kwargs=plot_kwargs,
+    )
+    if output_directory is not None:
+        Path(output_directory).mkdir(parents=True, exist_ok=True)
+
+    items = enumerate(payloads)
+    if workers == 1:
+        return [generate_one_item(item) for item in items]
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=warmup
+    ) as executor:
+        return list(executor.map(generate_one_item, items, chunksize=chunk_size))
+
+
+def generate_one(
+    item: Tuple[int, str],
+    error_correction_level: ErrorCorrectionLevel,
+    quiet_zone_size: int,
+    mode: str,
+    verify: bool,
+    output_directory: Optional[str],
+    file_name_template: str,
+    plot_kwargs: dict,
+) -> BatchResult:
+    """
+    Generate a single item of a batch, catching its error if any.
+    """
+    index, payload = item
+    try:
+        matrix = generate_qr_code(
+            url=payload,
+            error_correction_level=error_correction_level,
+            quiet_zone_size=quiet_zone_size,
+            mode=mode,
+            verify=verify,
+        )
+        if output_directory is None:
+            return BatchResult(index=index, payload=payload, matrix=matrix)
+
+        output_file = str(
+            Path(output_directory) / file_name_template.format(index=index)
+        )
+        plot_png(output_file=output_file, matrix=matrix, **plot_kwargs)
+        return BatchResult(index=index, payload=payload, output_file=output_file)
+    except Exception as err:  # pylint: disable=broad-exception-caught
+        return BatchResult(
+            index=index, payload=payload, error=f"{type(err).__name__}: {err}"
+        )
@@ -0,0 +1,71 @@
+from functools import partial
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from qr_code.custom_generator.qr_generator import generate_qr_code
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+from qr_code.custom_generator.qr_generator.spec_tables import MAX_VERSION
+from qr_code.custom_generator.qr_generator.structured_append import (
+    MAX_SYMBOLS,
+    StructuredAppend,
+    get_parity,
+    split_payload,
+)
+
+
+def generate_structured_append(
+    url: str,
+    error_correction_level: ErrorCorrectionLevel = ErrorCorrectionLevel.H,
+    quiet_zone_size: int = 4,
+    max_version: int = MAX_VERSION,
+    max_symbols: int = MAX_SYMBOLS,
+) -> List[np.array]:
+    """
+    Generate the url as a sequence of up to max_symbols linked Structured Append symbols,
+    of version max_version at most. Payloads too long for one version 40 symbol are split,
+    and a lower max_version prefers several small symbols, faster to generate and render,
+    to a single large one. Parts are balanced so symbols get about the same version.
+    Symbols are generated in the current process: there are 16 at most, and starting
+    a process pool costs more than generating them.
+    A url fitting a single symbol gives that symbol alone, without header.
+    """
+    parts = split_payload(
+        url=url,
+        error_correction_level=error_correction_level,
+        max_version=max_version,
+        max_symbols=max_symbols,
+    )
+    generate_part = partial(
+        generate_symbol,
+        error_correction_level=error_correction_level,
+        quiet_zone_size=quiet_zone_size,
+    )
+    if len(parts) == 1:
+        return [generate_part((url, None))]
+
+    parity = get_parity(url)
+    items = [
+        (part, StructuredAppend(position=position, total=len(parts), parity=parity))
+        for position, part in enumerate(parts)
+    ]
+    return [generate_part(item) for item in items]
+
+
+def generate_symbol(
+    item: Tuple[str, Optional[StructuredAppend]],
+    error_correction_level: ErrorCorrectionLevel,
+    quiet_zone_size: int,
+) -> np.array:
+    """
+    Generate a single symbol of a Structured Append sequence.
+    """
+    part, structured_append = item
+    return generate_qr_code(
+        url=part,
+        error_correction_level=error_correction_level,
+        quiet_zone_size=quiet_zone_size,
+        structured_append=structured_append,
+    )
@@ -0,0 +1,43 @@
+import concurrent.futures
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from qr_code.custom_generator.batch.generate_many import BatchResult
+from qr_code.custom_generator.qr_generator import warmup
+from qr_code.custom_generator.qr_generator.decoder import verify_qr_code
+
+
+def verify_many(
+    items: Iterable[Tuple[str, np.array]],
+    workers: Optional[int] = 1,
+    chunk_size: int = 64,
+) -> List[BatchResult]:
+    """
+    Verify many (payload, matrix) pairs: decode each matrix and check it holds its payload.
+    Results are in input order, a failing pair gets its error recorded in its result.
+    Decoding is fast enough to run inline, so workers defaults to 1, the current process;
+    workers=None spreads the work over a pool of CPU count worker processes.
+    """
+    items = enumerate(items)
+    if workers == 1:
+        return [verify_one(item) for item in items]
+
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=warmup
+    ) as executor:
+        return list(executor.map(verify_one, items, chunksize=chunk_size))
+
+
+def verify_one(item: Tuple[int, Tuple[str, np.array]]) -> BatchResult:
+    """
+    Verify a single pair of a batch, catching its error if any.
+    """
+    index, (payload, matrix) = item
+    try:
+        verify_qr_code(matrix=matrix, url=payload)
+        return BatchResult(index=index, payload=payload)
+    except Exception as err:  # pylint: disable=broad-exception-caught
+        return BatchResult(
+            index=index, payload=payload, error=f"{type(err).__name__}: {err}"
+        )
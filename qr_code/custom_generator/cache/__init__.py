@@ -0,0 +1,7 @@
+from .result_cache import (
+    ResultCache,
+    make_matrix_key,
+    make_png_key,
+    pack_matrix,
+    unpack_matrix,
+)
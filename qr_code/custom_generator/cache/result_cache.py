@@ -0,0 +1,309 @@
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from qr_code.custom_generator.qr_generator import generate_qr_code
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+from qr_code.custom_generator.render import render
+
+LOGGER = logging.getLogger(__name__)
+
+# Hashed into every key. Bump it with any change to the generated matrices or rendered
+# files (segmentation, mask selection, renderers...), so that entries persisted
+# in the disk tier by an older version are never served.
+CACHE_FORMAT_VERSION = 2
+
+
+def pack_matrix(matrix: np.array) -> bytes:
+    """
+    Pack a square boolean matrix: its size on 2 bytes, then one bit per module.
+    """
+    return matrix.shape[0].to_bytes(2, "big") + np.packbits(matrix).tobytes()
+
+
+def unpack_matrix(data: bytes) -> np.array:
+    """
+    Reverse of pack_matrix.
+    """
+    size = int.from_bytes(data[:2], "big")
+    bits = np.unpackbits(
+        np.frombuffer(data, dtype=np.uint8, offset=2), count=size * size
+    )
+    return bits.view(bool).reshape(size, size)
+
+
+class ResultCache:
+    """
+    Content-addressed cache of generated matrices and rendered PNGs.
+    Entries are keyed by a hash of everything that determines the output:
+    payload, error correction level, quiet zone, mode and render options.
+    A size-bounded in-memory LRU sits in front of an optional on-disk tier, sharded
+    in sub-directories named after the first hash characters, which survives restarts.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2**20, directory: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) if directory is not None else None
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.lock = threading.Lock()
+        self.counters = {
+            "hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+
+    def get_matrix(
+        self,
+        payload: str,
+        error_correction_level: ErrorCorrectionLevel = ErrorCorrectionLevel.H,
+        quiet_zone_size: int = 4,
+        mode: str = None,
+    ) -> np.array:
+        """
+        Get the matrix of generate_qr_code, generating it on a miss.
+        """
+        data = self.get_or_compute(
+            make_matrix_key(payload, error_correction_level, quiet_zone_size, mode),
+            lambda: pack_matrix(
+                generate_qr_code(
+                    url=payload,
+                    error_correction_level=error_correction_level,
+                    quiet_zone_size=quiet_zone_size,
+                    mode=mode,
+                )
+            ),
+        )
+        return unpack_matrix(data)
+
+    def get_png(
+        self,
+        payload: str,
+        error_correction_level: ErrorCorrectionLevel = ErrorCorrectionLevel.H,
+        quiet_zone_size: int = 4,
+        mode: str = None,
+        **render_options,
+    ) -> bytes:
+        """
+        Get the PNG bytes of the QR code, rendering (and generating) it on a miss.
+        render_options are passed along to the PNG renderer (bloc_size, colors...).
+        """
+
+        def render_png() -> bytes:
+            return render(
+                self.get_matrix(
+                    payload=payload,
+                    error_correction_level=error_correction_level,
+                    quiet_zone_size=quiet_zone_size,
+                    mode=mode,
+                ),
+                "png",
+                **render_options,
+            )
+
+        return self.get_or_compute(
+            make_png_key(
+                payload, error_correction_level, quiet_zone_size, mode, **render_options
+            ),
+            render_png,
+        )
+
+    def get_or_compute(self, key: str, compute: Callable[[], bytes]) -> bytes:
+        """
+        Get the value of the key, else compute and put it.
+        """
+        data = self.get(key)
+        if data is None:
+            data = compute()
+            self.put(key, data)
+        return data
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        Look the key up in memory, then on disk. Return None on a miss.
+        """
+        data = self.get_from_memory(key)
+        if data is not None:
+            return data
+
+        data = self.read_disk(key)
+        with self.lock:
+            self.counters["disk_hits" if data is not None else "misses"] += 1
+        if data is not None:
+            self.store(key, data)
+        return data
+
+    def get_from_memory(self, key: str) -> Optional[bytes]:
+        """
+        Look the key up in the in-memory tier only, without any disk access.
+        Return None if it is not there, without counting a miss.
+        """
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.counters["hits"] += 1
+                return self.entries[key]
+        return None
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        Put a value in both tiers.
+        """
+        self.write_disk(key, data)
+        self.store(key, data)
+
+    def store(self, key: str, data: bytes) -> None:
+        """
+        Store in the in-memory LRU, evicting least recently used entries above max_bytes.
+        Values larger than max_bytes are not kept in memory.
+        """
+        if len(data) > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.current_bytes -= len(self.entries.pop(key))
+            self.entries[key] = data
+            self.current_bytes += len(data)
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.current_bytes -= len(evicted)
+                self.counters["evictions"] += 1
+
+    def get_disk_path(self, key: str) -> Path:
+        """
+        Path of an entry in the disk tier: <directory>/<2 chars>/<2 chars>/<key>.
+        """
+        return self.directory / key[:2] / key[2:4] / key
+
+    def read_disk(self, key: str) -> Optional[bytes]:
+        """
+        Read an entry from the disk tier, if enabled and present.
+        A disk tier which cannot be read (permissions, not a directory...) is logged
+        and reported as a miss.
+        """
+        if self.directory is None:
+            return None
+        try:
+            return self.get_disk_path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError:
+            LOGGER.warning(
+                "Could not read cache entry %s from %s.",
+                key,
+                self.directory,
+                exc_info=True,
+            )
+            return None
+
+    def write_disk(self, key: str, data: bytes) -> None:
+        """
+        Write an entry to the disk tier, if enabled.
+        Written to a temporary file then renamed, so readers never see a partial entry.
+        A failed write (permissions, disk full...) is logged and the entry is only
+        kept in memory.
+        """
+        if self.directory is None:
+            return
+        path = self.get_disk_path(key)
+        temporary_path = path.with_name(
+            f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary_path.write_bytes(data)
+            os.replace(temporary_path, path)
+        except OSError:
+            LOGGER.warning(
+                "Could not write cache entry %s to %s.",
+                key,
+                self.directory,
+                exc_info=True,
+            )
+            with contextlib.suppress(OSError):
+                temporary_path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """
+        Empty the in-memory tier. The disk tier is left untouched.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.current_bytes = 0
+
+    @property
+    def stats(self) -> dict:
+        """
+        Counters, plus the in-memory tier occupation.
+        """
+        with self.lock:
+            return {
+                **self.counters,
+                "entries": len(self.entries),
+                "bytes": self.current_bytes,
+            }
+
+
+def make_matrix_key(
+    payload: str,
+    error_correction_level: ErrorCorrectionLevel,
+    quiet_zone_size: int,
+    mode: str,
+) -> str:
+    """
+    Cache key of a generated matrix.
+    """
+    return make_key(
+        "matrix",
+        {
+            "payload": payload,
+            "error_correction_level": error_correction_level.name,
+            "quiet_zone_size": quiet_zone_size,
+            "mode": mode,
+        },
+    )
+
+
+def make_png_key(
+    payload: str,
+    error_correction_level: ErrorCorrectionLevel,
+    quiet_zone_size: int,
+    mode: str,
+    **render_options,
+) -> str:
+    """
+    Cache key of a rendered PNG. Render options left to None count as not given.
+    """
+    return make_key(
+        "png",
+        {
+            "payload": payload,
+            "error_correction_level": error_correction_level.name,
+            "quiet_zone_size": quiet_zone_size,
+            "mode": mode,
+            **{
+                key: value for key, value in render_options.items() if value is not None
+            },
+        },
+    )
+
+
+def make_key(kind: str, options: dict) -> str:
+    """
+    Hash the cache format version, the output kind and every option determining it.
+    """
+    canonical = json.dumps(
+        [CACHE_FORMAT_VERSION, kind, options], sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
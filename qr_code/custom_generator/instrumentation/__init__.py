@@ -0,0 +1,7 @@
+from .trace import (
+    InstrumentationSink,
+    register_sink,
+    unregister_sink,
+    start_trace,
+)
+from .sinks import MetricsAggregator, SlowLog
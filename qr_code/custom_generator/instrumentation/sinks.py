@@ -0,0 +1,190 @@
+import logging
+import threading
+from bisect import bisect_left
+from collections import defaultdict, deque
+from typing import Dict, Sequence, Tuple
+
+from .trace import InstrumentationSink
+
+DEFAULT_SECONDS_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+)
+DEFAULT_LENGTH_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096)
+COUNTED_FACTS = ("version", "ec_level", "mask", "error")
+
+
+class Histogram:
+    """
+    Cumulative histogram with fixed upper bounds, as exposed by Prometheus.
+    """
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Add a value.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def to_prometheus(self, name: str, labels: str) -> list:
+        """
+        Exposition lines of this histogram: cumulative buckets, sum and count.
+        """
+        separator = "," if labels else ""
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ("+Inf",), self.counts):
+            cumulative += count
+            lines.append(
+                f'{name}_bucket{{{labels}{separator}le="{bound}"}} {cumulative}'
+            )
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class MetricsAggregator(InstrumentationSink):
+    """
+    Aggregate call reports into histograms and counters, exposed in Prometheus text format:
+        - qr_call_seconds: duration per operation
+        - qr_stage_seconds: duration per operation and stage
+        - qr_payload_length: payload length per operation
+        - qr_facts_total: calls per operation, fact (version, ec_level, mask, error)
+          and value
+    """
+
+    def __init__(
+        self,
+        seconds_buckets: Sequence[float] = DEFAULT_SECONDS_BUCKETS,
+        length_buckets: Sequence[float] = DEFAULT_LENGTH_BUCKETS,
+    ):
+        self.seconds_buckets = seconds_buckets
+        self.length_buckets = length_buckets
+        self.lock = threading.Lock()
+        self.call_seconds: Dict[str, Histogram] = {}
+        self.stage_seconds: Dict[Tuple[str, str], Histogram] = {}
+        self.payload_lengths: Dict[str, Histogram] = {}
+        self.facts_total: Dict[Tuple[str, str, str], int] = defaultdict(int)
+
+    def emit(self, operation, duration, stages, facts) -> None:
+        with self.lock:
+            get_histogram(self.call_seconds, operation, self.seconds_buckets).observe(
+                duration
+            )
+            for stage, seconds in stages.items():
+                get_histogram(
+                    self.stage_seconds, (operation, stage), self.seconds_buckets
+                ).observe(seconds)
+            if "payload_length" in facts:
+                get_histogram(
+                    self.payload_lengths, operation, self.length_buckets
+                ).observe(facts["payload_length"])
+            for fact in COUNTED_FACTS:
+                if fact in facts:
+                    self.facts_total[(operation, fact, str(facts[fact]))] += 1
+
+    def to_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        with self.lock:
+            lines += [
+                "# HELP qr_call_seconds Duration of instrumented calls.",
+                "# TYPE qr_call_seconds histogram",
+            ]
+            for operation, histogram in sorted(self.call_seconds.items()):
+                lines += histogram.to_prometheus(
+                    "qr_call_seconds", f'operation="{operation}"'
+                )
+
+            lines += [
+                "# HELP qr_stage_seconds Duration of each stage.",
+                "# TYPE qr_stage_seconds histogram",
+            ]
+            for (operation, stage), histogram in sorted(self.stage_seconds.items()):
+                lines += histogram.to_prometheus(
+                    "qr_stage_seconds", f'operation="{operation}",stage="{stage}"'
+                )
+
+            lines += [
+                "# HELP qr_payload_length Payload length in characters.",
+                "# TYPE qr_payload_length histogram",
+            ]
+            for operation, histogram in sorted(self.payload_lengths.items()):
+                lines += histogram.to_prometheus(
+                    "qr_payload_length", f'operation="{operation}"'
+                )
+
+            lines += [
+                "# HELP qr_facts_total Calls per chosen version, EC level, mask and error.",
+                "# TYPE qr_facts_total counter",
+            ]
+            for (operation, fact, value), count in sorted(self.facts_total.items()):
+                lines.append(
+                    f'qr_facts_total{{operation="{operation}",fact="{fact}",value="{value}"}} {count}'
+                )
+
+        return "\n".join(lines) + "\n"
+
+
+def get_histogram(histograms: dict, key, buckets: Sequence[float]) -> Histogram:
+    """
+    Get the histogram of the key, creating it on first use.
+    """
+    if key not in histograms:
+        histograms[key] = Histogram(buckets)
+    return histograms[key]
+
+
+class SlowLog(InstrumentationSink):
+    """
+    Keep (and log as warnings) the stage breakdown of every call slower than threshold seconds.
+    Only the max_entries most recent slow calls are kept.
+    """
+
+    def __init__(
+        self, threshold: float, max_entries: int = 1000, logger: logging.Logger = None
+    ):
+        self.threshold = threshold
+        self.entries = deque(maxlen=max_entries)
+        self.logger = logger or logging.getLogger(__name__)
+
+    def emit(self, operation, duration, stages, facts) -> None:
+        if duration < self.threshold:
+            return
+        entry = {
+            "operation": operation,
+            "duration": duration,
+            "stages": dict(stages),
+            "facts": dict(facts),
+        }
+        self.entries.append(entry)
+        self.logger.warning(
+            "Slow %s: %.1f ms (%s) %s",
+            operation,
+            1e3 * duration,
+            ", ".join(
+                f"{stage} {1e3 * seconds:.1f} ms" for stage, seconds in stages.items()
+            ),
+            facts,
+        )
@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Iterator, List, Optional
+
+
+class InstrumentationSink:
+    """
+    Receives one call report per instrumented call. Subclass and override emit.
+    """
+
+    def emit(
+        self,
+        operation: str,
+        duration: float,
+        stages: Dict[str, float],
+        facts: dict,
+    ) -> None:
+        """
+        Handle the report of a finished call: total duration and per-stage durations
+        in seconds, plus facts such as the chosen version or mask.
+        """
+
+
+LOGGER = logging.getLogger(__name__)
+GLOBAL_SINKS: List[InstrumentationSink] = []
+GLOBAL_SINKS_LOCK = threading.Lock()
+
+
+def register_sink(sink: InstrumentationSink) -> InstrumentationSink:
+    """
+    Register a sink receiving the reports of every instrumented call.
+    """
+    with GLOBAL_SINKS_LOCK:
+        GLOBAL_SINKS.append(sink)
+    return sink
+
+
+def unregister_sink(sink: InstrumentationSink) -> None:
+    """
+    Stop sending reports to a registered sink.
+    """
+    with GLOBAL_SINKS_LOCK:
+        GLOBAL_SINKS.remove(sink)
+
+
+class Trace:
+    """
+    Collects the stage timings and facts of one call, then emits them to the sinks.
+    Use as a context manager around the call: the report is emitted on exit,
+    with the exception type name as error fact if the call raised.
+    """
+
+    def __init__(self, operation: str, sinks: List[InstrumentationSink]):
+        self.operation = operation
+        self.sinks = sinks
+        self.stages = {}
+        self.facts = {}
+        self.start = time.perf_counter()
+
+    def __enter__(self) -> "Trace":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            self.record(error=exc_type.__name__)
+        self.finish()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time the enclosed block as the given stage.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def record(self, **facts) -> None:
+        """
+        Record facts about the call.
+        """
+        self.facts.update(facts)
+
+    def finish(self) -> None:
+        """
+        Emit the call report to every sink.
+        A failing sink is logged and skipped, it never fails the instrumented call.
+        """
+        duration = time.perf_counter() - self.start
+        for sink in self.sinks:
+            try:
+                sink.emit(self.operation, duration, self.stages, self.facts)
+            except Exception:  # pylint: disable=broad-exception-caught
+                LOGGER.exception(
+                    "Instrumentation sink %r failed on %s.", sink, self.operation
+                )
+
+
+NULL_CONTEXT = nullcontext()
+
+
+class NullTrace:
+    """
+    Trace used when no sink listens: every method does nothing.
+    """
+
+    def __enter__(self) -> "NullTrace":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+    def stage(self, name: str) -> nullcontext:  # pylint: disable=unused-argument
+        """
+        Run the enclosed block untimed, through a shared reusable context.
+        """
+        return NULL_CONTEXT
+
+    def record(self, **facts) -> None:
+        """
+        Drop the facts.
+        """
+
+    def finish(self) -> None:
+        """
+        Nothing to emit.
+        """
+
+
+NULL_TRACE = NullTrace()
+
+
+def start_trace(operation: str, sink: Optional[InstrumentationSink] = None):
+    """
+    Start tracing a call, reporting to the given sink and the registered ones.
+    Without any sink, return the shared NULL_TRACE so instrumented code pays nothing.
+    """
+    sinks = GLOBAL_SINKS + [sink] if sink is not None else list(GLOBAL_SINKS)
+    if not sinks:
+        return NULL_TRACE
+    return Trace(operation, sinks)
@@ -0,0 +1,40 @@
+import sys
+from importlib import import_module
+from types import ModuleType
+from typing import Dict
+
+
+class LazyExportsModule(ModuleType):
+    """
+    Package importing its exports on first access, so that importing the package
+    alone stays cheap.
+    Exports may share their name with a submodule (plot_png, generate_qr_code...):
+    the import system binds every submodule imported on its parent package,
+    which would hide the export, so those bindings are ignored.
+    """
+
+    __lazy_exports__: Dict[str, str] = {}
+
+    def __getattr__(self, name: str):
+        if name not in self.__lazy_exports__:
+            raise AttributeError(f"module {self.__name__!r} has no attribute {name!r}")
+        value = getattr(import_module(self.__lazy_exports__[name], self.__name__), name)
+        ModuleType.__setattr__(self, name, value)
+        return value
+
+    def __setattr__(self, name: str, value) -> None:
+        if name in self.__lazy_exports__ and isinstance(value, ModuleType):
+            return
+        super().__setattr__(name, value)
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self.__lazy_exports__))
+
+
+def install_lazy_exports(module_name: str, exports: Dict[str, str]) -> None:
+    """
+    Make the package import each exported name from its (relative) module on first access.
+    """
+    module = sys.modules[module_name]
+    module.__class__ = LazyExportsModule
+    module.__lazy_exports__ = exports
@@ -1 +1 @@
-from .plot_png import plot_png
+from .plot_png import plot_png, write_png
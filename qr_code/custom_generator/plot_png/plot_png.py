@@ -1,32 +1,77 @@
-from typing import List, Tuple
-from itertools import product
+from typing import BinaryIO, Iterator, List
 
-import webcolors
-import png
 import numpy as np
 
+from qr_code.custom_generator.instrumentation import InstrumentationSink, start_trace
+
+DEFAULT_BLOC_SIZE = 10
+
 
 def plot_png(
     output_file: str,
+    matrix: np.array,
+    bloc_size: int = DEFAULT_BLOC_SIZE,
+    streaming: bool = False,
+    instrumentation: InstrumentationSink = None,
     **kwargs,
 ) -> None:
     """
     Plot a QR code matrix in PNG format.
+    With streaming, scanlines are computed from the matrix while the file is written,
+    so peak memory stays around one scanline whatever the bloc_size.
     """
-    plot_matrix = color_wrapper(**kwargs)
-    png.from_array(plot_matrix.tolist(), mode="RGB").save(output_file)
+    with open(output_file, "wb") as f:
+        write_png(
+            f,
+            matrix=matrix,
+            bloc_size=bloc_size,
+            streaming=streaming,
+            instrumentation=instrumentation,
+            **kwargs,
+        )
+
+
+def write_png(
+    f: BinaryIO,
+    matrix: np.array,
+    bloc_size: int = DEFAULT_BLOC_SIZE,
+    streaming: bool = False,
+    instrumentation: InstrumentationSink = None,
+    **kwargs,
+) -> None:
+    """
+    Write a QR code matrix in PNG format to an open binary file object.
+    Rasterizing and encoding are reported as the render and write stages;
+    when streaming, scanlines are rasterized lazily, hence timed within write.
+    """
+    import png
+
+    with start_trace("plot_png", instrumentation) as trace:
+        with trace.stage("render"):
+            plot_rows = color_wrapper(
+                matrix=matrix, bloc_size=bloc_size, streaming=streaming, **kwargs
+            )
+        size = matrix.shape[0] * bloc_size
+        with trace.stage("write"):
+            writer = png.Writer(width=size, height=size, greyscale=False, bitdepth=8)
+            writer.write(f, plot_rows)
+
+        trace.record(bloc_size=bloc_size, streaming=streaming, size=size)
 
 
 def color_wrapper(
     background_color: str = None,
     front_color: str = None,
+    streaming: bool = False,
     **kwargs,
 ) -> np.array:
     """
-    Convert the given CSS color names to RGBs and pass along to draw_matrix.
+    Convert the given CSS color names to RGBs and pass along to draw_matrix,
+    or to stream_matrix when streaming.
     """
     colors = get_rgbs(background_color, front_color)
-    return draw_matrix(
+    draw = stream_matrix if streaming else draw_matrix
+    return draw(
         **kwargs,
         **colors,
     )
@@ -36,6 +81,8 @@ def get_rgbs(background_color: str, front_color: str) -> dict:
     """
     Transform the given colors to RGB values.
     """
+    import webcolors
+
     if background_color is None:
         background_color = "white"
     if front_color is None:
@@ -51,85 +98,92 @@ def draw_matrix(
     matrix: np.array,
     background_rgb: List[int],
     front_rgb: List[int],
-    bloc_size: int = 10,
+    bloc_size: int = DEFAULT_BLOC_SIZE,
 ) -> np.array:
     """
     Draw matrix:
-        - Get background matrix
-        - Fill with values
+        - Scale modules to pixel blocs
+        - Map pixels to colors
     Transform the given matrix to a matrix ready to be png-plotted.
     Use background and front color.
     Multiply each value to get pixels blocs of given bloc_size.
     """
-    if matrix.shape[0] != matrix.shape[1]:
-        raise ValueError(
-            f"QR code should be a square matrix. Got size {matrix.shape[0]}, {matrix.shape[1]}."
-        )
-    if matrix.dtype != np.dtype("bool"):
-        raise ValueError(
-            f"QR code matrix should contain booleans. Got {matrix.dtype} instead."
-        )
+    check_matrix(matrix)
 
-    background_matrix = get_background_matrix(
-        n=matrix.shape[0],
-        bloc_size=bloc_size,
+    pixels = scale_matrix(matrix=matrix, bloc_size=bloc_size)
+    return colorize(
+        pixels=pixels,
         background_rgb=background_rgb,
-    )
-    return draw_values(
-        working_matrix=background_matrix,
-        value_matrix=matrix,
         front_rgb=front_rgb,
-        bloc_size=bloc_size,
     )
 
 
-def get_background_matrix(
-    n: int,
-    bloc_size: int,
+def stream_matrix(
+    matrix: np.array,
     background_rgb: List[int],
-) -> np.array:
+    front_rgb: List[int],
+    bloc_size: int = DEFAULT_BLOC_SIZE,
+) -> Iterator[np.array]:
     """
-    Get a square matrix of the right size:
-        (n * bloc_size, 3 x n * bloc_size), full of background_color.
+    Same output as draw_matrix, as an iterator over scanlines.
+    The matrix is checked right away, scanlines are only computed when iterated.
     """
-    size = n * bloc_size
-    return np.array([background_rgb * size] * size)
+    check_matrix(matrix)
+    return iter_scanlines(
+        matrix=matrix,
+        background_rgb=background_rgb,
+        front_rgb=front_rgb,
+        bloc_size=bloc_size,
+    )
 
 
-def draw_values(
-    working_matrix: np.array,
-    value_matrix: np.array,
+def iter_scanlines(
+    matrix: np.array,
+    background_rgb: List[int],
     front_rgb: List[int],
     bloc_size: int,
-) -> np.array:
+) -> Iterator[np.array]:
     """
-    Draw each value from matrix to complete the resulting matrix.
+    Expand each module row to a scanline once, then yield it bloc_size times.
     """
-    iterator = np.nditer(value_matrix, flags=["multi_index"])
-    for value in iterator:
-        if not value:
-            continue
+    for row in matrix:
+        scanline = colorize(
+            pixels=np.repeat(row, bloc_size)[np.newaxis],
+            background_rgb=background_rgb,
+            front_rgb=front_rgb,
+        )[0]
+        for _ in range(bloc_size):
+            yield scanline
 
-        working_matrix = draw_bloc(
-            working_matrix, iterator.multi_index, front_rgb, bloc_size
+
+def check_matrix(matrix: np.array) -> None:
+    """
+    Check the matrix to plot is a square boolean matrix.
+    """
+    if matrix.shape[0] != matrix.shape[1]:
+        raise ValueError(
+            f"QR code should be a square matrix. Got size {matrix.shape[0]}, {matrix.shape[1]}."
+        )
+    if matrix.dtype != np.dtype("bool"):
+        raise ValueError(
+            f"QR code matrix should contain booleans. Got {matrix.dtype} instead."
         )
 
-    return working_matrix
+
+def scale_matrix(matrix: np.array, bloc_size: int) -> np.array:
+    """
+    Scale the boolean matrix to pixels: each module becomes a bloc_size x bloc_size bloc.
+    """
+    return np.repeat(np.repeat(matrix, bloc_size, axis=0), bloc_size, axis=1)
 
 
-def draw_bloc(
-    working_matrix: np.array,
-    indices: Tuple[int, int],
+def colorize(
+    pixels: np.array,
+    background_rgb: List[int],
     front_rgb: List[int],
-    bloc_size: int,
 ) -> np.array:
     """
-    Draw a single bloc, by looping through each pixel of the bloc
-        and filling the pixels with front_rgb triplets.
+    Map boolean pixels to their RGB triplets, in a (height, 3 x width) uint8 matrix.
     """
-    for i in product(
-        range(bloc_size * indices[0], bloc_size * (indices[0] + 1)),
-        range(bloc_size * indices[1], bloc_size * (indices[1] + 1)),
-    ):
-        working_matrix[i[0], (3 * i[1]) : (3 * i[1] + 3)] = front_rgb
-    return working_matrix
+    palette = np.array([background_rgb, front_rgb], dtype=np.uint8)
+    return palette[pixels.view(np.uint8)].reshape(pixels.shape[0], -1)
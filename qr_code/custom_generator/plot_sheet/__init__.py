@@ -0,0 +1 @@
+from .plot_sheet import SheetLayout, plot_sheet, write_sheet
@@ -0,0 +1,263 @@
+from typing import BinaryIO, Iterator, List, NamedTuple, Sequence
+
+import numpy as np
+
+from qr_code.custom_generator.instrumentation import InstrumentationSink, start_trace
+from qr_code.custom_generator.plot_png.plot_png import (
+    DEFAULT_BLOC_SIZE,
+    check_matrix,
+    colorize,
+    get_rgbs,
+)
+
+INCHES_PER_METER = 1 / 0.0254
+
+
+class SheetLayout(NamedTuple):
+    """
+    Pixel geometry of a sheet. Every code is centered in a cell of cell_size modules.
+    """
+
+    count: int
+    columns: int
+    rows: int
+    cell_size: int
+    bloc_size: int
+    gutter: int
+    margin: int
+
+    @property
+    def cell_pixels(self) -> int:
+        """
+        Width and height of a cell, in pixels.
+        """
+        return self.cell_size * self.bloc_size
+
+    @property
+    def width(self) -> int:
+        """
+        Width of the sheet, in pixels.
+        """
+        return (
+            2 * self.margin
+            + self.columns * self.cell_pixels
+            + (self.columns - 1) * self.gutter
+        )
+
+    @property
+    def height(self) -> int:
+        """
+        Height of the sheet, in pixels.
+        """
+        return (
+            2 * self.margin
+            + self.rows * self.cell_pixels
+            + (self.rows - 1) * self.gutter
+        )
+
+
+def plot_sheet(
+    output_file: str,
+    matrices: Sequence[np.array],
+    columns: int,
+    bloc_size: int = DEFAULT_BLOC_SIZE,
+    gutter: int = 0,
+    margin: int = 0,
+    cell_size: int = None,
+    dpi: int = None,
+    instrumentation: InstrumentationSink = None,
+    **kwargs,
+) -> None:
+    """
+    Plot many QR code matrices on a single PNG sheet, columns codes per row.
+    """
+    with open(output_file, "wb") as f:
+        write_sheet(
+            f,
+            matrices=matrices,
+            columns=columns,
+            bloc_size=bloc_size,
+            gutter=gutter,
+            margin=margin,
+            cell_size=cell_size,
+            dpi=dpi,
+            instrumentation=instrumentation,
+            **kwargs,
+        )
+
+
+def write_sheet(
+    f: BinaryIO,
+    matrices: Sequence[np.array],
+    columns: int,
+    bloc_size: int = DEFAULT_BLOC_SIZE,
+    gutter: int = 0,
+    margin: int = 0,
+    cell_size: int = None,
+    dpi: int = None,
+    background_color: str = None,
+    front_color: str = None,
+    instrumentation: InstrumentationSink = None,
+) -> None:
+    """
+    Write many QR code matrices on a single PNG sheet to an open binary file object.
+    gutter (between cells) and margin (around the sheet) are in pixels.
+    cell_size defaults to the largest matrix size; giving it spares a pass over matrices.
+    dpi, if given, is stored in the PNG for the printer.
+    The sheet is written scanline by scanline: neither a code image nor the sheet
+    is ever held in memory, only one row of matrices and one scanline.
+    """
+    import png
+
+    with start_trace("plot_sheet", instrumentation) as trace:
+        layout = get_sheet_layout(
+            matrices,
+            columns=columns,
+            bloc_size=bloc_size,
+            gutter=gutter,
+            margin=margin,
+            cell_size=cell_size,
+        )
+        with trace.stage("write"):
+            physical = {}
+            if dpi is not None:
+                pixels_per_meter = round(dpi * INCHES_PER_METER)
+                physical = {
+                    "x_pixels_per_unit": pixels_per_meter,
+                    "y_pixels_per_unit": pixels_per_meter,
+                    "unit_is_meter": True,
+                }
+            writer = png.Writer(
+                width=layout.width,
+                height=layout.height,
+                greyscale=False,
+                bitdepth=8,
+                **physical,
+            )
+            writer.write(
+                f,
+                iter_sheet_scanlines(
+                    matrices, layout, **get_rgbs(background_color, front_color)
+                ),
+            )
+
+        trace.record(
+            count=layout.count,
+            columns=layout.columns,
+            width=layout.width,
+            height=layout.height,
+        )
+
+
+def get_sheet_layout(
+    matrices: Sequence[np.array],
+    columns: int,
+    bloc_size: int,
+    gutter: int,
+    margin: int,
+    cell_size: int = None,
+) -> SheetLayout:
+    """
+    Check the layout parameters and compute the sheet geometry.
+    """
+    if not matrices:
+        raise ValueError("A sheet should hold at least one QR code.")
+    if columns < 1 or bloc_size < 1:
+        raise ValueError(
+            f"columns and bloc_size should be positive. Got {columns}, {bloc_size}."
+        )
+    if gutter < 0 or margin < 0:
+        raise ValueError(
+            f"gutter and margin should not be negative. Got {gutter}, {margin}."
+        )
+    if cell_size is None:
+        cell_size = max(matrix.shape[0] for matrix in matrices)
+
+    columns = min(columns, len(matrices))
+    return SheetLayout(
+        count=len(matrices),
+        columns=columns,
+        rows=-(-len(matrices) // columns),
+        cell_size=cell_size,
+        bloc_size=bloc_size,
+        gutter=gutter,
+        margin=margin,
+    )
+
+
+def get_pixel_sources(layout: SheetLayout) -> np.array:
+    """
+    For each pixel column of the sheet, index of the module it shows
+    in a row of cells flattened side by side, with one extra background module at the end
+    shown by the margins and gutters.
+    """
+    background = layout.columns * layout.cell_size
+    sources = np.full(layout.width, background, dtype=np.intp)
+    modules = np.repeat(np.arange(layout.cell_size), layout.bloc_size)
+    for column in range(layout.columns):
+        start = layout.margin + column * (layout.cell_pixels + layout.gutter)
+        sources[start : start + layout.cell_pixels] = (
+            modules + column * layout.cell_size
+        )
+    return sources
+
+
+def fill_cells(
+    cells: np.array, matrices: Sequence[np.array], first: int, layout: SheetLayout
+) -> None:
+    """
+    Copy the matrices of a row of the sheet into their cells, centered.
+    Cells after the last matrix are left blank.
+    """
+    cells[:] = False
+    for column, index in enumerate(
+        range(first, min(first + layout.columns, layout.count))
+    ):
+        matrix = matrices[index]
+        check_matrix(matrix)
+        size = matrix.shape[0]
+        if size > layout.cell_size:
+            raise ValueError(
+                f"QR code {index} of size {size} does not fit in cells of size {layout.cell_size}."
+            )
+        offset = (layout.cell_size - size) // 2
+        cells[column, offset : offset + size, offset : offset + size] = matrix
+
+
+def iter_sheet_scanlines(
+    matrices: Sequence[np.array],
+    layout: SheetLayout,
+    background_rgb: List[int],
+    front_rgb: List[int],
+) -> Iterator[np.array]:
+    """
+    Yield the sheet scanlines. Each module row of a row of cells is expanded
+    to a scanline with a single gather, then yielded bloc_size times.
+    """
+    sources = get_pixel_sources(layout)
+    background_scanline = colorize(
+        pixels=np.zeros((1, layout.width), dtype=bool),
+        background_rgb=background_rgb,
+        front_rgb=front_rgb,
+    )[0]
+    cells = np.zeros((layout.columns, layout.cell_size, layout.cell_size), dtype=bool)
+    modules = np.zeros(layout.columns * layout.cell_size + 1, dtype=bool)
+
+    for _ in range(layout.margin):
+        yield background_scanline
+    for row in range(layout.rows):
+        if row:
+            for _ in range(layout.gutter):
+                yield background_scanline
+        fill_cells(cells, matrices, row * layout.columns, layout)
+        for module_row in range(layout.cell_size):
+            modules[:-1] = cells[:, module_row, :].ravel()
+            scanline = colorize(
+                pixels=modules[sources][np.newaxis],
+                background_rgb=background_rgb,
+                front_rgb=front_rgb,
+            )[0]
+            for _ in range(layout.bloc_size):
+                yield scanline
+    for _ in range(layout.margin):
+        yield background_scanline
@@ -0,0 +1 @@
+from .plot_svg import plot_svg, write_svg
@@ -0,0 +1,114 @@
+from typing import BinaryIO, Iterator, List, Tuple
+
+import numpy as np
+
+from qr_code.custom_generator.plot_png.plot_png import (
+    DEFAULT_BLOC_SIZE,
+    check_matrix,
+    get_rgbs,
+)
+
+
+def plot_svg(
+    output_file: str,
+    matrix: np.array,
+    bloc_size: int = DEFAULT_BLOC_SIZE,
+    background_color: str = None,
+    front_color: str = None,
+) -> None:
+    """
+    Plot a QR code matrix in SVG format.
+    """
+    with open(output_file, "wb") as f:
+        write_svg(
+            f,
+            matrix=matrix,
+            bloc_size=bloc_size,
+            background_color=background_color,
+            front_color=front_color,
+        )
+
+
+def write_svg(
+    f: BinaryIO,
+    matrix: np.array,
+    bloc_size: int = DEFAULT_BLOC_SIZE,
+    background_color: str = None,
+    front_color: str = None,
+) -> None:
+    """
+    Write a QR code matrix in SVG format to an open binary file object.
+    Colors are CSS color names, as for plot_png.
+    """
+    colors = get_rgbs(background_color, front_color)
+    f.write(
+        draw_svg(
+            matrix=matrix,
+            background_rgb=colors["background_rgb"],
+            front_rgb=colors["front_rgb"],
+            bloc_size=bloc_size,
+        ).encode("utf-8")
+    )
+
+
+def draw_svg(
+    matrix: np.array,
+    background_rgb: List[int],
+    front_rgb: List[int],
+    bloc_size: int = DEFAULT_BLOC_SIZE,
+) -> str:
+    """
+    Draw the matrix as an SVG document: a background rectangle,
+    and all the dark modules as a single path, in module units scaled by the viewBox.
+    """
+    check_matrix(matrix)
+
+    modules_count = matrix.shape[0]
+    size = modules_count * bloc_size
+    path = "".join(
+        f"M{x} {y}h{width}v{height}h-{width}z"
+        for x, y, width, height in iter_rectangles(matrix)
+    )
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" '
+        f'viewBox="0 0 {modules_count} {modules_count}" shape-rendering="crispEdges">'
+        f'<rect width="100%" height="100%" fill="{to_hex(background_rgb)}"/>'
+        f'<path fill="{to_hex(front_rgb)}" d="{path}"/>'
+        "</svg>\n"
+    )
+
+
+def iter_rectangles(matrix: np.array) -> Iterator[Tuple[int, int, int, int]]:
+    """
+    Cover the dark modules with (x, y, width, height) rectangles:
+    horizontal runs of each row, merged with the identical runs of the rows below.
+    """
+    open_rectangles = {}
+    for y, row in enumerate(matrix):
+        runs = get_runs(row)
+        current_runs = set(runs)
+        for run in list(open_rectangles):
+            if run not in current_runs:
+                start_y = open_rectangles.pop(run)
+                yield run[0], start_y, run[1], y - start_y
+        for run in runs:
+            open_rectangles.setdefault(run, y)
+
+    for (x, width), start_y in open_rectangles.items():
+        yield x, start_y, width, matrix.shape[0] - start_y
+
+
+def get_runs(row: np.array) -> List[Tuple[int, int]]:
+    """
+    Get the (start, length) runs of True values of a boolean row.
+    """
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], row, [False]))))
+    starts, ends = edges[::2], edges[1::2]
+    return list(zip(starts.tolist(), (ends - starts).tolist()))
+
+
+def to_hex(rgb: List[int]) -> str:
+    """
+    Format an RGB triplet as a #rrggbb color.
+    """
+    return "#{:02x}{:02x}{:02x}".format(*rgb)
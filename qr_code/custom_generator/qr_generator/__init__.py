@@ -1 +1,11 @@
-from .generate_qr_code import generate_qr_code
+from qr_code.custom_generator.lazy_exports import install_lazy_exports
+
+# Exported name to the module defining it, imported on first access.
+__all__ = ["generate_qr_code", "warmup"]
+install_lazy_exports(
+    __name__,
+    {
+        "generate_qr_code": ".generate_qr_code",
+        "warmup": ".warmup",
+    },
+)
@@ -0,0 +1,96 @@
+class BitBuffer:
+    """
+    Append-only buffer of bits, packed most significant bit first in a bytearray.
+    Bits that do not fill a whole byte yet are kept in a small integer accumulator.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.accumulator = 0
+        self.pending_bits = 0
+
+    def __len__(self) -> int:
+        return 8 * len(self.data) + self.pending_bits
+
+    def append(self, value: int, length: int) -> None:
+        """
+        Append the length lowest bits of value, most significant first.
+        """
+        if value < 0 or value >> length:
+            raise ValueError(f"Value {value} does not fit in {length} bits.")
+
+        self.accumulator = (self.accumulator << length) | value
+        self.pending_bits += length
+        full_bytes = self.pending_bits // 8
+        if full_bytes:
+            self.pending_bits -= 8 * full_bytes
+            self.data += (self.accumulator >> self.pending_bits).to_bytes(
+                full_bytes, "big"
+            )
+            self.accumulator &= (1 << self.pending_bits) - 1
+
+    def append_bytes(self, data: bytes) -> None:
+        """
+        Append whole bytes.
+        """
+        if self.pending_bits == 0:
+            self.data += data
+        else:
+            self.append(int.from_bytes(data, "big"), 8 * len(data))
+
+    def extend(self, other: "BitBuffer") -> None:
+        """
+        Append all the bits of another buffer.
+        """
+        self.append_bytes(bytes(other.data))
+        self.append(other.accumulator, other.pending_bits)
+
+    def pad_to_byte(self) -> None:
+        """
+        Append 0s until the length is a multiple of 8.
+        """
+        if self.pending_bits:
+            self.append(0, 8 - self.pending_bits)
+
+    def to_bytes(self) -> bytes:
+        """
+        Get the content as bytes, the last one padded with 0s.
+        """
+        if self.pending_bits == 0:
+            return bytes(self.data)
+        return bytes(self.data) + (
+            self.accumulator << (8 - self.pending_bits)
+        ).to_bytes(1, "big")
+
+    def __str__(self) -> str:
+        return "".join(f"{byte:08b}" for byte in self.to_bytes())[: len(self)]
+
+
+class BitReader:
+    """
+    Reads bits from bytes, most significant bit first.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.position = 0
+
+    @property
+    def remaining(self) -> int:
+        """
+        Number of bits left to read.
+        """
+        return 8 * len(self.data) - self.position
+
+    def read(self, length: int) -> int:
+        """
+        Read the next length bits as an integer.
+        """
+        if length > self.remaining:
+            raise ValueError(
+                f"Cannot read {length} bits, only {self.remaining} remaining."
+            )
+        end = self.position + length
+        chunk = int.from_bytes(self.data[self.position // 8 : (end + 7) // 8], "big")
+        self.position = end
+        return (chunk >> (-end % 8)) & ((1 << length) - 1)
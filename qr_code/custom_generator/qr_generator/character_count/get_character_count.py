@@ -1,17 +1,16 @@
-from pathlib import Path
+from typing import Tuple
 
-import pandas as pd
+from qr_code.custom_generator.qr_generator.spec_tables import get_character_count_bits
 
 
-def get_character_count_indicator(url: str, version: int, mode: str = "Byte") -> str:
+def get_character_count_indicator(
+    url: str, version: int, mode: str = "Byte"
+) -> Tuple[int, int]:
     """
-    From the input URL and the version, get the character count indicator.
-    Should also depend on the mode, but we're supporting bytes only.
+    From the input URL and the version, get the character count indicator,
+    as its value and its length in bits.
+    The value is the number of characters, the length depends on the mode.
     """
-    bits_count_table = pd.read_csv(Path(__file__).parent / "characterCountTable.csv")
+    bits_count = get_character_count_bits(version=version, mode=mode)
 
-    bits_count = bits_count_table.loc[
-        bits_count_table["Version"] == version, mode
-    ].squeeze()
-
-    return f"{len(url):0{bits_count}b}"
+    return len(url), bits_count
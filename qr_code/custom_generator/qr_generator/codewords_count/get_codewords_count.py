@@ -1,12 +1,7 @@
-from pathlib import Path
-
-import pandas as pd
-
 from qr_code.custom_generator.qr_generator.error_correction_level import (
     ErrorCorrectionLevel,
 )
-
-CODEWORDS_TABLE = pd.read_csv(Path(__file__).parent / "codewordsTable.csv")
+from qr_code.custom_generator.qr_generator.spec_tables import get_codewords_record
 
 
 def get_codewords_count(
@@ -16,8 +11,4 @@ def get_codewords_count(
     Get the total number of bytes to fill,
     corresponding to the given QR code version and error correction level
     """
-    return CODEWORDS_TABLE.loc[
-        (CODEWORDS_TABLE["Version"] == version)
-        & (CODEWORDS_TABLE["EC Level"] == error_correction_level.name),
-        "Codewords",
-    ].squeeze()
+    return get_codewords_record(version, error_correction_level).data_codewords
@@ -0,0 +1 @@
+from .decode_qr_code import DecodedSymbol, decode_qr_code, verify_qr_code
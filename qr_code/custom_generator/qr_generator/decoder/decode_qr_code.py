@@ -0,0 +1,254 @@
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from qr_code.custom_generator.qr_generator.bit_buffer import BitReader
+from qr_code.custom_generator.qr_generator.encode_data.encode_data import (
+    ALPHANUMERIC_CHARACTERS,
+    NUMERIC_GROUP_BITS,
+)
+from qr_code.custom_generator.qr_generator.error_correction import correct_block
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+from qr_code.custom_generator.qr_generator.qr_matrix import get_mask_grids, read_bits
+from qr_code.custom_generator.qr_generator.qr_matrix.format_matrix import (
+    get_format_information_positions,
+    get_version_information_positions,
+)
+from qr_code.custom_generator.qr_generator.qr_matrix.get_qr_matrix import (
+    get_version_from_size,
+)
+from qr_code.custom_generator.qr_generator.segmentation import Segment
+from qr_code.custom_generator.qr_generator.segmentation.segment_data import (
+    MODE_INDICATOR_LENGTH,
+)
+from qr_code.custom_generator.qr_generator.spec_tables import (
+    MAX_VERSION,
+    get_character_count_bits,
+    get_codewords_record,
+    get_spec_tables,
+)
+from qr_code.custom_generator.qr_generator.structured_append import StructuredAppend
+
+INDICATOR_TO_MODE = {
+    0b0001: "Numeric",
+    0b0010: "Alphanumeric",
+    0b0100: "Byte",
+}
+TERMINATOR = 0b0000
+STRUCTURED_APPEND_INDICATOR = 0b0011
+# Format and version information are BCH codes correcting up to 3 bit errors.
+MAX_INFORMATION_ERRORS = 3
+
+
+class DecodedSymbol(NamedTuple):
+    """
+    Content and parameters read back from a QR code matrix.
+    """
+
+    payload: str
+    version: int
+    error_correction_level: ErrorCorrectionLevel
+    mask_number: int
+    segments: List[Segment]
+    corrected_codewords: int
+    structured_append: Optional[StructuredAppend] = None
+
+
+def decode_qr_code(matrix: np.array) -> DecodedSymbol:
+    """
+    Decode a QR code matrix, with or without quiet zone, as generated by generate_qr_code:
+        - Read the format information: error correction level and mask
+        - Unmask, and read the codewords in placement order
+        - De-interleave the blocks, check and correct them with Reed-Solomon
+        - Parse the segments back to the payload
+    Raise ValueError if the matrix cannot be decoded.
+    """
+    matrix = remove_quiet_zone(matrix)
+    version = get_version_from_size(matrix.shape[0])
+    if not 1 <= version <= MAX_VERSION or matrix.shape[0] != 17 + 4 * version:
+        raise ValueError(f"Invalid QR code size {matrix.shape[0]}.")
+    check_version_information(matrix=matrix, version=version)
+
+    error_correction_level, mask_number = read_format_information(matrix)
+    unmasked = matrix ^ get_mask_grids(version)[mask_number]
+
+    record = get_codewords_record(version, error_correction_level)
+    total_codewords = (
+        record.data_codewords + record.ec_codewords_per_block * record.blocks_count
+    )
+    codewords = np.packbits(read_bits(unmasked)[: 8 * total_codewords]).tobytes()
+
+    data_codewords = bytearray()
+    corrected_codewords = 0
+    for block in deinterleave(
+        codewords=codewords,
+        block_sizes=record.block_sizes,
+        ec_codewords_per_block=record.ec_codewords_per_block,
+    ):
+        data, corrected = correct_block(block, record.ec_codewords_per_block)
+        data_codewords += data
+        corrected_codewords += corrected
+
+    segments, structured_append = parse_segments(
+        data_codewords=bytes(data_codewords), version=version
+    )
+    return DecodedSymbol(
+        payload="".join(segment.text for segment in segments),
+        version=version,
+        error_correction_level=error_correction_level,
+        mask_number=mask_number,
+        segments=segments,
+        corrected_codewords=corrected_codewords,
+        structured_append=structured_append,
+    )
+
+
+def verify_qr_code(matrix: np.array, url: str) -> DecodedSymbol:
+    """
+    Decode the matrix and check it holds exactly the url, without any corrected codeword.
+    Raise ValueError otherwise.
+    """
+    decoded = decode_qr_code(matrix)
+    if decoded.payload != url:
+        raise ValueError(
+            f"Verification failed: decoded {decoded.payload[:50]!r} "
+            f"instead of {url[:50]!r}."
+        )
+    if decoded.corrected_codewords:
+        raise ValueError(
+            f"Verification failed: {decoded.corrected_codewords} codewords "
+            "needed error correction."
+        )
+    return decoded
+
+
+def remove_quiet_zone(matrix: np.array) -> np.array:
+    """
+    Crop the matrix to its dark modules bounding box: the finder patterns
+    make the symbol start and end with dark modules on every side.
+    """
+    rows = np.flatnonzero(matrix.any(axis=1))
+    columns = np.flatnonzero(matrix.any(axis=0))
+    if len(rows) == 0:
+        raise ValueError("The matrix has no dark module.")
+    return matrix[rows[0] : rows[-1] + 1, columns[0] : columns[-1] + 1]
+
+
+def read_format_information(matrix: np.array) -> Tuple[ErrorCorrectionLevel, int]:
+    """
+    Read both copies of the format information and get the closest valid format,
+    as (error correction level, mask number).
+    """
+    copies = [
+        "".join("1" if matrix[position] else "0" for position in positions)
+        for positions in get_format_information_positions(matrix.shape[0])
+    ]
+    distance, (level_name, mask_number) = min(
+        (min(hamming_distance(copy, bits) for copy in copies), key)
+        for key, bits in get_spec_tables().format_information.items()
+    )
+    if distance > MAX_INFORMATION_ERRORS:
+        raise ValueError("Unreadable format information.")
+    return ErrorCorrectionLevel[level_name], mask_number
+
+
+def check_version_information(matrix: np.array, version: int) -> None:
+    """
+    For version 7 and above, check the version information agrees with the matrix size.
+    """
+    if version < 7:
+        return
+
+    expected_bits = get_spec_tables().version_information[version][::-1]
+    for positions in get_version_information_positions(matrix.shape[0]):
+        bits = "".join("1" if matrix[position] else "0" for position in positions)
+        if hamming_distance(bits, expected_bits) <= MAX_INFORMATION_ERRORS:
+            return
+    raise ValueError(f"Version information does not match version {version}.")
+
+
+def hamming_distance(a: str, b: str) -> int:
+    """
+    Count the differing bits of two bit strings.
+    """
+    return sum(bit_a != bit_b for bit_a, bit_b in zip(a, b))
+
+
+def deinterleave(
+    codewords: bytes, block_sizes: Tuple[int, ...], ec_codewords_per_block: int
+) -> List[bytes]:
+    """
+    Undo interleaving: rebuild each block, its data codewords followed by
+    its error correction codewords.
+    """
+    data_blocks = [bytearray() for _ in block_sizes]
+    position = 0
+    for index in range(max(block_sizes)):
+        for block, block_size in zip(data_blocks, block_sizes):
+            if index < block_size:
+                block.append(codewords[position])
+                position += 1
+
+    blocks_count = len(block_sizes)
+    return [
+        bytes(data_block) + codewords[position + index :: blocks_count]
+        for index, data_block in enumerate(data_blocks)
+    ]
+
+
+def parse_segments(
+    data_codewords: bytes, version: int
+) -> Tuple[List[Segment], Optional[StructuredAppend]]:
+    """
+    Parse the data bits back into segments, until the terminator or the end of the data.
+    A leading Structured Append header is returned apart.
+    """
+    reader = BitReader(data_codewords)
+    segments = []
+    structured_append = None
+    while reader.remaining >= MODE_INDICATOR_LENGTH:
+        indicator = reader.read(MODE_INDICATOR_LENGTH)
+        if indicator == TERMINATOR:
+            break
+        if indicator == STRUCTURED_APPEND_INDICATOR:
+            structured_append = StructuredAppend(
+                position=reader.read(4), total=reader.read(4) + 1, parity=reader.read(8)
+            )
+            continue
+        if indicator not in INDICATOR_TO_MODE:
+            raise ValueError(f"Unsupported mode indicator {indicator:04b}.")
+
+        mode = INDICATOR_TO_MODE[indicator]
+        count = reader.read(get_character_count_bits(version, mode))
+        segments.append(Segment(mode=mode, text=read_text(reader, mode, count)))
+
+    return segments, structured_append
+
+
+def read_text(reader: BitReader, mode: str, count: int) -> str:
+    """
+    Read count characters encoded in the given mode.
+    """
+    if mode == "Numeric":
+        groups = []
+        for start in range(0, count, 3):
+            digits = min(3, count - start)
+            value = reader.read(NUMERIC_GROUP_BITS[digits])
+            if value >= 10**digits:
+                raise ValueError(f"Invalid numeric group {value}.")
+            groups.append(f"{value:0{digits}d}")
+        return "".join(groups)
+
+    if mode == "Alphanumeric":
+        values = []
+        for _ in range(count // 2):
+            values += divmod(reader.read(11), 45)
+        if count % 2:
+            values.append(reader.read(6))
+        if any(value >= len(ALPHANUMERIC_CHARACTERS) for value in values):
+            raise ValueError("Invalid alphanumeric character.")
+        return "".join(ALPHANUMERIC_CHARACTERS[value] for value in values)
+
+    return bytes(reader.read(8) for _ in range(count)).decode("latin-1")
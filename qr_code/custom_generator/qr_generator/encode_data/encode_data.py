@@ -1,10 +1,71 @@
-def encode_data(url: str, mode: str) -> str:
+from qr_code.custom_generator.qr_generator.bit_buffer import BitBuffer
+
+NUMERIC_CHARACTERS = "0123456789"
+ALPHANUMERIC_CHARACTERS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
+ALPHANUMERIC_VALUES = {
+    character: value for value, character in enumerate(ALPHANUMERIC_CHARACTERS)
+}
+NUMERIC_GROUP_BITS = {1: 4, 2: 7, 3: 10}
+
+
+def encode_data(url: str, mode: str) -> BitBuffer:
+    """
+    Encode the data bits, in the given mode.
+    """
+    encoders = {
+        "Numeric": encode_numeric,
+        "Alphanumeric": encode_alphanumeric,
+        "Byte": encode_byte,
+    }
+    if mode not in encoders:
+        raise ValueError(f"Mode {mode} is not supported.")
+
+    check_characters(url=url, mode=mode)
+    buffer = BitBuffer()
+    encoders[mode](url=url, buffer=buffer)
+    return buffer
+
+
+def check_characters(url: str, mode: str) -> None:
     """
-    Encode the data in bytes.
+    Check all characters of the url can be encoded in the given mode.
     """
-    if mode != "Byte":
-        raise ValueError("Only Byte mode is supported.")
+    if mode == "Numeric":
+        allowed = all(character in NUMERIC_CHARACTERS for character in url)
+    elif mode == "Alphanumeric":
+        allowed = all(character in ALPHANUMERIC_VALUES for character in url)
+    else:
+        allowed = url.isascii()
+    if not allowed:
+        raise ValueError(f"Data contains characters not supported by {mode} mode.")
 
-    if not url.isascii():
-        raise ValueError("ASCII characters only are supported.")
-    return "".join(f"{ord(i):08b}" for i in url)
+
+def encode_numeric(url: str, buffer: BitBuffer) -> None:
+    """
+    Numeric mode: each group of 3 digits is encoded on 10 bits,
+    a last group of 2 or 1 digits on 7 or 4 bits.
+    """
+    for start in range(0, len(url), 3):
+        group = url[start : start + 3]
+        buffer.append(int(group), NUMERIC_GROUP_BITS[len(group)])
+
+
+def encode_alphanumeric(url: str, buffer: BitBuffer) -> None:
+    """
+    Alphanumeric mode: each pair of characters is encoded on 11 bits as 45 * first + second,
+    a last single character on 6 bits.
+    """
+    for start in range(0, len(url) - 1, 2):
+        buffer.append(
+            45 * ALPHANUMERIC_VALUES[url[start]] + ALPHANUMERIC_VALUES[url[start + 1]],
+            11,
+        )
+    if len(url) % 2:
+        buffer.append(ALPHANUMERIC_VALUES[url[-1]], 6)
+
+
+def encode_byte(url: str, buffer: BitBuffer) -> None:
+    """
+    Byte mode: each (ASCII) character is encoded on 8 bits.
+    """
+    buffer.append_bytes(url.encode("ascii"))
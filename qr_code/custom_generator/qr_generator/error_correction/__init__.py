@@ -1 +1,2 @@
 from .encode_message import encode_message
+from .correct_errors import correct_block
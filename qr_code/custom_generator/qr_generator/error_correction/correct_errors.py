@@ -0,0 +1,145 @@
+from typing import List, Tuple
+
+from qr_code.custom_generator.qr_generator.error_correction.galois_field import (
+    EXP_TABLE,
+    LOG_TABLE,
+    gf_divide,
+    gf_multiply,
+    reed_solomon_remainder,
+)
+
+
+def correct_block(block: bytes, ec_codewords_count: int) -> Tuple[bytes, int]:
+    """
+    Check a received block, data codewords followed by error correction codewords,
+    and correct up to ec_codewords_count // 2 erroneous codewords.
+    Return the data codewords and the number of corrected codewords.
+    Raise ValueError if the block has too many errors to be corrected.
+    """
+    data_count = len(block) - ec_codewords_count
+    data = block[:data_count]
+    # Fast path: an error-free block is its data followed by their remainder.
+    if reed_solomon_remainder(data, ec_codewords_count) == block[data_count:]:
+        return data, 0
+
+    syndromes = get_syndromes(block, ec_codewords_count)
+    locator = get_error_locator(syndromes)
+    error_degrees = find_error_degrees(locator, len(block))
+    if len(error_degrees) != len(locator) - 1:
+        raise ValueError("Too many errors to correct the block.")
+
+    corrected = bytearray(block)
+    evaluator = multiply_polynomials(syndromes, locator)[: len(syndromes)]
+    for degree in error_degrees:
+        corrected[len(block) - 1 - degree] ^= get_error_magnitude(
+            locator, evaluator, degree
+        )
+
+    if any(get_syndromes(bytes(corrected), ec_codewords_count)):
+        raise ValueError("Too many errors to correct the block.")
+    return bytes(corrected[:data_count]), len(error_degrees)
+
+
+def get_syndromes(block: bytes, ec_codewords_count: int) -> List[int]:
+    """
+    Evaluate the received polynomial (first codeword of highest degree)
+    at each root 2^j of the generator polynomial. All are 0 for a valid block.
+    """
+    syndromes = []
+    for j in range(ec_codewords_count):
+        value = 0
+        for codeword in block:
+            value = gf_multiply(value, EXP_TABLE[j]) ^ codeword
+        syndromes.append(value)
+    return syndromes
+
+
+def get_error_locator(syndromes: List[int]) -> List[int]:
+    """
+    Berlekamp-Massey: find the shortest error locator polynomial, lowest degree first,
+    whose roots are the inverses of 2^degree for each erroneous codeword degree.
+    """
+    locator = [1]
+    previous_locator = [1]
+    errors_count = 0
+    shift = 1
+    previous_discrepancy = 1
+    for index, syndrome in enumerate(syndromes):
+        discrepancy = syndrome
+        for i in range(1, errors_count + 1):
+            discrepancy ^= gf_multiply(locator[i], syndromes[index - i])
+
+        if discrepancy == 0:
+            shift += 1
+            continue
+
+        factor = gf_divide(discrepancy, previous_discrepancy)
+        updated = locator + [0] * max(0, len(previous_locator) + shift - len(locator))
+        for i, coefficient in enumerate(previous_locator):
+            updated[i + shift] ^= gf_multiply(factor, coefficient)
+
+        if 2 * errors_count <= index:
+            previous_locator = locator
+            errors_count = index + 1 - errors_count
+            previous_discrepancy = discrepancy
+            shift = 1
+        else:
+            shift += 1
+        locator = updated
+
+    return locator[: errors_count + 1]
+
+
+def find_error_degrees(locator: List[int], block_length: int) -> List[int]:
+    """
+    Chien search: get the degrees whose 2^-degree is a root of the locator.
+    """
+    return [
+        degree
+        for degree in range(block_length)
+        if evaluate_polynomial(locator, EXP_TABLE[(255 - degree) % 255]) == 0
+    ]
+
+
+def get_error_magnitude(locator: List[int], evaluator: List[int], degree: int) -> int:
+    """
+    Forney: get the value to XOR to the codeword of the given degree,
+    X * evaluator(1 / X) / locator'(1 / X) with X = 2^degree.
+    """
+    inverse = EXP_TABLE[(255 - degree) % 255]
+    # Formal derivative: in characteristic 2, only odd degree terms remain.
+    derivative = [coefficient if i % 2 else 0 for i, coefficient in enumerate(locator)][
+        1:
+    ]
+    return gf_multiply(
+        EXP_TABLE[degree % 255],
+        gf_divide(
+            evaluate_polynomial(evaluator, inverse),
+            evaluate_polynomial(derivative, inverse),
+        ),
+    )
+
+
+def evaluate_polynomial(polynomial: List[int], x: int) -> int:
+    """
+    Evaluate a polynomial, lowest degree first, at x (Horner).
+    """
+    value = 0
+    for coefficient in reversed(polynomial):
+        value = gf_multiply(value, x) ^ coefficient
+    return value
+
+
+def multiply_polynomials(a: List[int], b: List[int]) -> List[int]:
+    """
+    Multiply two polynomials, lowest degree first.
+    """
+    result = [0] * (len(a) + len(b) - 1)
+    for i, a_coefficient in enumerate(a):
+        if a_coefficient == 0:
+            continue
+        log_a = LOG_TABLE[a_coefficient]
+        for j, b_coefficient in enumerate(b):
+            if b_coefficient:
+                result[i + j] ^= EXP_TABLE[log_a + LOG_TABLE[b_coefficient]]
+    return result
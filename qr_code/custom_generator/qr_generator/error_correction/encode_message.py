@@ -1,81 +1,51 @@
-import json
-from pathlib import Path
-
-import pandas as pd
+from typing import List
 
 from qr_code.custom_generator.qr_generator.error_correction_level import (
     ErrorCorrectionLevel,
 )
-from qr_code.custom_generator.qr_generator.codewords_count import CODEWORDS_TABLE
+from qr_code.custom_generator.qr_generator.spec_tables import get_codewords_record
 from qr_code.custom_generator.qr_generator.error_correction.split_blocks import (
     split_blocks,
 )
-from qr_code.custom_generator.qr_generator.error_correction.polynomial_division import (
-    divide_polynomials,
-)
-
-
-with open(
-    Path(__file__).parent / "generatorPolynomial.json",
-    "r",
-    encoding="utf-8"
-) as f:
-    GENERATOR_POLYNOMIALS = json.load(f)
-
-REMAINDER_BITS = pd.read_csv(
-    Path(__file__).parent / "remainderBits.csv"
+from qr_code.custom_generator.qr_generator.error_correction.galois_field import (
+    reed_solomon_remainder,
 )
 
 
 def encode_message(
-    raw_data_bits: str, version: int, error_correction_level: ErrorCorrectionLevel
-) -> str:
+    data_codewords: bytes, version: int, error_correction_level: ErrorCorrectionLevel
+) -> bytes:
     """
-    Encode the message
+    Encode the message: compute the error correction codewords of each block,
+    then interleave data codewords and error correction codewords.
     """
     group_1, group_2 = split_blocks(
-        bits=raw_data_bits,
+        codewords=data_codewords,
         version=version,
         error_correction_level=error_correction_level,
     )
+    blocks = group_1 + group_2
 
-    error_correction_codewords_per_block = CODEWORDS_TABLE.loc[
-        (CODEWORDS_TABLE["Version"] == version)
-        & (CODEWORDS_TABLE["EC Level"] == error_correction_level.name),
-        "EC Codewords Per Block",
-    ].squeeze()
-    generator_polynomial = GENERATOR_POLYNOMIALS[
-        str(error_correction_codewords_per_block)
-    ]
-
-    error_correction_codewords = []
-    for block_ints in group_1 + group_2:
-        error_correction_codewords.append(
-            divide_polynomials(block_ints, generator_polynomial)
-        )
-
-    # Interleaving data
-    data_interleaved = []
-    for index in range(max(len(block) for block in group_1 + group_2)):
-        for block in group_1 + group_2:
-            if index < len(block):
-                data_interleaved.append(block[index])
+    error_correction_codewords_per_block = get_codewords_record(
+        version, error_correction_level
+    ).ec_codewords_per_block
 
-    for index in range(len(error_correction_codewords[0])):
-        for block in error_correction_codewords:
-            data_interleaved.append(block[index])
+    error_correction_codewords = [
+        reed_solomon_remainder(block, error_correction_codewords_per_block)
+        for block in blocks
+    ]
 
-    data_interleaved_bits = "".join(
-        [f"{int_value:>08b}" for int_value in data_interleaved]
-    )
-    return add_remainder_bits(data_interleaved_bits, version)
+    return interleave(blocks) + interleave(error_correction_codewords)
 
 
-def add_remainder_bits(bits: str, version: int) -> str:
+def interleave(blocks: List[bytes]) -> bytes:
     """
-    Add the remainder bits depending on the QR code version.
+    Interleave blocks: first codeword of each block, then second codeword of each block, etc.
+    Blocks can have different lengths, shorter ones being skipped once exhausted.
     """
-    amount = REMAINDER_BITS.loc[
-        REMAINDER_BITS["Version"] == version, "Remainder Bits"
-    ].squeeze()
-    return bits + "0" * amount
+    result = bytearray()
+    for index in range(max(len(block) for block in blocks)):
+        for block in blocks:
+            if index < len(block):
+                result.append(block[index])
+    return bytes(result)
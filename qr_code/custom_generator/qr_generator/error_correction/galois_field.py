@@ -0,0 +1,118 @@
+from functools import lru_cache
+from typing import List, Tuple
+
+# QR codes use GF(256) built on the primitive polynomial x^8 + x^4 + x^3 + x^2 + 1.
+PRIMITIVE_POLYNOMIAL = 0x11D
+
+
+def build_tables() -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """
+    Build the exponent and logarithm tables of GF(256).
+    The exponent table is doubled (510 entries) so that exponent sums never need a modulo.
+    The logarithm of 0 is undefined and stored as 0.
+    """
+    exp_table = [0] * 510
+    log_table = [0] * 256
+    value = 1
+    for exponent in range(255):
+        exp_table[exponent] = value
+        log_table[value] = exponent
+        value <<= 1
+        if value & 0x100:
+            value ^= PRIMITIVE_POLYNOMIAL
+    for exponent in range(255, 510):
+        exp_table[exponent] = exp_table[exponent - 255]
+
+    return tuple(exp_table), tuple(log_table)
+
+
+EXP_TABLE, LOG_TABLE = build_tables()
+
+
+def gf_multiply(a: int, b: int) -> int:
+    """
+    Multiply two elements of GF(256).
+    """
+    if a == 0 or b == 0:
+        return 0
+    return EXP_TABLE[LOG_TABLE[a] + LOG_TABLE[b]]
+
+
+def gf_divide(a: int, b: int) -> int:
+    """
+    Divide two elements of GF(256).
+    """
+    if b == 0:
+        raise ZeroDivisionError("Division by 0 in GF(256).")
+    if a == 0:
+        return 0
+    return EXP_TABLE[LOG_TABLE[a] + 255 - LOG_TABLE[b]]
+
+
+@lru_cache(maxsize=None)
+def get_generator_polynomial(degree: int) -> Tuple[int, ...]:
+    """
+    Get the generator polynomial of the given degree, (x - 2^0)...(x - 2^(degree - 1)).
+    Coefficients are integers, from degree to 0, the leading one being 1.
+    """
+    polynomial = [1]
+    for root_exponent in range(degree):
+        root = EXP_TABLE[root_exponent]
+        result = polynomial + [0]
+        for index, coefficient in enumerate(polynomial):
+            result[index + 1] ^= gf_multiply(coefficient, root)
+        polynomial = result
+
+    return tuple(polynomial)
+
+
+def polynomial_to_exponents(polynomial: Tuple[int, ...]) -> List[int]:
+    """
+    Convert polynomial integer coefficients to exponents of 2,
+    as stored in generatorPolynomial.json.
+    """
+    return [LOG_TABLE[coefficient] for coefficient in polynomial]
+
+
+def exponents_to_polynomial(exponents: List[int]) -> Tuple[int, ...]:
+    """
+    Convert exponents of 2 to polynomial integer coefficients.
+    """
+    return tuple(EXP_TABLE[exponent % 255] for exponent in exponents)
+
+
+@lru_cache(maxsize=None)
+def get_remainder_table(degree: int) -> Tuple[int, ...]:
+    """
+    For each possible leading byte f, precompute f * g(x) without its leading term,
+    packed in a single integer (one byte per coefficient, highest degree first).
+    Dividing then only takes a shift and a XOR per data codeword.
+    """
+    generator_logs = [
+        LOG_TABLE[coefficient] for coefficient in get_generator_polynomial(degree)[1:]
+    ]
+    table = [0]
+    for factor in range(1, 256):
+        factor_log = LOG_TABLE[factor]
+        table.append(
+            int.from_bytes(
+                bytes(EXP_TABLE[factor_log + log] for log in generator_logs), "big"
+            )
+        )
+    return tuple(table)
+
+
+def reed_solomon_remainder(data: bytes, degree: int) -> bytes:
+    """
+    Compute the Reed-Solomon error correction codewords of the data block:
+    the remainder of data(x) * x^degree divided by the generator polynomial of the given degree.
+    """
+    table = get_remainder_table(degree)
+    shift = 8 * (degree - 1)
+    mask = (1 << (8 * degree)) - 1
+    remainder = 0
+    for byte in data:
+        factor = (remainder >> shift) ^ byte
+        remainder = ((remainder << 8) & mask) ^ table[factor]
+
+    return remainder.to_bytes(degree, "big")
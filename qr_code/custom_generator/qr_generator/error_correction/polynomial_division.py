@@ -1,44 +1,28 @@
 from typing import List
 
-from .generator_polynomials import get_int, get_exponent
+from .galois_field import EXP_TABLE, LOG_TABLE
 
 
 def divide_polynomials(quotien: List[int], divisor: List[int]) -> List[int]:
     """
     Polynomial division, where quotien and division are Lists of integers {0, 255}.
-    Divisor should be exponents of 2.
+    Divisor should be exponents of 2, with a leading exponent of 0 (monic generator).
+    Returns the remainder, of degree len(divisor) - 1.
     """
-    steps = len(quotien)
-    # running_quotien = [get_exponent(int_value) for int_value in quotien]
-    running_quotien_ints = quotien
-
-    for _ in range(steps):
-        multiplication_exponent = get_exponent(running_quotien_ints[0])
-        multiplied_polynomial = [
-            (exponent + multiplication_exponent) % 255 for exponent in divisor
-        ]
-
-        # XOR
-        result = []
-        for index in range(max(len(running_quotien_ints), len(multiplied_polynomial))):
-            quotien_int = (
-                running_quotien_ints[index] if index < len(running_quotien_ints) else 0
-            )
-            divisor_int = (
-                get_int(multiplied_polynomial[index])
-                if index < len(multiplied_polynomial)
-                else 0
-            )
-
-            if index == 0:
-                if quotien_int ^ divisor_int != 0:
-                    raise ValueError
-                continue
-
-            result.append(quotien_int ^ divisor_int)
-
-        running_quotien_ints = result
-    return result
+    running_quotien_ints = list(quotien) + [0] * (len(divisor) - 1)
+
+    for index in range(len(quotien)):
+        leading_int = running_quotien_ints[index]
+        if leading_int == 0:
+            continue
+
+        multiplication_exponent = LOG_TABLE[leading_int]
+        for offset, exponent in enumerate(divisor[1:], start=1):
+            running_quotien_ints[index + offset] ^= EXP_TABLE[
+                (exponent + multiplication_exponent) % 255
+            ]
+
+    return running_quotien_ints[len(quotien) :]
 
 
 def modulo_if_too_high(exponent: int) -> int:
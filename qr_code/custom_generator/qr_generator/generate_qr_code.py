@@ -1,13 +1,28 @@
 import numpy as np
 
+from qr_code.custom_generator.instrumentation import InstrumentationSink, start_trace
 from qr_code.custom_generator.qr_generator.error_correction_level import (
     ErrorCorrectionLevel,
 )
+from qr_code.custom_generator.qr_generator.bit_buffer import BitBuffer
 from qr_code.custom_generator.qr_generator.version import get_version
 from qr_code.custom_generator.qr_generator.character_count import (
     get_character_count_indicator,
 )
 from qr_code.custom_generator.qr_generator.encode_data import encode_data
+from qr_code.custom_generator.qr_generator.segmentation import (
+    Segment,
+    get_optimal_segments,
+    get_segments_version,
+)
+from qr_code.custom_generator.qr_generator.segmentation.segment_data import (
+    MODE_INDICATOR_LENGTH,
+)
+from qr_code.custom_generator.qr_generator.structured_append import (
+    StructuredAppend,
+    STRUCTURED_APPEND_HEADER_LENGTH,
+    MAX_SYMBOLS,
+)
 from qr_code.custom_generator.qr_generator.codewords_count import get_codewords_count
 from qr_code.custom_generator.qr_generator.error_correction import encode_message
 from qr_code.custom_generator.qr_generator.qr_matrix import (
@@ -16,98 +31,175 @@ from qr_code.custom_generator.qr_generator.qr_matrix import (
     format_matrix,
 )
 
+PAD_CODEWORDS = bytes([0b11101100, 0b00010001])
+
 
 def generate_qr_code(
     url: str,
     error_correction_level: ErrorCorrectionLevel = ErrorCorrectionLevel.H,
     quiet_zone_size: int = 4,
-    mode: str = "Byte",
+    mode: str = None,
+    instrumentation: InstrumentationSink = None,
+    structured_append: StructuredAppend = None,
+    mask_strategy: str = "exhaustive",
+    mask_number: int = None,
+    verify: bool = False,
 ) -> np.array:
     """
     Generate a QR code matrix corresponding to the given url.
+    Without mode, the url is split into the Numeric, Alphanumeric and Byte segments
+    taking the fewest bits, hence the smallest version.
+    With structured_append, the symbol starts with that Structured Append header.
+    The mask is selected with mask_strategy (see mask_matrix), or forced with mask_number.
+    With verify, the matrix is decoded back and checked to hold the url,
+    raising ValueError otherwise.
+    Stage timings and the chosen version and mask are reported to the instrumentation sink,
+    if any, and to the registered sinks, failed calls included.
     """
-    if mode != "Byte":
-        raise ValueError(
-            "Only Byte mode is supported. Structure is there to implement the others, though."
+    with start_trace("generate_qr_code", instrumentation) as trace:
+        trace.record(ec_level=error_correction_level.name, payload_length=len(url))
+        with trace.stage("get_version"):
+            header_length = (
+                STRUCTURED_APPEND_HEADER_LENGTH if structured_append is not None else 0
+            )
+            if mode is None:
+                version, segments = get_optimal_segments(
+                    url=url,
+                    error_correction_level=error_correction_level,
+                    extra_bits=header_length,
+                )
+            elif structured_append is not None:
+                segments = [Segment(mode=mode, text=url)]
+                version = get_segments_version(
+                    segments=segments,
+                    error_correction_level=error_correction_level,
+                    extra_bits=header_length,
+                )
+            else:
+                version = get_version(
+                    message_size=len(url),
+                    error_correction_level=error_correction_level,
+                    mode=mode,
+                )
+                segments = [Segment(mode=mode, text=url)]
+
+        with trace.stage("bit_assembly"):
+            buffer = BitBuffer()
+            if structured_append is not None:
+                append_structured_append_header(buffer, structured_append)
+            for segment in segments:
+                buffer.append(get_mode_indicator(segment.mode), MODE_INDICATOR_LENGTH)
+                buffer.append(
+                    *get_character_count_indicator(
+                        url=segment.text, version=version, mode=segment.mode
+                    )
+                )
+                buffer.extend(encode_data(url=segment.text, mode=segment.mode))
+
+            codewords_count = get_codewords_count(
+                version=version, error_correction_level=error_correction_level
+            )
+            buffer.append(
+                0, get_terminator(size=len(buffer), codewords_count=codewords_count)
+            )
+            buffer = ensure_multiple_of_eight(buffer)
+            data_codewords = fill_to_max_size(
+                codewords=buffer.to_bytes(), codewords_count=codewords_count
+            )
+
+        with trace.stage("encode_message"):
+            codewords = encode_message(
+                data_codewords=data_codewords,
+                version=version,
+                error_correction_level=error_correction_level,
+            )
+        with trace.stage("get_qr_matrix"):
+            matrix, _ = get_qr_matrix(codewords=codewords, version=version)
+        with trace.stage("mask_matrix"):
+            matrix, mask_number = mask_matrix(
+                matrix=matrix, strategy=mask_strategy, mask_number=mask_number
+            )
+        with trace.stage("format_matrix"):
+            matrix = format_matrix(
+                error_correction_level=error_correction_level,
+                matrix=matrix,
+                mask_number=mask_number,
+            )
+        with trace.stage("add_quiet_zone"):
+            matrix = add_quiet_zone(matrix=matrix, quiet_zone_size=quiet_zone_size)
+        if verify:
+            from qr_code.custom_generator.qr_generator.decoder import verify_qr_code
+
+            with trace.stage("verify"):
+                verify_qr_code(matrix=matrix, url=url)
+
+        trace.record(
+            version=version,
+            mask=mask_number,
+            mode="+".join(segment.mode for segment in segments),
         )
 
-    version = get_version(
-        message_size=len(url), error_correction_level=error_correction_level, mode=mode
-    )
-    raw_data_bits = get_mode_indicator(mode)
-    raw_data_bits += get_character_count_indicator(url=url, version=version, mode=mode)
-    raw_data_bits += encode_data(url=url, mode=mode)
-
-    codewords_count = get_codewords_count(
-        version=version, error_correction_level=error_correction_level
-    )
-    raw_data_bits += get_terminator(
-        size=len(raw_data_bits), codewords_count=codewords_count
-    )
-    raw_data_bits = ensure_multiple_of_eight(raw_data_bits)
-    raw_data_bits = fill_to_max_size(
-        bits=raw_data_bits, codewords_count=codewords_count
-    )
-
-    corrected_bits = encode_message(
-        raw_data_bits=raw_data_bits,
-        version=version,
-        error_correction_level=error_correction_level,
-    )
-    matrix, protected_matrix = get_qr_matrix(bits=corrected_bits, version=version)
-    matrix, mask_number = mask_matrix(
-        matrix=matrix,
-        protected_matrix=protected_matrix,
-    )
-    matrix = format_matrix(
-        error_correction_level=error_correction_level,
-        matrix=matrix,
-        mask_number=mask_number,
-    )
-    matrix = add_quiet_zone(matrix=matrix, quiet_zone_size=quiet_zone_size)
-
     return matrix
 
 
-def get_mode_indicator(mode: str) -> str:
+def get_mode_indicator(mode: str) -> int:
     """
     Get mode indicator 4-bits.
     """
     mode_to_indicator = {
-        "Numeric": "0001",
-        "Alphanumeric": "0010",
-        "Byte": "0100",
-        "Kanji": "1000",
-        "ECI": "0111",
+        "Numeric": 0b0001,
+        "Alphanumeric": 0b0010,
+        "Byte": 0b0100,
+        "Kanji": 0b1000,
+        "ECI": 0b0111,
+        "StructuredAppend": 0b0011,
     }
     return mode_to_indicator[mode]
 
 
-def get_terminator(size: int, codewords_count: int) -> str:
+def append_structured_append_header(
+    buffer: BitBuffer, structured_append: StructuredAppend
+) -> None:
+    """
+    Append the Structured Append header: mode indicator, symbol position,
+    symbols count minus 1 and parity byte.
+    """
+    if not 0 <= structured_append.position < structured_append.total <= MAX_SYMBOLS:
+        raise ValueError(
+            f"Invalid symbol position {structured_append.position} "
+            f"out of {structured_append.total} symbols."
+        )
+    buffer.append(get_mode_indicator("StructuredAppend"), MODE_INDICATOR_LENGTH)
+    buffer.append(structured_append.position, 4)
+    buffer.append(structured_append.total - 1, 4)
+    buffer.append(structured_append.parity, 8)
+
+
+def get_terminator(size: int, codewords_count: int) -> int:
     """
-    Get the terminator string, up to 4 zeros.
+    Get the terminator length, up to 4 zeros.
     """
-    return "0" * min(4, codewords_count * 8 - size)
+    return min(4, codewords_count * 8 - size)
 
 
-def ensure_multiple_of_eight(bits: str) -> str:
+def ensure_multiple_of_eight(buffer: BitBuffer) -> BitBuffer:
     """
     Ensure the data bits length is a multiple of 8, by adding 0s at the end.
     """
-    remainder = len(bits) % 8
-    return bits + "0" * remainder
+    buffer.pad_to_byte()
+    return buffer
 
 
-def fill_to_max_size(bits: str, codewords_count: int) -> str:
+def fill_to_max_size(codewords: bytes, codewords_count: int) -> bytes:
     """
     Final step of raw bits padding,
-    add 11101100 00010001 bytes until 8 * codewords_count is reached.
+    add 11101100 00010001 bytes until codewords_count is reached.
     """
-    bytes_to_add = codewords_count - (len(bits) // 8)
+    bytes_to_add = codewords_count - len(codewords)
     return (
-        bits
-        + "1110110000010001" * (bytes_to_add // 2)
-        + "11101100" * (bytes_to_add % 2)
+        codewords
+        + PAD_CODEWORDS * (bytes_to_add // 2)
+        + PAD_CODEWORDS[:1] * (bytes_to_add % 2)
     )
 
 
@@ -117,5 +209,8 @@ def add_quiet_zone(matrix: np.array, quiet_zone_size: int) -> np.array:
     """
     result = np.zeros([size + 2 * quiet_zone_size for size in matrix.shape])
     result = np.array(result, dtype=bool)
-    result[quiet_zone_size:-quiet_zone_size, quiet_zone_size:-quiet_zone_size] = matrix
+    result[
+        quiet_zone_size : quiet_zone_size + matrix.shape[0],
+        quiet_zone_size : quiet_zone_size + matrix.shape[1],
+    ] = matrix
     return result
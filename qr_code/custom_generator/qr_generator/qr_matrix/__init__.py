@@ -1,3 +1,8 @@
-from .get_qr_matrix import get_qr_matrix
-from .mask_matrix import mask_matrix
+from .get_qr_matrix import (
+    get_qr_matrix,
+    get_function_patterns,
+    get_placement_index,
+    read_bits,
+)
+from .mask_matrix import mask_matrix, get_mask_grids
 from .format_matrix import format_matrix
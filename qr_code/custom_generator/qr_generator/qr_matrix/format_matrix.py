@@ -1,11 +1,14 @@
-from pathlib import Path
+from typing import List, Tuple
 
 import numpy as np
-import pandas as pd
 
 from qr_code.custom_generator.qr_generator.error_correction_level import (
     ErrorCorrectionLevel,
 )
+from qr_code.custom_generator.qr_generator.spec_tables import (
+    get_format_information_bits,
+    get_version_information_bits,
+)
 
 
 def format_matrix(
@@ -14,15 +17,11 @@ def format_matrix(
     """
     Final formatting of the matrix: Add format and version information
     """
-    format_info_table = pd.read_csv(Path(__file__).parent / "FormatInformation.csv")
-
-    format_info_bits = format_info_table.loc[
-        (format_info_table["ECC Level"] == error_correction_level.name)
-        & (format_info_table["Mask Pattern"] == mask_number),
-        "Type Information Bits",
-    ].squeeze()
+    format_info_bits = get_format_information_bits(
+        error_correction_level=error_correction_level, mask_number=mask_number
+    )
 
-    matrix = fill_format_info(matrix=matrix, format_info_bits=str(format_info_bits))
+    matrix = fill_format_info(matrix=matrix, format_info_bits=format_info_bits)
     matrix = add_version_information(matrix=matrix)
 
     return matrix
@@ -32,26 +31,46 @@ def fill_format_info(matrix: np.array, format_info_bits: str) -> np.array:
     """
     Fill in the matrix the format_info_bits
     """
-    n = matrix.shape[0]
+    first_copy, second_copy = get_format_information_positions(matrix.shape[0])
+    for bit, first_position, second_position in zip(
+        format_info_bits, first_copy, second_copy
+    ):
+        matrix[first_position] = bit == "1"
+        matrix[second_position] = bit == "1"
 
-    for i, bit in enumerate(format_info_bits):
+    return matrix
+
+
+def get_format_information_positions(
+    size: int,
+) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+    """
+    Get the positions of the 15 format information bits, most significant first:
+    the copy around the top left finder pattern,
+    and the copy split between the bottom left and top right ones.
+    """
+    first_copy = []
+    second_copy = []
+    for i in range(15):
         # Top left corner:
         if i <= 5:
-            matrix[8, i] = bit == "1"
+            first_copy.append((8, i))
         elif i <= 6:
-            matrix[8, i + 1] = bit == "1"
+            first_copy.append((8, i + 1))
+        elif i == 7:
+            first_copy.append((8, 8))
         elif i == 8:
-            matrix[7, 8] = bit == "1"
+            first_copy.append((7, 8))
         else:
-            matrix[14 - i, 8] = bit == "1"
+            first_copy.append((14 - i, 8))
 
         # Bottom left and top right:
         if i <= 6:
-            matrix[n - 1 - i, 8] = bit == "1"
+            second_copy.append((size - 1 - i, 8))
         else:
-            matrix[8, n - 15 + i] = bit == "1"
+            second_copy.append((8, size - 15 + i))
 
-    return matrix
+    return first_copy, second_copy
 
 
 def add_version_information(matrix: np.array) -> np.array:
@@ -63,23 +82,26 @@ def add_version_information(matrix: np.array) -> np.array:
     if version < 7:
         return matrix
 
-    version_information_table = pd.read_csv(
-        Path(__file__).parent / "VersionInformation.csv"
-    )
-    version_information_bits = version_information_table.loc[
-        version_information_table["Version"] == version, "Version Information String"
-    ].squeeze()
-    version_information_bits = str(version_information_bits)
-
-    # Bottom left:
-    index = 0
-    for j in range(6):
-        for i in range(3):
-            matrix[n - 11 + i, j] = version_information_bits[index]
-    # Top right:
-    index = 0
-    for i in range(6):
-        for j in range(3):
-            matrix[i, n - 11 + j] = version_information_bits[index]
+    # Placed from the least significant bit, i.e. the end of the string
+    version_information_bits = get_version_information_bits(version)[::-1]
+
+    bottom_left, top_right = get_version_information_positions(n)
+    for bit, bottom_left_position, top_right_position in zip(
+        version_information_bits, bottom_left, top_right
+    ):
+        matrix[bottom_left_position] = bit == "1"
+        matrix[top_right_position] = bit == "1"
 
     return matrix
+
+
+def get_version_information_positions(
+    size: int,
+) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+    """
+    Get the positions of the 18 version information bits, least significant first:
+    the bottom left copy and the top right copy.
+    """
+    bottom_left = [(size - 11 + i, j) for j in range(6) for i in range(3)]
+    top_right = [(i, size - 11 + j) for i in range(6) for j in range(3)]
+    return bottom_left, top_right
@@ -1,18 +1,37 @@
+from functools import lru_cache
 from typing import Tuple
 from itertools import product
 
 import numpy as np
-import pandas as pd
 
-
-ALIGNMENT_PATTERNS_TABLE = pd.read_csv(
-    "qr_code/custom_generator/qr_generator/qr_matrix/AlignmentPatterns.csv"
+from qr_code.custom_generator.qr_generator.spec_tables import (
+    get_alignment_centers,
+    get_remainder_bits,
 )
 
 
-def get_qr_matrix(bits: str, version: int) -> Tuple[np.array, np.array]:
+def get_qr_matrix(codewords: bytes, version: int) -> Tuple[np.array, np.array]:
+    """
+    From the encoded codewords get the QR code boolean matrix and the matrix of protected modules.
     """
-    From the encoded bits get the QR code boolean matrix and the matrix of protected modules.
+    template_matrix, template_protected_matrix = get_function_patterns(version)
+    matrix = template_matrix.copy()
+    protected_matrix = template_protected_matrix.copy()
+
+    matrix, protected_matrix = place_bits(
+        matrix=matrix, protected_matrix=protected_matrix, codewords=codewords
+    )
+
+    return matrix, protected_matrix
+
+
+@lru_cache(maxsize=None)
+def get_function_patterns(version: int) -> Tuple[np.array, np.array]:
+    """
+    Get the read-only (matrix, protected_matrix) template of the given version:
+    finder patterns, separators, alignment patterns, timing patterns, dark module
+    and format / version information reservations.
+    Built once per version, callers must copy before writing.
     """
     size = get_matrix_size(version)
     matrix = np.full((size, size), False)
@@ -33,10 +52,8 @@ def get_qr_matrix(bits: str, version: int) -> Tuple[np.array, np.array]:
         version=version, protected_matrix=protected_matrix
     )
 
-    matrix, protected_matrix = place_bits(
-        matrix=matrix, protected_matrix=protected_matrix, bits=bits
-    )
-
+    matrix.flags.writeable = False
+    protected_matrix.flags.writeable = False
     return matrix, protected_matrix
 
 
@@ -118,15 +135,7 @@ def add_alignment_patterns(
     """
     Add alignment patterns.
     """
-    centers = (
-        ALIGNMENT_PATTERNS_TABLE.loc[ALIGNMENT_PATTERNS_TABLE["Version"] == version]
-        .squeeze()
-        .to_list()
-    )
-    centers = centers[1:]
-    centers = [int(center) for center in centers if not pd.isna(center)]
-
-    for center in product(centers, repeat=2):
+    for center in product(get_alignment_centers(version), repeat=2):
         add_alignment_pattern(
             matrix=matrix, protected_matrix=protected_matrix, center_indices=center
         )
@@ -150,9 +159,7 @@ def add_alignment_pattern(
         return matrix, protected_matrix
 
     for offset in product(range(-2, 3), repeat=2):
-        indices = tuple(
-            index + offset for index, offset in zip(offset, center_indices)
-        )
+        indices = tuple(index + offset for index, offset in zip(offset, center_indices))
         protected_matrix[indices] = True
 
         if offset[0] == -1 and -1 <= offset[1] <= 1:
@@ -230,33 +237,73 @@ def reserve_version_information(version: int, protected_matrix: np.array) -> np.
 
 
 def place_bits(
-    matrix: np.array, protected_matrix: np.array, bits: str
+    matrix: np.array, protected_matrix: np.array, codewords: bytes
 ) -> Tuple[np.array, np.array]:
     """
-    Place data bits in the matrix.
+    Place codewords bits in the matrix, in a single assignment through the placement index.
+    The remainder bits left over at the end are 0s, as in the template.
     """
-    if len(bits) != (matrix.shape[0] ** 2 - protected_matrix.sum()):
+    version = get_version_from_size(matrix.shape[0])
+    rows, columns = get_placement_index(version)
+    bits = np.unpackbits(np.frombuffer(codewords, dtype=np.uint8)).view(bool)
+    if len(rows) - len(bits) != get_remainder_bits(version):
         raise ValueError(
-            f"Encoded message Bits size {len(bits)} is different than the "
-            f"available slots in the matrix ({(matrix.shape[0] ** 2 - protected_matrix.sum())})."
+            f"Encoded message Bits size {len(bits)} does not fit the "
+            f"available slots in the matrix ({len(rows)})."
         )
+    matrix[rows[: len(bits)], columns[: len(bits)]] = bits
+
+    return matrix, protected_matrix
+
+
+def read_bits(matrix: np.array) -> np.array:
+    """
+    Read the data bits back out of a matrix (without quiet zone), in placement order.
+    """
+    rows, columns = get_placement_index(get_version_from_size(matrix.shape[0]))
+    return matrix[rows, columns]
+
+
+def get_version_from_size(size: int) -> int:
+    """
+    Get the version from the matrix size, reverse of get_matrix_size.
+    """
+    return (size - 17) // 4
+
+
+@lru_cache(maxsize=None)
+def get_placement_index(version: int) -> Tuple[np.array, np.array]:
+    """
+    Get the read-only (rows, columns) index arrays of the data modules, in the zigzag
+    placement order: two columns wide, from the bottom right corner, alternately upwards
+    and downwards, skipping the vertical timing pattern and every protected module.
+    """
+    protected_matrix = get_function_patterns(version)[1]
+    size = protected_matrix.shape[0]
+    data_modules_count = size**2 - int(protected_matrix.sum())
+
+    rows = np.empty(data_modules_count, dtype=np.intp)
+    columns = np.empty(data_modules_count, dtype=np.intp)
     row_direction = -1
-    row = matrix.shape[0] - 1
-    column = matrix.shape[0] - 1
+    row = size - 1
+    column = size - 1
     column_offset = False
 
-    for bit in bits:
+    for index in range(data_modules_count):
         while protected_matrix[row, column - column_offset]:
             row_direction, row, column, column_offset = move_cursor(
-                row_direction, row, column, column_offset, matrix.shape[0]
+                row_direction, row, column, column_offset, size
             )
 
-        matrix[row, column - column_offset] = bit == "1"
+        rows[index] = row
+        columns[index] = column - column_offset
         row_direction, row, column, column_offset = move_cursor(
-            row_direction, row, column, column_offset, matrix.shape[0]
+            row_direction, row, column, column_offset, size
         )
 
-    return matrix, protected_matrix
+    rows.flags.writeable = False
+    columns.flags.writeable = False
+    return rows, columns
 
 
 def move_cursor(
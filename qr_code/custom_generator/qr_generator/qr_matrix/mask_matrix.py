@@ -1,51 +1,62 @@
-import copy
+from functools import lru_cache
 from itertools import product
-import math
 from typing import Tuple
 
 import numpy as np
 
+from qr_code.custom_generator.qr_generator.qr_matrix.get_qr_matrix import (
+    get_function_patterns,
+    get_version_from_size,
+)
+from qr_code.custom_generator.qr_generator.qr_matrix.mask_selection import (
+    MASK_STRATEGIES,
+)
 
+# Formulas work on ints as well as on numpy index grids, i being the row and j the column.
 mask_formulas = [
     lambda i, j: (i + j) % 2 == 0,
     lambda i, j: i % 2 == 0,
     lambda i, j: j % 3 == 0,
     lambda i, j: (i + j) % 3 == 0,
-    lambda i, j: (math.floor(i / 2) + math.floor(j) / 3) % 2 == 0,
+    lambda i, j: (i // 2 + j // 3) % 2 == 0,
     lambda i, j: (i * j) % 2 + (i * j) % 3 == 0,
     lambda i, j: ((i * j) % 2 + (i * j) % 3) % 2 == 0,
     lambda i, j: ((i + j) % 2 + (i * j) % 3) % 2 == 0,
 ]
 
 
-def mask_matrix(matrix: np.array, protected_matrix: np.array) -> Tuple[np.array, int]:
+def mask_matrix(
+    matrix: np.array, strategy: str = "exhaustive", mask_number: int = None
+) -> Tuple[np.array, int]:
     """
     Apply data masking:
     Evaluate each of the 8 masking patterns according to the 4 criterion, apply the correct one.
-    """
-    min_penalty = np.inf
-    selected_mask_number = None
-    for mask_number, formula in enumerate(mask_formulas):
-        penalty = get_penalty_score(
-            mask(matrix=matrix, protected_matrix=protected_matrix, formula=formula)
+    All candidates are masked and scored at once, as a (8, n, n) stack.
+    The strategy is one of MASK_STRATEGIES:
+        - exhaustive: all rules on all candidates
+        - early_exit: same mask, abandoning candidates as soon as they cannot win
+        - heuristic: cheap rules only, faster but not always the same mask
+    A given mask_number skips the evaluation and applies that mask.
+    """
+    if mask_number is not None:
+        if not 0 <= mask_number < len(mask_formulas):
+            raise ValueError(f"Mask number should be in {{0, 7}}. Got {mask_number}.")
+        return mask(matrix, mask_number), mask_number
+    if strategy not in MASK_STRATEGIES:
+        raise ValueError(
+            f"Unknown mask strategy {strategy}. Expected one of {', '.join(MASK_STRATEGIES)}."
         )
-        if penalty < min_penalty:
-            min_penalty = penalty
-            selected_mask_number = mask_number
 
-    return (
-        mask(
-            matrix=matrix,
-            protected_matrix=protected_matrix,
-            formula=mask_formulas[selected_mask_number],
-        ),
-        selected_mask_number,
-    )
+    candidates = matrix ^ get_mask_grids(get_version_from_size(matrix.shape[0]))
+    selected_mask_number = MASK_STRATEGIES[strategy](candidates)
+
+    return candidates[selected_mask_number].copy(), selected_mask_number
 
 
 def get_penalty_score(matrix: np.array) -> int:
     """
     Evaluate the matrix according to all 4 evaluation criterion, and returning the sum.
+    Reference implementation of penalty_engine.get_penalty_scores, one matrix at a time.
     """
     penalty = 0
     for method in [
@@ -86,6 +97,8 @@ def array_penalty(array: np.array) -> int:
             if len(streak) >= 5:
                 penalty += 3 + (len(streak) - 5)
             streak = [value]
+    if len(streak) >= 5:
+        penalty += 3 + (len(streak) - 5)
     return penalty
 
 
@@ -124,7 +137,7 @@ def finder_pattern_penalty(array: np.array) -> int:
     Look for the specific patterns in the row / col and add 40.
     """
     penalty = 0
-    for i in range(len(array) - 11):
+    for i in range(len(array) - 10):
         if np.array_equal(
             array[i : (i + 11)],
             [True, False, True, True, True, False, True, False, False, False, False],
@@ -148,12 +161,21 @@ def evaluate_by_ratio(matrix: np.array) -> int:
     return min(small, high) * 10
 
 
-def mask(matrix: np.array, protected_matrix: np.array, formula: callable) -> np.array:
+def mask(matrix: np.array, mask_number: int) -> np.array:
+    """
+    Mask the matrix using the given mask pattern, returning a new matrix.
+    """
+    return matrix ^ get_mask_grids(get_version_from_size(matrix.shape[0]))[mask_number]
+
+
+@lru_cache(maxsize=None)
+def get_mask_grids(version: int) -> np.array:
     """
-    Mask the matrix using the given formula
+    Get the read-only (8, n, n) stack of mask patterns of the given version,
+    already restricted to the modules that are not protected.
     """
-    masked_matrix = copy.deepcopy(matrix)
-    for indices in product(range(matrix.shape[0]), repeat=2):
-        if not protected_matrix[indices] and formula(indices[0], indices[1]):
-            masked_matrix[indices] = not masked_matrix[indices]
-    return masked_matrix
+    protected_matrix = get_function_patterns(version)[1]
+    i, j = np.indices(protected_matrix.shape)
+    grids = np.stack([formula(i, j) for formula in mask_formulas]) & ~protected_matrix
+    grids.flags.writeable = False
+    return grids
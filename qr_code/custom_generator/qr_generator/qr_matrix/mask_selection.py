@@ -0,0 +1,80 @@
+import numpy as np
+
+from qr_code.custom_generator.qr_generator.qr_matrix.penalty_engine import (
+    evaluate_stack_by_2_x_2_blocks,
+    evaluate_stack_by_finder_pattern,
+    evaluate_stack_by_ratio,
+    evaluate_stack_by_row_and_column,
+    get_penalty_scores,
+)
+
+# Penalty rules from the cheapest to the most expensive to evaluate.
+STACK_RULES = (evaluate_stack_by_ratio, evaluate_stack_by_2_x_2_blocks)
+CANDIDATE_RULES = (evaluate_stack_by_row_and_column, evaluate_stack_by_finder_pattern)
+# Below this size, per-candidate evaluation overhead outweighs what abandoning saves.
+EARLY_EXIT_MIN_SIZE = 117
+
+
+def select_exhaustive(candidates: np.array) -> int:
+    """
+    Score every candidate with all 4 rules, select the lowest penalty.
+    """
+    return int(np.argmin(get_penalty_scores(candidates)))
+
+
+def select_early_exit(candidates: np.array) -> int:
+    """
+    Same selection as select_exhaustive, as a branch and bound search.
+    The cheapest rules are evaluated on the whole stack. Candidates then get the expensive
+    rules one at a time, from the lowest partial penalty, and are abandoned as soon as
+    their partial penalty cannot beat the best complete one: penalties being positive,
+    partial penalties are lower bounds of the final ones.
+    Every rule is evaluated on the whole symbol, function patterns included: runs and
+    finder-like windows cross from function modules into data modules, so their penalty
+    cannot be factored out of the comparison.
+    Ties are broken towards the lowest mask number, as with argmin.
+    Symbols smaller than EARLY_EXIT_MIN_SIZE modules are scored exhaustively.
+    """
+    if candidates.shape[1] < EARLY_EXIT_MIN_SIZE:
+        return select_exhaustive(candidates)
+
+    partial = sum(rule(candidates) for rule in STACK_RULES)
+    best_mask, best_score = None, None
+
+    def beats_best(score: float, mask_number: int) -> bool:
+        return best_mask is None or (score, mask_number) < (best_score, best_mask)
+
+    for mask_number in np.argsort(partial, kind="stable").tolist():
+        score = partial[mask_number]
+        if not beats_best(score, mask_number):
+            # Next candidates have higher partial penalties, or the same and higher numbers.
+            break
+        candidate = candidates[mask_number : mask_number + 1]
+        for rule in CANDIDATE_RULES:
+            score += rule(candidate)[0]
+            if not beats_best(score, mask_number):
+                break
+        else:
+            best_mask, best_score = mask_number, score
+
+    return best_mask
+
+
+def select_heuristic(candidates: np.array) -> int:
+    """
+    Score candidates with the cheap rules only, skipping the finder-like pattern rule.
+    Not always the mask the exhaustive search selects, but always a valid one.
+    """
+    return int(
+        np.argmin(
+            sum(rule(candidates) for rule in STACK_RULES)
+            + evaluate_stack_by_row_and_column(candidates)
+        )
+    )
+
+
+MASK_STRATEGIES = {
+    "exhaustive": select_exhaustive,
+    "early_exit": select_early_exit,
+    "heuristic": select_heuristic,
+}
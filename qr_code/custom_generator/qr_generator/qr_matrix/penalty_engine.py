@@ -0,0 +1,103 @@
+import numpy as np
+
+FINDER_LIKE_PATTERNS = (
+    [True, False, True, True, True, False, True, False, False, False, False],
+    [False, False, False, False, True, False, True, True, True, False, True],
+)
+FINDER_LIKE_LENGTH = len(FINDER_LIKE_PATTERNS[0])
+FINDER_LIKE_VALUES = [
+    int("".join(str(int(bit)) for bit in pattern), 2)
+    for pattern in FINDER_LIKE_PATTERNS
+]
+
+
+def get_penalty_scores(candidates: np.array) -> np.array:
+    """
+    Evaluate a (k, n, n) stack of masked candidates according to all 4 evaluation criterion.
+    Return the k penalties, equal to get_penalty_score applied to each candidate.
+    """
+    return (
+        evaluate_stack_by_row_and_column(candidates)
+        + evaluate_stack_by_2_x_2_blocks(candidates)
+        + evaluate_stack_by_finder_pattern(candidates)
+        + evaluate_stack_by_ratio(candidates)
+    )
+
+
+def evaluate_stack_by_row_and_column(candidates: np.array) -> np.array:
+    """
+    Rule 1, on rows then columns: 3 for each run of 5 similar modules, plus 1 per extra module.
+    """
+    return runs_penalty(candidates) + runs_penalty(candidates.transpose(0, 2, 1))
+
+
+def runs_penalty(candidates: np.array) -> np.array:
+    """
+    Rule 1 along the last axis. Lines are flattened one after the other, every line start
+    being forced as a run start so that runs never span two lines.
+    """
+    k, n, _ = candidates.shape
+    lines = candidates.reshape(-1, n)
+    run_starts = np.empty(lines.shape, dtype=bool)
+    run_starts[:, 0] = True
+    np.not_equal(lines[:, 1:], lines[:, :-1], out=run_starts[:, 1:])
+
+    start_indices = np.flatnonzero(run_starts)
+    run_lengths = np.diff(start_indices, append=lines.size)
+    long_runs = run_lengths >= 5
+
+    return np.bincount(
+        start_indices[long_runs] // (n * n),
+        weights=run_lengths[long_runs] - 2,
+        minlength=k,
+    )
+
+
+def evaluate_stack_by_2_x_2_blocks(candidates: np.array) -> np.array:
+    """
+    Rule 2: 3 for each 2x2 block of similar modules, overlapping blocks counted separately.
+    """
+    top_left = candidates[:, :-1, :-1]
+    similar = (
+        (top_left == candidates[:, :-1, 1:])
+        & (top_left == candidates[:, 1:, :-1])
+        & (top_left == candidates[:, 1:, 1:])
+    )
+    return 3 * similar.sum(axis=(1, 2))
+
+
+def evaluate_stack_by_finder_pattern(candidates: np.array) -> np.array:
+    """
+    Rule 3: 40 for each finder-like pattern found in a row or a column.
+    """
+    return (
+        finder_like_count(candidates) * 40
+        + finder_like_count(candidates.transpose(0, 2, 1)) * 40
+    )
+
+
+def finder_like_count(candidates: np.array) -> np.array:
+    """
+    Count the finder-like windows along the last axis of each candidate.
+    Each window is read as an 11-bit integer, built for all windows at once
+    by 11 shifted ORs of the candidates, then compared to the two patterns.
+    """
+    windows_count = candidates.shape[-1] - FINDER_LIKE_LENGTH + 1
+    values = np.zeros(candidates.shape[:-1] + (windows_count,), dtype=np.uint16)
+    for offset in range(FINDER_LIKE_LENGTH):
+        values <<= 1
+        values |= candidates[..., offset : offset + windows_count]
+    return ((values == FINDER_LIKE_VALUES[0]) | (values == FINDER_LIKE_VALUES[1])).sum(
+        axis=(1, 2)
+    )
+
+
+def evaluate_stack_by_ratio(candidates: np.array) -> np.array:
+    """
+    Rule 4: 10 for each 5% step away from a 50% dark modules ratio.
+    """
+    ratio = (candidates.sum(axis=(1, 2)) / candidates.shape[1] ** 2) * 100
+    small = np.abs(ratio // 5 * 5 - 50) / 5
+    high = np.abs((ratio // 5 + 1) * 5 - 50) / 5
+
+    return np.minimum(small, high) * 10
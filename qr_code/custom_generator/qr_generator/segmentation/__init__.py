@@ -0,0 +1,9 @@
+from .segment_data import (
+    Segment,
+    get_optimal_segments,
+    get_segments_version,
+    get_longest_prefix,
+    get_segments_bit_length,
+    get_version_bands,
+    get_data_bits_capacity,
+)
@@ -0,0 +1,259 @@
+from functools import lru_cache
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from qr_code.custom_generator.qr_generator.encode_data.encode_data import (
+    ALPHANUMERIC_VALUES,
+    NUMERIC_CHARACTERS,
+)
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+from qr_code.custom_generator.qr_generator.spec_tables import (
+    MAX_VERSION,
+    get_character_count_bits,
+    get_codewords_record,
+)
+
+MODE_INDICATOR_LENGTH = 4
+SEGMENT_MODES = ("Numeric", "Alphanumeric", "Byte")
+
+# Optimizer states: a mode and the number of characters of the current segment,
+# modulo the size of the groups the mode encodes characters by.
+# Adding a character to a segment whose count modulo the group size is r costs
+# CHARACTER_BITS[(mode, r)] bits, e.g. a group of 3 digits takes 4 + 3 + 3 = 10 bits.
+CHARACTER_BITS = {
+    ("Numeric", 0): 4,
+    ("Numeric", 1): 3,
+    ("Numeric", 2): 3,
+    ("Alphanumeric", 0): 6,
+    ("Alphanumeric", 1): 5,
+    ("Byte", 0): 8,
+}
+GROUP_SIZES = {"Numeric": 3, "Alphanumeric": 2, "Byte": 1}
+STATES = tuple(
+    (mode, (residue + 1) % GROUP_SIZES[mode]) for mode, residue in CHARACTER_BITS
+)
+# For each state: its mode, the state it extends, the bits of the added character,
+# and whether a new segment can end in it (after its first character).
+TRANSITIONS = tuple(
+    (
+        mode,
+        STATES.index((mode, (residue - 1) % GROUP_SIZES[mode])),
+        CHARACTER_BITS[(mode, (residue - 1) % GROUP_SIZES[mode])],
+        residue == 1 % GROUP_SIZES[mode],
+    )
+    for mode, residue in STATES
+)
+
+
+class Segment(NamedTuple):
+    """
+    Part of the data encoded in a single mode.
+    """
+
+    mode: str
+    text: str
+
+
+def get_optimal_segments(
+    url: str, error_correction_level: ErrorCorrectionLevel, extra_bits: int = 0
+) -> Tuple[int, List[Segment]]:
+    """
+    Split the url into Numeric, Alphanumeric and Byte segments taking the fewest bits,
+    headers included, and get the smallest version holding them plus extra_bits.
+    Headers length depends on the version band (character count indicator lengths),
+    so segments are optimized for each band in turn until they fit.
+    """
+    for first_version, last_version in get_version_bands():
+        segments = optimize_segments(url=url, version=first_version)
+        version = find_fitting_version(
+            bits_count=get_segments_bit_length(segments, first_version) + extra_bits,
+            error_correction_level=error_correction_level,
+            versions=range(first_version, last_version + 1),
+        )
+        if version is not None:
+            return version, segments
+
+    raise ValueError(
+        f"Message size {len(url)} is too long to be supported "
+        f"with error correction level {error_correction_level.name}."
+    )
+
+
+def get_segments_version(
+    segments: List[Segment],
+    error_correction_level: ErrorCorrectionLevel,
+    extra_bits: int = 0,
+) -> int:
+    """
+    Get the smallest version holding the given segments plus extra_bits.
+    """
+    for first_version, last_version in get_version_bands():
+        version = find_fitting_version(
+            bits_count=get_segments_bit_length(segments, first_version) + extra_bits,
+            error_correction_level=error_correction_level,
+            versions=range(first_version, last_version + 1),
+        )
+        if version is not None:
+            return version
+
+    raise ValueError(
+        f"Message size {sum(len(segment.text) for segment in segments)} is too long "
+        f"to be supported with error correction level {error_correction_level.name}."
+    )
+
+
+def find_fitting_version(
+    bits_count: int,
+    error_correction_level: ErrorCorrectionLevel,
+    versions: Iterable[int],
+) -> Optional[int]:
+    """
+    Get the first of the versions whose data codewords hold bits_count bits, if any.
+    """
+    for version in versions:
+        if bits_count <= get_data_bits_capacity(version, error_correction_level):
+            return version
+    return None
+
+
+def get_data_bits_capacity(
+    version: int, error_correction_level: ErrorCorrectionLevel
+) -> int:
+    """
+    Get the number of data bits of the version and error correction level.
+    """
+    return 8 * get_codewords_record(version, error_correction_level).data_codewords
+
+
+@lru_cache(maxsize=None)
+def get_version_bands() -> Tuple[Tuple[int, int], ...]:
+    """
+    Get the (first, last) version ranges sharing the same character count indicator lengths.
+    """
+    bands = []
+    previous_lengths = None
+    for version in range(1, MAX_VERSION + 1):
+        lengths = [get_character_count_bits(version, mode) for mode in SEGMENT_MODES]
+        if lengths != previous_lengths:
+            bands.append([version, version])
+        bands[-1][1] = version
+        previous_lengths = lengths
+    return tuple(tuple(band) for band in bands)
+
+
+def optimize_segments(url: str, version: int) -> List[Segment]:
+    """
+    Get the segments encoding the url in the fewest bits, for the version band of version.
+    """
+    if not url:
+        return []
+
+    choices = []
+    for best_state, _, step_choices in iter_optimizer(url=url, version=version):
+        choices.append(step_choices)
+    return backtrack_segments(url=url, final_state=best_state, choices=choices)
+
+
+def get_longest_prefix(url: str, version: int, max_bits: int) -> int:
+    """
+    Get the length of the longest prefix of the url whose segments take max_bits at most,
+    for the version band of version. The optimizer stops as soon as a prefix does not fit,
+    prefix costs being non-decreasing.
+    """
+    length = 0
+    for _, best_cost, _ in iter_optimizer(url=url, version=version):
+        if best_cost > max_bits:
+            break
+        length += 1
+    return length
+
+
+def iter_optimizer(url: str, version: int) -> Iterator[Tuple[int, float, list]]:
+    """
+    Dynamic programming over the characters: for each optimizer state,
+    keep the fewest bits encoding the prefix and ending in that state,
+    either extending the current segment or opening a new one, with its header.
+    After each character, yield the cheapest state, its cost,
+    and the choice (previous state, new segment) leading to each state.
+    """
+    header_bits = {
+        mode: MODE_INDICATOR_LENGTH + get_character_count_bits(version, mode)
+        for mode in SEGMENT_MODES
+    }
+    infinity = float("inf")
+    states = range(len(STATES))
+    costs = [infinity] * len(STATES)
+    best_state, best_cost = 0, 0
+    for character in url:
+        allowed_modes = get_allowed_modes(character)
+        new_costs = []
+        choices = []
+        for mode, extended_state, character_bits, can_start in TRANSITIONS:
+            cost, choice = infinity, None
+            if mode in allowed_modes:
+                cost, choice = costs[extended_state], (extended_state, False)
+                if can_start and best_cost + header_bits[mode] < cost:
+                    cost, choice = best_cost + header_bits[mode], (best_state, True)
+                cost += character_bits
+            new_costs.append(cost)
+            choices.append(choice)
+
+        costs = new_costs
+        best_state = min(states, key=costs.__getitem__)
+        best_cost = costs[best_state]
+        yield best_state, best_cost, choices
+
+
+def get_allowed_modes(character: str) -> Tuple[str, ...]:
+    """
+    Get the modes able to encode the character.
+    """
+    if character in NUMERIC_CHARACTERS:
+        return SEGMENT_MODES
+    if character in ALPHANUMERIC_VALUES:
+        return SEGMENT_MODES[1:]
+    return SEGMENT_MODES[2:]
+
+
+def backtrack_segments(
+    url: str, final_state: int, choices: List[list]
+) -> List[Segment]:
+    """
+    Walk back the optimizer choices from the cheapest final state and cut the segments.
+    """
+    state = final_state
+    segments = []
+    end = len(url)
+    for position in range(len(url) - 1, -1, -1):
+        previous_state, new_segment = choices[position][state]
+        if new_segment:
+            segments.append(Segment(mode=STATES[state][0], text=url[position:end]))
+            end = position
+        state = previous_state
+
+    return segments[::-1]
+
+
+def get_segments_bit_length(segments: List[Segment], version: int) -> int:
+    """
+    Get the number of bits encoding the segments, headers included.
+    """
+    return sum(
+        MODE_INDICATOR_LENGTH
+        + get_character_count_bits(version, segment.mode)
+        + get_data_bit_length(mode=segment.mode, characters_count=len(segment.text))
+        for segment in segments
+    )
+
+
+def get_data_bit_length(mode: str, characters_count: int) -> int:
+    """
+    Get the number of bits encoding characters_count characters in the given mode.
+    """
+    group_size = GROUP_SIZES[mode]
+    full_groups, remaining = divmod(characters_count, group_size)
+    group_bits = sum(CHARACTER_BITS[(mode, residue)] for residue in range(group_size))
+    return full_groups * group_bits + sum(
+        CHARACTER_BITS[(mode, residue)] for residue in range(remaining)
+    )
@@ -0,0 +1,252 @@
+import csv
+from bisect import bisect_left
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Tuple
+
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+
+PACKAGE_DIRECTORY = Path(__file__).parent
+MAX_VERSION = 40
+MODES = ("Numeric", "Alphanumeric", "Byte", "Kanji")
+
+
+class CodewordsRecord(NamedTuple):
+    """
+    Block layout of a (version, error correction level) pair, from codewordsTable.csv.
+    """
+
+    version: int
+    error_correction_level: str
+    data_codewords: int
+    ec_codewords_per_block: int
+    group_1_blocks: int
+    group_1_codewords_per_block: int
+    group_2_blocks: int
+    group_2_codewords_per_block: int
+
+    @property
+    def block_sizes(self) -> Tuple[int, ...]:
+        """
+        Number of data codewords of each block, group 1 blocks first.
+        """
+        return (self.group_1_codewords_per_block,) * self.group_1_blocks + (
+            self.group_2_codewords_per_block,
+        ) * self.group_2_blocks
+
+    @property
+    def blocks_count(self) -> int:
+        """
+        Total number of blocks.
+        """
+        return self.group_1_blocks + self.group_2_blocks
+
+
+class SpecTables(NamedTuple):
+    """
+    All the spec tables, parsed once, indexed and read-only.
+    Per-version tuples are indexed by version - 1.
+    """
+
+    codewords: Mapping[Tuple[int, str], CodewordsRecord]
+    capacities: Mapping[Tuple[str, str], Tuple[int, ...]]
+    character_count_bits: Mapping[str, Tuple[int, ...]]
+    remainder_bits: Tuple[int, ...]
+    alignment_centers: Tuple[Tuple[int, ...], ...]
+    format_information: Mapping[Tuple[str, int], str]
+    version_information: Mapping[int, str]
+
+
+def read_rows(relative_path: str) -> List[Dict[str, str]]:
+    """
+    Read a spec CSV file, relative to the qr_generator package, keeping every value as a string.
+    """
+    with open(
+        PACKAGE_DIRECTORY / relative_path, "r", encoding="utf-8", newline=""
+    ) as f:
+        return list(csv.DictReader(f))
+
+
+def to_int(value: str) -> int:
+    """
+    Parse a table cell, empty cells counting as 0.
+    """
+    return int(value) if value else 0
+
+
+def parse_codewords() -> Dict[Tuple[int, str], CodewordsRecord]:
+    """
+    Parse codewordsTable.csv into one record per (version, EC level).
+    """
+    return {
+        (int(row["Version"]), row["EC Level"]): CodewordsRecord(
+            version=int(row["Version"]),
+            error_correction_level=row["EC Level"],
+            data_codewords=int(row["Codewords"]),
+            ec_codewords_per_block=int(row["EC Codewords Per Block"]),
+            group_1_blocks=int(row["Group 1 Blocks"]),
+            group_1_codewords_per_block=int(row["Group 1 Codewords Per Block"]),
+            group_2_blocks=to_int(row["Group 2 Blocks"]),
+            group_2_codewords_per_block=to_int(row["Group 2 Codewords Per Block"]),
+        )
+        for row in read_rows("codewords_count/codewordsTable.csv")
+    }
+
+
+def parse_capacities() -> Dict[Tuple[str, str], Tuple[int, ...]]:
+    """
+    Parse capacityTable.csv into increasing capacity arrays per (EC level, mode).
+    """
+    rows = sorted(
+        read_rows("version/capacityTable.csv"), key=lambda row: int(row["Version"])
+    )
+    return {
+        (level.name, mode): tuple(
+            int(row[mode])
+            for row in rows
+            if row["Error Correction Level"] == level.name
+        )
+        for level in ErrorCorrectionLevel
+        for mode in MODES
+    }
+
+
+def parse_character_count_bits() -> Dict[str, Tuple[int, ...]]:
+    """
+    Parse characterCountTable.csv into the count indicator length per mode and version.
+    """
+    rows = sorted(
+        read_rows("character_count/characterCountTable.csv"),
+        key=lambda row: int(row["Version"]),
+    )
+    return {mode: tuple(int(row[mode]) for row in rows) for mode in MODES}
+
+
+def parse_remainder_bits() -> Tuple[int, ...]:
+    """
+    Parse remainderBits.csv into the remainder bits count per version.
+    """
+    rows = sorted(
+        read_rows("error_correction/remainderBits.csv"),
+        key=lambda row: int(row["Version"]),
+    )
+    return tuple(int(row["Remainder Bits"]) for row in rows)
+
+
+def parse_alignment_centers() -> Tuple[Tuple[int, ...], ...]:
+    """
+    Parse AlignmentPatterns.csv into the alignment pattern center coordinates per version.
+    Version 1 has no alignment pattern and is not in the file.
+    """
+    with open(
+        PACKAGE_DIRECTORY / "qr_matrix/AlignmentPatterns.csv",
+        "r",
+        encoding="utf-8",
+        newline="",
+    ) as f:
+        rows = list(csv.reader(f))[1:]
+
+    centers = {
+        int(row[0]): tuple(int(value) for value in row[1:] if value) for row in rows
+    }
+    return tuple(centers.get(version, ()) for version in range(1, MAX_VERSION + 1))
+
+
+def parse_format_information() -> Dict[Tuple[str, int], str]:
+    """
+    Parse FormatInformation.csv into the 15 format bits per (EC level, mask number).
+    """
+    return {
+        (row["ECC Level"], int(row["Mask Pattern"])): row[
+            "Type Information Bits"
+        ].zfill(15)
+        for row in read_rows("qr_matrix/FormatInformation.csv")
+    }
+
+
+def parse_version_information() -> Dict[int, str]:
+    """
+    Parse VersionInformation.csv into the 18 version bits per version (7 and above).
+    """
+    return {
+        int(row["Version"]): row["Version Information String"].zfill(18)
+        for row in read_rows("qr_matrix/VersionInformation.csv")
+    }
+
+
+@lru_cache(maxsize=None)
+def get_spec_tables() -> SpecTables:
+    """
+    Parse all the spec tables on first call; later calls return the same read-only instance.
+    """
+    return SpecTables(
+        codewords=MappingProxyType(parse_codewords()),
+        capacities=MappingProxyType(parse_capacities()),
+        character_count_bits=MappingProxyType(parse_character_count_bits()),
+        remainder_bits=parse_remainder_bits(),
+        alignment_centers=parse_alignment_centers(),
+        format_information=MappingProxyType(parse_format_information()),
+        version_information=MappingProxyType(parse_version_information()),
+    )
+
+
+def get_codewords_record(
+    version: int, error_correction_level: ErrorCorrectionLevel
+) -> CodewordsRecord:
+    """
+    Get the block layout and EC codewords count of the given version and error correction level.
+    """
+    return get_spec_tables().codewords[(version, error_correction_level.name)]
+
+
+def find_smallest_version(
+    message_size: int, error_correction_level: ErrorCorrectionLevel, mode: str
+) -> int:
+    """
+    Bisect the capacity table for the smallest version holding message_size characters.
+    Return MAX_VERSION + 1 if none does.
+    """
+    capacities = get_spec_tables().capacities[(error_correction_level.name, mode)]
+    return bisect_left(capacities, message_size) + 1
+
+
+def get_character_count_bits(version: int, mode: str) -> int:
+    """
+    Get the length of the character count indicator.
+    """
+    return get_spec_tables().character_count_bits[mode][version - 1]
+
+
+def get_remainder_bits(version: int) -> int:
+    """
+    Get the number of remainder bits appended after the interleaved codewords.
+    """
+    return get_spec_tables().remainder_bits[version - 1]
+
+
+def get_alignment_centers(version: int) -> Tuple[int, ...]:
+    """
+    Get the alignment pattern center coordinates, empty for version 1.
+    """
+    return get_spec_tables().alignment_centers[version - 1]
+
+
+def get_format_information_bits(
+    error_correction_level: ErrorCorrectionLevel, mask_number: int
+) -> str:
+    """
+    Get the 15 format information bits.
+    """
+    return get_spec_tables().format_information[
+        (error_correction_level.name, mask_number)
+    ]
+
+
+def get_version_information_bits(version: int) -> str:
+    """
+    Get the 18 version information bits, for version >= 7.
+    """
+    return get_spec_tables().version_information[version]
@@ -0,0 +1,7 @@
+from .structured_append import (
+    StructuredAppend,
+    STRUCTURED_APPEND_HEADER_LENGTH,
+    MAX_SYMBOLS,
+    get_parity,
+    split_payload,
+)
@@ -0,0 +1,132 @@
+from typing import List, NamedTuple, Optional
+
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+from qr_code.custom_generator.qr_generator.segmentation import (
+    get_data_bits_capacity,
+    get_longest_prefix,
+)
+from qr_code.custom_generator.qr_generator.spec_tables import MAX_VERSION
+
+MAX_SYMBOLS = 16
+# Mode indicator, symbol position, symbols count and parity.
+STRUCTURED_APPEND_HEADER_LENGTH = 4 + 4 + 4 + 8
+
+
+class StructuredAppend(NamedTuple):
+    """
+    Structured Append header of one symbol of a sequence:
+    its position (from 0), the number of symbols, and the parity byte of the whole data.
+    """
+
+    position: int
+    total: int
+    parity: int
+
+
+def get_parity(url: str) -> int:
+    """
+    Get the parity byte of the whole data: all its bytes XORed together.
+    """
+    parity = 0
+    for byte in url.encode("ascii"):
+        parity ^= byte
+    return parity
+
+
+def split_payload(
+    url: str,
+    error_correction_level: ErrorCorrectionLevel,
+    max_version: int = MAX_VERSION,
+    max_symbols: int = MAX_SYMBOLS,
+) -> List[str]:
+    """
+    Split the url into the fewest parts fitting in symbols of max_version at most,
+    each with a Structured Append header.
+    Split points are then moved to balance the parts: the largest part is made
+    as small as possible, so all symbols get about the same, smallest, version.
+    """
+    if not 1 <= max_version <= MAX_VERSION:
+        raise ValueError(f"Version should be between 1 and {MAX_VERSION}.")
+    if not 1 <= max_symbols <= MAX_SYMBOLS:
+        raise ValueError(f"Symbols count should be between 1 and {MAX_SYMBOLS}.")
+
+    parts = split_greedily(
+        url=url,
+        version=max_version,
+        max_bits=get_part_bits_capacity(max_version, error_correction_level),
+    )
+    if parts is None or len(parts) > max_symbols:
+        raise ValueError(
+            f"Message size {len(url)} is too long to be supported by {max_symbols} "
+            f"symbols of version {max_version} at most "
+            f"with error correction level {error_correction_level.name}."
+        )
+    parts_count = len(parts)
+
+    # Smallest version whose capacity still splits the url in parts_count parts.
+    low, high = 1, max_version
+    while low < high:
+        middle = (low + high) // 2
+        max_bits = get_part_bits_capacity(middle, error_correction_level)
+        if fits_in_parts(url, middle, max_bits, parts_count):
+            high = middle
+        else:
+            low = middle + 1
+    version = low
+
+    # Smallest bits budget, with that version character count lengths,
+    # still splitting in parts_count parts. The previous version capacity did not.
+    low = (
+        get_part_bits_capacity(version - 1, error_correction_level) + 1
+        if version > 1
+        else 0
+    )
+    high = get_part_bits_capacity(version, error_correction_level)
+    while low < high:
+        middle = (low + high) // 2
+        if fits_in_parts(url, version, middle, parts_count):
+            high = middle
+        else:
+            low = middle + 1
+
+    return split_greedily(url=url, version=version, max_bits=low)
+
+
+def fits_in_parts(url: str, version: int, max_bits: int, parts_count: int) -> bool:
+    """
+    Check the url splits in parts_count parts at most, each taking max_bits at most.
+    """
+    parts = split_greedily(url=url, version=version, max_bits=max_bits)
+    return parts is not None and len(parts) <= parts_count
+
+
+def split_greedily(url: str, version: int, max_bits: int) -> Optional[List[str]]:
+    """
+    Split the url in order, each part being the longest one taking max_bits at most
+    with the character count indicator lengths of version. This gives the fewest parts.
+    Return None if a single character does not fit.
+    """
+    parts = []
+    start = 0
+    while start < len(url):
+        length = get_longest_prefix(url=url[start:], version=version, max_bits=max_bits)
+        if length == 0:
+            return None
+        parts.append(url[start : start + length])
+        start += length
+    return parts or [url]
+
+
+def get_part_bits_capacity(
+    version: int, error_correction_level: ErrorCorrectionLevel
+) -> int:
+    """
+    Get the number of data bits left to a part in a symbol of the given version,
+    once the Structured Append header is written.
+    """
+    return (
+        get_data_bits_capacity(version, error_correction_level)
+        - STRUCTURED_APPEND_HEADER_LENGTH
+    )
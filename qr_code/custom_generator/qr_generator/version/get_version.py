@@ -1,11 +1,10 @@
-import logging
-from pathlib import Path
-
-import pandas as pd
-
 from qr_code.custom_generator.qr_generator.error_correction_level import (
     ErrorCorrectionLevel,
 )
+from qr_code.custom_generator.qr_generator.spec_tables import (
+    MAX_VERSION,
+    find_smallest_version,
+)
 
 
 def get_version(
@@ -14,19 +13,14 @@ def get_version(
     """
     From message size, determine the QR code version to use, in {1, 40}.
     """
-    table = pd.read_csv(Path(__file__).parent / "capacityTable.csv")
-
-    try:
-        return min(
-            table.loc[
-                (table["Error Correction Level"] == error_correction_level.name)
-                & (table[mode] >= message_size),
-                "Version",
-            ]
-        )
-    except ValueError as err:
-        logging.error(err)
+    version = find_smallest_version(
+        message_size=message_size,
+        error_correction_level=error_correction_level,
+        mode=mode,
+    )
+    if version > MAX_VERSION:
         raise ValueError(
             f"Message size {message_size} is too long to be supported with mode {mode} "
             f"and error correction level {error_correction_level.name}."
-        ) from err
+        )
+    return version
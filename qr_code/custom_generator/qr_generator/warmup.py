@@ -0,0 +1,28 @@
+from typing import Iterable
+
+from qr_code.custom_generator.qr_generator.spec_tables import (
+    MAX_VERSION,
+    get_spec_tables,
+)
+from qr_code.custom_generator.qr_generator.qr_matrix import (
+    get_function_patterns,
+    get_placement_index,
+    get_mask_grids,
+)
+
+
+def warmup(versions: Iterable[int] = range(1, MAX_VERSION + 1)) -> None:
+    """
+    Build every cached table and per-version template ahead of time.
+    Call it in a pre-fork server before forking, so workers share the pages copy-on-write
+    instead of each building their own on first request.
+    """
+    get_spec_tables()
+    for version in versions:
+        if not 1 <= version <= MAX_VERSION:
+            raise ValueError(
+                f"Version should be in {{1, {MAX_VERSION}}}. Got {version}."
+            )
+        get_function_patterns(version)
+        get_placement_index(version)
+        get_mask_grids(version)
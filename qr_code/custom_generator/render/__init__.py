@@ -0,0 +1 @@
+from .render import RENDERERS, render, render_into, write_rendering
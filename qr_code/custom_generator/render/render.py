@@ -0,0 +1,71 @@
+import io
+from typing import BinaryIO
+
+import numpy as np
+
+from qr_code.custom_generator.plot_png import write_png
+from qr_code.custom_generator.plot_svg import write_svg
+
+# Output format to the function writing a matrix to a binary file object.
+RENDERERS = {
+    "png": write_png,
+    "svg": write_svg,
+}
+
+
+def write_rendering(
+    f: BinaryIO, matrix: np.array, output_format: str = "png", **options
+) -> None:
+    """
+    Render the matrix in the given format to any writable binary file object.
+    options are passed along to the format renderer (bloc_size, colors...).
+    """
+    if output_format not in RENDERERS:
+        raise ValueError(
+            f"Unknown output format {output_format}. "
+            f"Expected one of {', '.join(RENDERERS)}."
+        )
+    RENDERERS[output_format](f, matrix=matrix, **options)
+
+
+def render(matrix: np.array, output_format: str = "png", **options) -> bytes:
+    """
+    Render the matrix in the given format, returning the file content.
+    """
+    f = io.BytesIO()
+    write_rendering(f, matrix=matrix, output_format=output_format, **options)
+    return f.getvalue()
+
+
+def render_into(buffer, matrix: np.array, output_format: str = "png", **options) -> int:
+    """
+    Render the matrix in the given format into a caller-provided writable buffer
+    (bytearray, memoryview, mmap...), without intermediate copy of the whole file.
+    Return the number of bytes written. Raise ValueError if the buffer is too small.
+    """
+    f = BufferWriter(buffer)
+    write_rendering(f, matrix=matrix, output_format=output_format, **options)
+    return f.position
+
+
+class BufferWriter(io.RawIOBase):
+    """
+    Binary file object writing into a fixed-size buffer.
+    """
+
+    def __init__(self, buffer):
+        super().__init__()
+        self.view = memoryview(buffer).cast("B")
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = memoryview(data).cast("B")
+        end = self.position + len(data)
+        if end > len(self.view):
+            raise ValueError(f"Buffer of {len(self.view)} bytes is too small.")
+        self.view[self.position : end] = data
+        self.position = end
+        return len(data)
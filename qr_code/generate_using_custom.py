@@ -1,10 +1,30 @@
-from qr_code.custom_generator import generate_qr_code, plot_png
+from qr_code.custom_generator import generate_qr_code, plot_png, render
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
 
 
-def generate(url: str, output_path: str = "test_output.png") -> None:
+def generate(
+    url: str,
+    output_path: str = "test_output.png",
+    error_correction_level: ErrorCorrectionLevel = ErrorCorrectionLevel.H,
+) -> None:
     """
     Generate the QR code corresponding to the given URL
     Stores it in a png file.
     """
-    matrix = generate_qr_code(url=url)
+    matrix = generate_qr_code(url=url, error_correction_level=error_correction_level)
     plot_png(matrix=matrix, output_file=output_path)
+
+
+def generate_bytes(
+    url: str,
+    output_format: str = "png",
+    error_correction_level: ErrorCorrectionLevel = ErrorCorrectionLevel.H,
+) -> bytes:
+    """
+    Generate the QR code corresponding to the given URL
+    Returns the rendered file content, without touching the disk.
+    """
+    matrix = generate_qr_code(url=url, error_correction_level=error_correction_level)
+    return render(matrix, output_format)
@@ -1,10 +1,27 @@
 import qrcode
 
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
 
-def generate(url: str, output_path: str = "test_with_package.png") -> None:
+QRCODE_ERROR_CORRECTION = {
+    ErrorCorrectionLevel.L: qrcode.constants.ERROR_CORRECT_L,
+    ErrorCorrectionLevel.M: qrcode.constants.ERROR_CORRECT_M,
+    ErrorCorrectionLevel.Q: qrcode.constants.ERROR_CORRECT_Q,
+    ErrorCorrectionLevel.H: qrcode.constants.ERROR_CORRECT_H,
+}
+
+
+def generate(
+    url: str,
+    output_path: str = "test_with_package.png",
+    error_correction_level: ErrorCorrectionLevel = ErrorCorrectionLevel.L,
+) -> None:
     """
     Generate the QR code corresponding to the given URL
     Stores it in a png file.
     """
-    img = qrcode.make(url, error_correction=qrcode.constants.ERROR_CORRECT_L)
+    img = qrcode.make(
+        url, error_correction=QRCODE_ERROR_CORRECTION[error_correction_level]
+    )
     img.save(output_path)
@@ -0,0 +1,371 @@
+"""
+Local asyncio HTTP service generating QR code PNGs.
+
+Run from the repository root:
+    python -m qr_code.service.server --port 8080
+then request:
+    http://127.0.0.1:8080/qr?data=https://example.com&ec=H&size=10
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from qr_code.custom_generator import generate_qr_code, warmup
+from qr_code.custom_generator.render import render
+from qr_code.custom_generator.cache import ResultCache, make_png_key
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+
+MAX_BLOC_SIZE = 100
+MAX_QUIET_ZONE_SIZE = 16
+MAX_HEADER_LINES = 100
+WRITE_CHUNK_SIZE = 64 * 1024
+
+
+class BadRequest(ValueError):
+    """
+    Raised for invalid query parameters, answered with a 400.
+    """
+
+
+def render_qr_png(
+    data: str,
+    error_correction_level: str,
+    bloc_size: int,
+    quiet_zone_size: int,
+    front_color: Optional[str],
+    background_color: Optional[str],
+) -> bytes:
+    """
+    Generate and render a QR code to PNG bytes. Runs in the executor workers.
+    """
+    matrix = generate_qr_code(
+        url=data,
+        error_correction_level=ErrorCorrectionLevel[error_correction_level],
+        quiet_zone_size=quiet_zone_size,
+    )
+    return render(
+        matrix,
+        "png",
+        bloc_size=bloc_size,
+        front_color=front_color,
+        background_color=background_color,
+    )
+
+
+def parse_qr_query(query: str) -> dict:
+    """
+    Parse and check the /qr query parameters into render_qr_png keyword arguments.
+    """
+    parameters = {key: values[-1] for key, values in parse_qs(query).items()}
+    if "data" not in parameters:
+        raise BadRequest("Missing data parameter.")
+
+    error_correction_level = parameters.get("ec", "H").upper()
+    if error_correction_level not in ErrorCorrectionLevel.__members__:
+        raise BadRequest(f"Unknown error correction level {error_correction_level}.")
+
+    try:
+        bloc_size = int(parameters.get("size", 10))
+        quiet_zone_size = int(parameters.get("quiet", 4))
+    except ValueError as err:
+        raise BadRequest("size and quiet should be integers.") from err
+    if not 1 <= bloc_size <= MAX_BLOC_SIZE:
+        raise BadRequest(f"size should be in {{1, {MAX_BLOC_SIZE}}}.")
+    if not 1 <= quiet_zone_size <= MAX_QUIET_ZONE_SIZE:
+        raise BadRequest(f"quiet should be in {{1, {MAX_QUIET_ZONE_SIZE}}}.")
+
+    return {
+        "data": parameters["data"],
+        "error_correction_level": error_correction_level,
+        "bloc_size": bloc_size,
+        "quiet_zone_size": quiet_zone_size,
+        "front_color": parameters.get("fg"),
+        "background_color": parameters.get("bg"),
+    }
+
+
+def get_cache_key(render_kwargs: dict) -> str:
+    """
+    Cache key of the PNG rendered by render_qr_png with the given keyword arguments.
+    """
+    return make_png_key(
+        payload=render_kwargs["data"],
+        error_correction_level=ErrorCorrectionLevel[
+            render_kwargs["error_correction_level"]
+        ],
+        quiet_zone_size=render_kwargs["quiet_zone_size"],
+        mode=None,
+        bloc_size=render_kwargs["bloc_size"],
+        front_color=render_kwargs["front_color"],
+        background_color=render_kwargs["background_color"],
+    )
+
+
+class QRService:
+    """
+    HTTP/1.1 server offloading generation to an executor.
+    At most max_pending requests are generated or waiting for a worker at the same time,
+    further ones are answered right away with a 429.
+    With a cache, PNGs already rendered are answered without reaching the executor;
+    its disk tier is only accessed from threads, never blocking the event loop.
+    """
+
+    def __init__(
+        self, executor: Executor, max_pending: int, cache: Optional[ResultCache] = None
+    ):
+        self.executor = executor
+        self.max_pending = max_pending
+        self.cache = cache
+        self.pending = 0
+        self.counters = {"served": 0, "rejected": 0, "failed": 0}
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Serve the requests of one connection, keeping it alive unless asked otherwise.
+        """
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, target, headers = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                status, content_type, body = await self.handle_request(method, target)
+                await write_response(writer, status, content_type, body, keep_alive)
+                if not keep_alive:
+                    break
+        except BadRequest as err:
+            await write_response(
+                writer, *text_response(HTTPStatus.BAD_REQUEST, str(err)), False
+            )
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, method: str, target: str) -> Tuple[int, str, bytes]:
+        """
+        Route a request, returning its status, content type and body.
+        """
+        url = urlsplit(target)
+        if method != "GET":
+            return text_response(HTTPStatus.METHOD_NOT_ALLOWED)
+        if url.path == "/health":
+            counters = dict(self.counters)
+            if self.cache is not None:
+                counters.update(
+                    {f"cache_{key}": value for key, value in self.cache.stats.items()}
+                )
+            return text_response(
+                HTTPStatus.OK,
+                f"pending {self.pending}/{self.max_pending} "
+                + " ".join(f"{key} {value}" for key, value in counters.items()),
+            )
+        if url.path != "/qr":
+            return text_response(HTTPStatus.NOT_FOUND)
+
+        try:
+            render_kwargs = parse_qr_query(url.query)
+        except BadRequest as err:
+            return text_response(HTTPStatus.BAD_REQUEST, str(err))
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = get_cache_key(render_kwargs)
+            png_bytes = await self.get_cached(cache_key)
+            if png_bytes is not None:
+                self.counters["served"] += 1
+                return HTTPStatus.OK, "image/png", png_bytes
+
+        if self.pending >= self.max_pending:
+            self.counters["rejected"] += 1
+            return text_response(HTTPStatus.TOO_MANY_REQUESTS)
+
+        self.pending += 1
+        try:
+            png_bytes = await asyncio.get_running_loop().run_in_executor(
+                self.executor, partial(render_qr_png, **render_kwargs)
+            )
+        except ValueError as err:
+            self.counters["failed"] += 1
+            return text_response(HTTPStatus.BAD_REQUEST, str(err))
+        except BrokenExecutor:
+            self.counters["failed"] += 1
+            logging.exception("Generation executor is broken.")
+            return text_response(HTTPStatus.SERVICE_UNAVAILABLE)
+        except Exception:  # pylint: disable=broad-exception-caught
+            self.counters["failed"] += 1
+            logging.exception("Generation failed.")
+            return text_response(HTTPStatus.INTERNAL_SERVER_ERROR)
+        finally:
+            self.pending -= 1
+
+        if cache_key is not None:
+            await self.run_cache_operation(self.cache.put, cache_key, png_bytes)
+        self.counters["served"] += 1
+        return HTTPStatus.OK, "image/png", png_bytes
+
+    async def get_cached(self, cache_key: str) -> Optional[bytes]:
+        """
+        Get a cached PNG: in-memory hits are answered on the event loop,
+        the disk tier is only read from a thread.
+        """
+        png_bytes = self.cache.get_from_memory(cache_key)
+        if png_bytes is None:
+            png_bytes = await self.run_cache_operation(self.cache.get, cache_key)
+        return png_bytes
+
+    async def run_cache_operation(self, function: Callable, *args):
+        """
+        Run a cache operation, in a thread if it may block on the disk tier.
+        """
+        if self.cache.directory is None:
+            return function(*args)
+        return await asyncio.to_thread(function, *args)
+
+
+def text_response(status: HTTPStatus, message: str = None) -> Tuple[int, str, bytes]:
+    """
+    Build a plain text response, defaulting to the status phrase.
+    """
+    return status, "text/plain; charset=utf-8", (message or status.phrase).encode()
+
+
+async def read_request(
+    reader: asyncio.StreamReader,
+) -> Optional[Tuple[str, str, Dict[str, str]]]:
+    """
+    Read a request line and its headers. Return None once the client closed the connection.
+    Request bodies are not supported.
+    """
+    request_line = await read_line(reader)
+    if not request_line.strip():
+        return None
+    parts = request_line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise BadRequest("Malformed request line.")
+    method, target, _ = parts
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await read_line(reader)
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    return method, target, headers
+
+
+async def read_line(reader: asyncio.StreamReader) -> bytes:
+    """
+    Read a line, raising BadRequest if it exceeds the stream reader limit.
+    """
+    try:
+        return await reader.readline()
+    except ValueError as err:
+        raise BadRequest("Request line or header too long.") from err
+
+
+async def write_response(
+    writer: asyncio.StreamWriter,
+    status: int,
+    content_type: str,
+    body: bytes,
+    keep_alive: bool,
+) -> None:
+    """
+    Write the response headers, then stream the body in chunks, waiting for the socket to drain.
+    """
+    status = HTTPStatus(status)
+    headers = [
+        f"HTTP/1.1 {status.value} {status.phrase}",
+        f"Content-Type: {content_type}",
+        f"Content-Length: {len(body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+    ]
+    if status == HTTPStatus.TOO_MANY_REQUESTS:
+        headers.append("Retry-After: 1")
+    writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1"))
+
+    view = memoryview(body)
+    for start in range(0, len(body), WRITE_CHUNK_SIZE):
+        writer.write(view[start : (start + WRITE_CHUNK_SIZE)])
+        await writer.drain()
+    await writer.drain()
+
+
+async def serve(
+    host: str,
+    port: int,
+    workers: Optional[int],
+    queue_size: int,
+    cache: Optional[ResultCache] = None,
+) -> None:
+    """
+    Run the service until cancelled.
+    """
+    warmup()
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=warmup) as executor:
+        service = QRService(
+            executor=executor, max_pending=workers + queue_size, cache=cache
+        )
+        server = await asyncio.start_server(service.handle_connection, host, port)
+        logging.info("Serving on http://%s:%s/qr", host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    """
+    Parse command line arguments and run the service.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=32,
+        help="Requests allowed to wait for a worker before answering 429.",
+    )
+    parser.add_argument(
+        "--cache-mb",
+        type=int,
+        default=0,
+        help="Size of the in-memory PNG cache, 0 to disable caching.",
+    )
+    parser.add_argument(
+        "--cache-dir", default=None, help="Directory of the on-disk cache tier."
+    )
+    args = parser.parse_args()
+
+    cache = None
+    if args.cache_mb or args.cache_dir:
+        cache = ResultCache(max_bytes=args.cache_mb * 2**20, directory=args.cache_dir)
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(
+            serve(args.host, args.port, args.workers, args.queue_size, cache=cache)
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
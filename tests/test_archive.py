@@ -0,0 +1,122 @@
+from itertools import count
+
+import numpy as np
+import pytest
+
+from qr_code.custom_generator.archive import (
+    ArchiveReader,
+    ArchiveWriter,
+    get_payload_hash,
+)
+from qr_code.custom_generator.qr_generator import generate_qr_code
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+from qr_code.custom_generator.qr_generator.qr_matrix.get_qr_matrix import (
+    get_version_from_size,
+)
+
+# Payload, error correction level and forced mask, of versions from 1 to 40.
+SYMBOLS = [
+    ("hello", ErrorCorrectionLevel.L, 0),
+    ("https://example.com/?id=" + "0123456789" * 10, ErrorCorrectionLevel.M, 3),
+    ("Lorem ipsum dolor sit amet, " * 20, ErrorCorrectionLevel.Q, 5),
+    ("9" * 2000, ErrorCorrectionLevel.H, 7),
+    ("x" * 2900, ErrorCorrectionLevel.L, 2),
+]
+
+
+def get_payload_with_null_hash_end() -> str:
+    """
+    First payload whose hash ends with a null byte, stripped by numpy's fixed-length bytes.
+    """
+    return next(
+        payload
+        for payload in (f"payload-{number}" for number in count())
+        if get_payload_hash(payload).endswith(b"\0")
+    )
+
+
+def write_archive(path, payloads: list) -> list:
+    """
+    Archive the symbols of the payloads, return their matrices without quiet zone.
+    """
+    matrices = [generate_qr_code(payload, quiet_zone_size=0) for payload in payloads]
+    with ArchiveWriter(path) as writer:
+        for payload, matrix in zip(payloads, matrices):
+            writer.append(payload, matrix)
+    return matrices
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "symbols.qrar"
+    matrices = [
+        generate_qr_code(
+            payload, error_correction_level=level, quiet_zone_size=4, mask_number=mask
+        )
+        for payload, level, mask in SYMBOLS
+    ]
+    with ArchiveWriter(path) as writer:
+        for index, ((payload, _, _), matrix) in enumerate(zip(SYMBOLS, matrices)):
+            assert writer.append(payload, matrix) == index
+
+    with ArchiveReader(path) as reader:
+        assert len(reader) == len(SYMBOLS)
+        versions = []
+        for index, ((payload, level, mask), matrix) in enumerate(
+            zip(SYMBOLS, matrices)
+        ):
+            record = reader[index]
+            versions.append(record.version)
+            assert record.version == get_version_from_size(matrix.shape[0] - 8)
+            assert record.error_correction_level == level
+            assert record.mask_number == mask
+            assert record.payload_hash == get_payload_hash(payload)
+            assert np.array_equal(record.matrix, matrix[4:-4, 4:-4])
+            assert np.array_equal(reader.get_matrix(index, quiet_zone_size=4), matrix)
+        assert reader[-1].version == versions[-1]
+
+    assert versions[0] == 1 and versions[-1] == 40
+    assert len(set(versions)) == len(versions)
+
+
+def test_get_by_payload(tmp_path):
+    path = tmp_path / "symbols.qrar"
+    null_hash_end = get_payload_with_null_hash_end()
+    payloads = ["first", null_hash_end, "last"]
+    matrices = write_archive(path, payloads)
+
+    with ArchiveReader(path) as reader:
+        for index, payload in enumerate(payloads):
+            assert reader.find(get_payload_hash(payload)) == index
+            assert np.array_equal(
+                reader.get_by_payload(payload).matrix, matrices[index]
+            )
+        assert reader.get_by_payload("missing") is None
+        assert reader.find(get_payload_hash(null_hash_end)[:-1] + b"\1") is None
+        assert reader.find(b"\xff" * 16) is None
+
+
+def test_duplicate_payloads_give_the_first_index(tmp_path):
+    path = tmp_path / "symbols.qrar"
+    write_archive(path, ["other", "hello", "other", "hello", "hello"])
+
+    with ArchiveReader(path) as reader:
+        assert reader.find(get_payload_hash("hello")) == 1
+        assert reader.find(get_payload_hash("other")) == 0
+
+
+def test_invalid_files_are_rejected(tmp_path):
+    path = tmp_path / "symbols.qrar"
+    write_archive(path, ["hello"])
+    data = path.read_bytes()
+
+    truncated = tmp_path / "truncated.qrar"
+    truncated.write_bytes(data[:-3])
+    with pytest.raises(ValueError):
+        ArchiveReader(truncated)
+
+    wrong_magic = tmp_path / "wrong_magic.qrar"
+    wrong_magic.write_bytes(b"PNG!" + data[4:])
+    with pytest.raises(ValueError):
+        ArchiveReader(wrong_magic)
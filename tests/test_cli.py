@@ -0,0 +1,72 @@
+import argparse
+import json
+
+import pytest
+
+from qr_code.cli.generate import (
+    GenerationJob,
+    iter_items,
+    iter_lines,
+    parse_job,
+    parse_shard,
+)
+from qr_code.custom_generator.batch import BatchResult
+
+DEFAULTS = GenerationJob(
+    index=0,
+    data="",
+    error_correction_level="H",
+    quiet_zone_size=4,
+    bloc_size=10,
+    front_color=None,
+    background_color=None,
+    output_format="png",
+    name=None,
+)
+
+
+def test_parse_job_overrides_defaults():
+    job = parse_job(
+        3, json.dumps({"data": "x", "ec": "L", "format": "svg"}), True, DEFAULTS
+    )
+    assert job == DEFAULTS._replace(
+        index=3, data="x", error_correction_level="L", output_format="svg"
+    )
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        {"data": "x", "ec": ["H"]},
+        {"data": "x", "ec": {"level": "H"}},
+        {"data": "x", "format": ["png"]},
+        {"data": "x", "ec": "Z"},
+        {"data": "x", "size": 0},
+        {"data": "x", "quiet_zone": "4"},
+        {"data": "x", "name": "../x.png"},
+        {"data": "x", "other": 1},
+        {"data": 1},
+        ["x"],
+    ],
+)
+def test_invalid_records_are_reported_per_record(record):
+    lines = [(0, json.dumps({"data": "ok"})), (1, json.dumps(record)), (2, "{")]
+    items = list(iter_items(lines, jsonl=True, defaults=DEFAULTS))
+
+    assert isinstance(items[0], GenerationJob)
+    assert isinstance(items[1], BatchResult) and items[1].error.startswith("ValueError")
+    assert isinstance(items[2], BatchResult) and items[2].index == 2
+
+
+def test_shards_partition_the_input():
+    lines = [f"payload {index}\n" for index in range(10)] + ["\n"]
+    shards = [list(iter_lines(lines, (shard, 3))) for shard in range(3)]
+
+    assert sorted(index for shard in shards for index, _ in shard) == list(range(10))
+    assert shards[1] == [(1, "payload 1"), (4, "payload 4"), (7, "payload 7")]
+
+
+@pytest.mark.parametrize("value", ["3/3", "-1/2", "1", "a/b", "1/0"])
+def test_parse_shard_rejects_invalid_values(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_shard(value)
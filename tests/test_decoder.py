@@ -0,0 +1,185 @@
+import random
+
+import numpy as np
+import pytest
+
+from qr_code.custom_generator import generate_qr_code, generate_structured_append
+from qr_code.custom_generator.qr_generator.decoder import decode_qr_code
+from qr_code.custom_generator.qr_generator.decoder.decode_qr_code import (
+    hamming_distance,
+    read_format_information,
+)
+from qr_code.custom_generator.qr_generator.error_correction import correct_block
+from qr_code.custom_generator.qr_generator.error_correction.galois_field import (
+    reed_solomon_remainder,
+)
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+from qr_code.custom_generator.qr_generator.qr_matrix import get_placement_index
+from qr_code.custom_generator.qr_generator.qr_matrix.format_matrix import (
+    get_format_information_positions,
+)
+from qr_code.custom_generator.qr_generator.spec_tables import get_spec_tables
+from qr_code.custom_generator.qr_generator.structured_append import get_parity
+
+PAYLOADS = {
+    "Numeric": ["0", "0123456789" * 3, "31415926535" * 60],
+    "Alphanumeric": ["A", "HTTPS://EXAMPLE.COM/ABC-123", "QR CODE $%*+-./:" * 40],
+    "Byte": ["a", "https://example.com/?q=1", "Lorem ipsum dolor sit amet. " * 40],
+}
+
+
+@pytest.mark.parametrize("error_correction_level", list(ErrorCorrectionLevel))
+@pytest.mark.parametrize(
+    "mode, payload",
+    [(mode, payload) for mode, payloads in PAYLOADS.items() for payload in payloads],
+)
+def test_round_trip(mode, payload, error_correction_level):
+    matrix = generate_qr_code(
+        payload, error_correction_level=error_correction_level, mode=mode
+    )
+    decoded = decode_qr_code(matrix)
+
+    assert decoded.payload == payload
+    assert decoded.error_correction_level == error_correction_level
+    assert decoded.version == (matrix.shape[0] - 8 - 17) // 4
+    assert [segment.mode for segment in decoded.segments] == [mode]
+    assert decoded.corrected_codewords == 0
+
+
+@pytest.mark.parametrize("error_correction_level", list(ErrorCorrectionLevel))
+def test_round_trip_mixed_segments_over_versions(error_correction_level):
+    versions = set()
+    for length in (1, 40, 150, 500, 1200):
+        payload = ("ORDER 00123456789012 for client-" * 40)[:length]
+        matrix = generate_qr_code(
+            payload, error_correction_level=error_correction_level
+        )
+        decoded = decode_qr_code(matrix)
+        assert decoded.payload == payload
+        versions.add(decoded.version)
+    assert len(versions) == 5
+
+
+def make_block(data_count: int, ec_count: int, seed: int) -> bytes:
+    """
+    A valid block of random data codewords followed by their error correction codewords.
+    """
+    data = bytes(random.Random(seed).randrange(256) for _ in range(data_count))
+    return data + reed_solomon_remainder(data, ec_count)
+
+
+def corrupt(block: bytes, errors: int, seed: int) -> bytes:
+    """
+    Change errors codewords of the block to other values.
+    """
+    rng = random.Random(seed)
+    corrupted = bytearray(block)
+    for index in rng.sample(range(len(block)), errors):
+        corrupted[index] ^= rng.randrange(1, 256)
+    return bytes(corrupted)
+
+
+@pytest.mark.parametrize(
+    "data_count, ec_count", [(9, 17), (19, 7), (15, 30), (118, 26)]
+)
+def test_correct_block_up_to_capacity(data_count, ec_count):
+    block = make_block(data_count, ec_count, seed=data_count)
+    for errors in range(ec_count // 2 + 1):
+        data, corrected = correct_block(corrupt(block, errors, seed=errors), ec_count)
+        assert data == block[:data_count]
+        assert corrected == errors
+
+
+@pytest.mark.parametrize(
+    "data_count, ec_count", [(9, 17), (19, 7), (15, 30), (118, 26)]
+)
+def test_correct_block_fails_past_capacity(data_count, ec_count):
+    block = make_block(data_count, ec_count, seed=data_count)
+    corrupted = corrupt(block, ec_count // 2 + 1, seed=ec_count)
+    with pytest.raises(ValueError, match="Too many errors"):
+        correct_block(corrupted, ec_count)
+
+
+def flip_codewords(matrix: np.array, version: int, count: int) -> np.array:
+    """
+    Flip one bit of each of the first count codewords, in placement order.
+    """
+    flipped = matrix.copy()
+    rows, columns = get_placement_index(version)
+    for codeword in range(count):
+        position = (rows[8 * codeword], columns[8 * codeword])
+        flipped[position] = not flipped[position]
+    return flipped
+
+
+def test_decode_corrects_damaged_symbol_up_to_capacity():
+    # Version 1-H is a single block of 9 data and 17 error correction codewords.
+    matrix = generate_qr_code("HELLO", ErrorCorrectionLevel.H, quiet_zone_size=0)
+    assert matrix.shape[0] == 21
+
+    decoded = decode_qr_code(flip_codewords(matrix, version=1, count=8))
+    assert decoded.payload == "HELLO"
+    assert decoded.corrected_codewords == 8
+
+    with pytest.raises(ValueError):
+        decode_qr_code(flip_codewords(matrix, version=1, count=12))
+
+
+def flip_format_bits(matrix: np.array, copy: int, bits: int) -> np.array:
+    """
+    Flip the first bits of a copy of the format information.
+    """
+    flipped = matrix.copy()
+    for position in get_format_information_positions(matrix.shape[0])[copy][:bits]:
+        flipped[position] = not flipped[position]
+    return flipped
+
+
+@pytest.mark.parametrize("mask_number", range(8))
+def test_format_information_nearest_match(mask_number):
+    matrix = generate_qr_code(
+        "format", ErrorCorrectionLevel.Q, quiet_zone_size=0, mask_number=mask_number
+    )
+    expected = (ErrorCorrectionLevel.Q, mask_number)
+    assert read_format_information(matrix) == expected
+    # Up to 3 errors in a copy are corrected, and the other copy is used if closer.
+    assert read_format_information(flip_format_bits(matrix, 0, 3)) == expected
+    assert read_format_information(flip_format_bits(matrix, 1, 6)) == expected
+    damaged = flip_format_bits(flip_format_bits(matrix, 0, 2), 1, 3)
+    assert read_format_information(damaged) == expected
+
+
+def test_unreadable_format_information():
+    matrix = generate_qr_code("format", ErrorCorrectionLevel.Q, quiet_zone_size=0)
+    valid_bits = get_spec_tables().format_information.values()
+    # First 15 bits pattern more than 3 bits away from every valid format information.
+    far_bits = next(
+        bits
+        for bits in (format(value, "015b") for value in range(2**15))
+        if min(hamming_distance(bits, valid) for valid in valid_bits) > 3
+    )
+    for positions in get_format_information_positions(matrix.shape[0]):
+        for position, bit in zip(positions, far_bits):
+            matrix[position] = bit == "1"
+
+    with pytest.raises(ValueError, match="format information"):
+        read_format_information(matrix)
+
+
+def test_structured_append_parsing():
+    payload = "https://example.com/catalog?page=" + "0123456789abcdef" * 30
+    symbols = generate_structured_append(payload, ErrorCorrectionLevel.M, max_version=5)
+    assert len(symbols) > 1
+
+    decoded = [decode_qr_code(symbol) for symbol in symbols]
+    assert [symbol.structured_append.position for symbol in decoded] == list(
+        range(len(symbols))
+    )
+    assert {symbol.structured_append.total for symbol in decoded} == {len(symbols)}
+    assert {symbol.structured_append.parity for symbol in decoded} == {
+        get_parity(payload)
+    }
+    assert all(symbol.version <= 5 for symbol in decoded)
+    assert "".join(symbol.payload for symbol in decoded) == payload
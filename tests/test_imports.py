@@ -0,0 +1,81 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPOSITORY_ROOT = Path(__file__).resolve().parents[1]
+
+
+def run_in_fresh_interpreter(script: str) -> str:
+    """
+    Run the script in a new interpreter from the repository root, so that no module
+    is already imported, and return its stdout.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=REPOSITORY_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return completed.stdout.strip()
+
+
+@pytest.mark.parametrize(
+    "first_import",
+    [
+        "import qr_code.custom_generator.qr_generator.generate_qr_code",
+        "import qr_code.custom_generator.qr_generator.warmup",
+        "import qr_code.custom_generator.plot_png.plot_png",
+        "import qr_code.custom_generator.plot_svg.plot_svg",
+        "import qr_code.custom_generator.render.render",
+        "import qr_code.custom_generator.plot_sheet.plot_sheet",
+        "from qr_code.custom_generator.archive import ArchiveWriter",
+    ],
+)
+def test_package_exports_are_functions_after_submodule_import(first_import):
+    script = f"""
+{first_import}
+import types
+import qr_code.custom_generator as package
+from qr_code.custom_generator import qr_generator
+from qr_code.custom_generator import generate_many
+
+names = ["generate_qr_code", "warmup", "plot_png", "plot_svg", "render", "plot_sheet"]
+modules = [name for name in names if isinstance(getattr(package, name), types.ModuleType)]
+modules += [
+    name
+    for name in ["generate_qr_code", "warmup"]
+    if isinstance(getattr(qr_generator, name), types.ModuleType)
+]
+print(modules)
+print(generate_many(["hello"], workers=1)[0].error)
+"""
+    assert run_in_fresh_interpreter(script).splitlines() == ["[]", "None"]
+
+
+def test_package_import_does_not_load_rendering_dependencies():
+    script = """
+import sys
+import qr_code.custom_generator
+
+print([name for name in ("numpy", "png", "webcolors") if name in sys.modules])
+"""
+    assert run_in_fresh_interpreter(script) == "[]"
+
+
+def test_render_import_only_loads_its_renderers():
+    script = """
+import sys
+from qr_code.custom_generator import render
+
+print(
+    sorted(
+        name
+        for name in sys.modules
+        if name.endswith((".plot_sheet", ".decoder", ".segmentation", ".qr_generator"))
+    )
+)
+"""
+    assert run_in_fresh_interpreter(script) == "[]"
@@ -0,0 +1,68 @@
+import logging
+
+import pytest
+
+from qr_code.custom_generator import generate_qr_code
+from qr_code.custom_generator.instrumentation import (
+    InstrumentationSink,
+    MetricsAggregator,
+    register_sink,
+    unregister_sink,
+)
+
+
+class RecordingSink(InstrumentationSink):
+    def __init__(self):
+        self.reports = []
+
+    def emit(self, operation, duration, stages, facts) -> None:
+        self.reports.append((operation, dict(stages), dict(facts)))
+
+
+class FailingSink(InstrumentationSink):
+    def emit(self, operation, duration, stages, facts) -> None:
+        raise RuntimeError("sink is down")
+
+
+def test_successful_call_is_reported():
+    sink = RecordingSink()
+    generate_qr_code("hello", instrumentation=sink)
+
+    [(operation, stages, facts)] = sink.reports
+    assert operation == "generate_qr_code"
+    assert "mask_matrix" in stages
+    assert facts["payload_length"] == 5 and "error" not in facts
+
+
+def test_failing_call_is_reported_with_its_error():
+    sink = RecordingSink()
+    aggregator = MetricsAggregator()
+    register_sink(aggregator)
+    try:
+        with pytest.raises(ValueError):
+            generate_qr_code("x" * 5000, instrumentation=sink)
+    finally:
+        unregister_sink(aggregator)
+
+    [(operation, stages, facts)] = sink.reports
+    assert operation == "generate_qr_code"
+    assert facts["error"] == "ValueError"
+    assert "get_version" in stages and "mask_matrix" not in stages
+    assert (
+        'qr_facts_total{operation="generate_qr_code",fact="error",value="ValueError"} 1'
+        in aggregator.to_prometheus()
+    )
+
+
+def test_failing_sink_does_not_fail_the_call(caplog):
+    sink = RecordingSink()
+    failing_sink = register_sink(FailingSink())
+    try:
+        with caplog.at_level(logging.ERROR):
+            matrix = generate_qr_code("hello", instrumentation=sink)
+    finally:
+        unregister_sink(failing_sink)
+
+    assert matrix.shape == (29, 29)
+    assert len(sink.reports) == 1
+    assert "sink is down" in caplog.text
@@ -0,0 +1,71 @@
+import random
+
+import numpy as np
+import pytest
+
+from qr_code.custom_generator.qr_generator.qr_matrix import (
+    get_function_patterns,
+    get_mask_grids,
+    get_qr_matrix,
+)
+from qr_code.custom_generator.qr_generator.qr_matrix.mask_matrix import (
+    evaluate_by_2_x_2_blocks,
+    evaluate_by_finder_pattern,
+    evaluate_by_ratio,
+    evaluate_by_row_and_column,
+    get_penalty_score,
+)
+from qr_code.custom_generator.qr_generator.qr_matrix.mask_selection import (
+    MASK_STRATEGIES,
+)
+from qr_code.custom_generator.qr_generator.qr_matrix.penalty_engine import (
+    evaluate_stack_by_2_x_2_blocks,
+    evaluate_stack_by_finder_pattern,
+    evaluate_stack_by_ratio,
+    evaluate_stack_by_row_and_column,
+    get_penalty_scores,
+)
+
+VERSIONS = [1, 2, 6, 7, 14, 40]
+RULES = [
+    (evaluate_stack_by_row_and_column, evaluate_by_row_and_column),
+    (evaluate_stack_by_2_x_2_blocks, evaluate_by_2_x_2_blocks),
+    (evaluate_stack_by_finder_pattern, evaluate_by_finder_pattern),
+    (evaluate_stack_by_ratio, evaluate_by_ratio),
+]
+
+
+def get_candidates(version: int, seed: int) -> np.array:
+    """
+    Build the (8, n, n) stack of mask candidates of a symbol filled with random codewords.
+    """
+    protected_matrix = get_function_patterns(version)[1]
+    codewords_count = (protected_matrix.size - int(protected_matrix.sum())) // 8
+    matrix, _ = get_qr_matrix(
+        codewords=random.Random(seed).randbytes(codewords_count), version=version
+    )
+    return matrix ^ get_mask_grids(version)
+
+
+@pytest.mark.parametrize("version", VERSIONS)
+@pytest.mark.parametrize("engine_rule, reference_rule", RULES)
+def test_engine_rules_match_reference(version, engine_rule, reference_rule):
+    candidates = get_candidates(version, seed=version)
+    expected = [reference_rule(candidate) for candidate in candidates]
+    np.testing.assert_allclose(engine_rule(candidates), expected)
+
+
+@pytest.mark.parametrize("version", [1, 7, 21])
+def test_engine_scores_match_reference(version):
+    candidates = get_candidates(version, seed=-version)
+    expected = [get_penalty_score(candidate) for candidate in candidates]
+    np.testing.assert_allclose(get_penalty_scores(candidates), expected)
+
+
+@pytest.mark.parametrize("version", [25, 30, 40])
+@pytest.mark.parametrize("seed", range(5))
+def test_early_exit_selects_the_exhaustive_mask(version, seed):
+    candidates = get_candidates(version, seed=seed)
+    assert MASK_STRATEGIES["early_exit"](candidates) == MASK_STRATEGIES["exhaustive"](
+        candidates
+    )
@@ -0,0 +1,101 @@
+from qr_code.custom_generator.cache import ResultCache, make_png_key
+from qr_code.custom_generator.cache import result_cache
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+
+COUNTERS = ["hits", "disk_hits", "misses", "evictions"]
+
+
+def get_key(**render_options) -> str:
+    return make_png_key("hello", ErrorCorrectionLevel.H, 4, None, **render_options)
+
+
+def test_key_depends_on_every_option():
+    assert get_key() == get_key(front_color=None)
+    assert get_key() != get_key(bloc_size=5)
+    assert get_key() != make_png_key("hello", ErrorCorrectionLevel.L, 4, None)
+
+
+def test_key_depends_on_cache_format_version(monkeypatch):
+    key = get_key()
+    monkeypatch.setattr(
+        result_cache, "CACHE_FORMAT_VERSION", result_cache.CACHE_FORMAT_VERSION + 1
+    )
+    assert get_key() != key
+
+
+def test_disk_entries_of_an_older_format_are_not_served(tmp_path, monkeypatch):
+    cache = ResultCache(directory=tmp_path)
+    png = cache.get_png("hello", bloc_size=2)
+    assert ResultCache(directory=tmp_path).get_png("hello", bloc_size=2) == png
+    assert cache.stats["misses"] == 2  # The PNG and its matrix.
+
+    monkeypatch.setattr(
+        result_cache, "CACHE_FORMAT_VERSION", result_cache.CACHE_FORMAT_VERSION + 1
+    )
+    restarted = ResultCache(directory=tmp_path)
+    restarted.get_png("hello", bloc_size=2)
+    assert restarted.stats["disk_hits"] == 0
+
+
+def test_unusable_disk_tier_falls_back_to_memory(tmp_path, caplog):
+    not_a_directory = tmp_path / "file"
+    not_a_directory.write_bytes(b"")
+    cache = ResultCache(directory=not_a_directory)
+
+    png = cache.get_png("hello", bloc_size=2)
+    assert png.startswith(b"\x89PNG")
+    assert cache.get_png("hello", bloc_size=2) == png
+    assert cache.stats["misses"] == 2 and cache.stats["hits"] == 1
+    assert "Could not write cache entry" in caplog.text
+
+
+def test_unreadable_disk_entry_counts_as_a_miss(tmp_path, caplog):
+    cache = ResultCache(directory=tmp_path)
+    key = get_key()
+    cache.get_disk_path(key).mkdir(parents=True)  # A directory cannot be read as bytes.
+
+    assert cache.get(key) is None
+    assert cache.stats["misses"] == 1
+    assert "Could not read cache entry" in caplog.text
+
+
+def test_least_recently_used_entries_are_evicted_above_max_bytes():
+    cache = ResultCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"  # "b" becomes the least recently used.
+    cache.put("c", b"cccc")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa" and cache.get("c") == b"cccc"
+    assert cache.stats["bytes"] == 8 and cache.stats["entries"] == 2
+
+    cache.put("large", b"x" * 11)
+    assert cache.get("large") is None
+    assert cache.stats["entries"] == 2
+
+
+def test_counters(tmp_path):
+    cache = ResultCache(directory=tmp_path)
+    assert cache.get("key") is None
+    cache.put("key", b"value")
+    assert cache.get("key") == b"value"
+
+    restarted = ResultCache(max_bytes=5, directory=tmp_path)
+    assert restarted.get("key") == b"value"
+    restarted.put("other", b"other")
+
+    assert {name: cache.stats[name] for name in COUNTERS} == {
+        "hits": 1,
+        "disk_hits": 0,
+        "misses": 1,
+        "evictions": 0,
+    }
+    assert {name: restarted.stats[name] for name in COUNTERS} == {
+        "hits": 0,
+        "disk_hits": 1,
+        "misses": 0,
+        "evictions": 1,
+    }
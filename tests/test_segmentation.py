@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from qr_code.custom_generator.qr_generator.encode_data.encode_data import (
+    ALPHANUMERIC_CHARACTERS,
+    NUMERIC_CHARACTERS,
+)
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+from qr_code.custom_generator.qr_generator.segmentation import (
+    Segment,
+    get_data_bits_capacity,
+    get_optimal_segments,
+    get_segments_bit_length,
+    get_version_bands,
+)
+from qr_code.custom_generator.qr_generator.segmentation.segment_data import (
+    optimize_segments,
+)
+
+MODE_CHARACTERS = {
+    "Numeric": set(NUMERIC_CHARACTERS),
+    "Alphanumeric": set(ALPHANUMERIC_CHARACTERS),
+    "Byte": None,
+}
+
+
+def can_encode(mode: str, text: str) -> bool:
+    characters = MODE_CHARACTERS[mode]
+    return characters is None or set(text) <= characters
+
+
+def get_minimum_bit_length(url: str, version: int) -> int:
+    """
+    Fewest bits over every split of the url in segments, by a plain quadratic search.
+    """
+    best = [0] + [None] * len(url)
+    for end in range(1, len(url) + 1):
+        best[end] = min(
+            best[start]
+            + get_segments_bit_length([Segment(mode, url[start:end])], version)
+            for start in range(end)
+            for mode in MODE_CHARACTERS
+            if can_encode(mode, url[start:end])
+        )
+    return best[-1]
+
+
+def random_payload(rng: random.Random, length: int) -> str:
+    alphabet = rng.choice(["0123456789", "0123456789AB:/", "0123456789ABCabc-./ "])
+    return "".join(rng.choice(alphabet) for _ in range(length))
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_segments_take_the_fewest_bits(seed):
+    rng = random.Random(seed)
+    url = random_payload(rng, rng.randrange(1, 60))
+    # Character count indicator lengths only change between version bands.
+    for first_version, _ in get_version_bands():
+        segments = optimize_segments(url, first_version)
+        assert "".join(segment.text for segment in segments) == url
+        assert all(can_encode(segment.mode, segment.text) for segment in segments)
+        assert get_segments_bit_length(
+            segments, first_version
+        ) == get_minimum_bit_length(url, first_version)
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "https://example.com/order/0123456789012345678",
+        "ID 000123456789 / LOT A-77 / qty 1200000",
+        "WIFI:T:WPA;S:network;P:31415926535897932384626;;",
+    ],
+)
+def test_segments_beat_single_mode(url):
+    version, segments = get_optimal_segments(url, ErrorCorrectionLevel.M)
+    assert len(segments) > 1
+    assert get_segments_bit_length(segments, version) < get_segments_bit_length(
+        [Segment("Byte", url)], version
+    )
+
+
+def test_single_mode_payload_gives_one_segment():
+    assert get_optimal_segments("0123456789", ErrorCorrectionLevel.H)[1] == [
+        Segment("Numeric", "0123456789")
+    ]
+
+
+@pytest.mark.parametrize("error_correction_level", list(ErrorCorrectionLevel))
+def test_optimal_version_is_the_smallest_fitting(error_correction_level):
+    url = "REF 2024-0001234567 " * 20
+    version, segments = get_optimal_segments(url, error_correction_level)
+    assert get_segments_bit_length(segments, version) <= get_data_bits_capacity(
+        version, error_correction_level
+    )
+    if version > 1:
+        assert get_minimum_bit_length(url, version - 1) > get_data_bits_capacity(
+            version - 1, error_correction_level
+        )
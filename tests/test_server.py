@@ -0,0 +1,109 @@
+import asyncio
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+
+import pytest
+
+from qr_code.custom_generator.cache import ResultCache
+from qr_code.service.server import QRService
+
+QR_TARGET = "/qr?data=hello&size=2"
+
+
+def run_requests(service: QRService, *targets: str) -> list:
+    async def run():
+        return [await service.handle_request("GET", target) for target in targets]
+
+    return asyncio.run(run())
+
+
+def test_disk_cache_is_accessed_off_the_event_loop(tmp_path):
+    cache = ResultCache(directory=tmp_path)
+    disk_threads = []
+    for name in ("read_disk", "write_disk"):
+        method = getattr(cache, name)
+
+        def record_thread(*args, method=method):
+            disk_threads.append(threading.current_thread())
+            return method(*args)
+
+        setattr(cache, name, record_thread)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        service = QRService(executor=executor, max_pending=4, cache=cache)
+        first, second = run_requests(service, QR_TARGET, QR_TARGET)
+
+    assert first[0] == second[0] == HTTPStatus.OK
+    assert first[2] == second[2]
+    assert disk_threads
+    assert threading.main_thread() not in disk_threads
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+def test_memory_cache_serves_repeated_requests():
+    cache = ResultCache()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        service = QRService(executor=executor, max_pending=4, cache=cache)
+        first, second = run_requests(service, QR_TARGET, QR_TARGET)
+
+    assert first == second
+    assert first[1] == "image/png"
+    assert cache.stats["hits"] == 1
+
+
+class FailingExecutor(Executor):
+    def __init__(self, error: Exception):
+        self.error = error
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        future.set_exception(self.error)
+        return future
+
+
+@pytest.mark.parametrize(
+    "error, status",
+    [
+        (BrokenProcessPool("A worker died."), HTTPStatus.SERVICE_UNAVAILABLE),
+        (RuntimeError("Unexpected."), HTTPStatus.INTERNAL_SERVER_ERROR),
+        (ValueError("Too long."), HTTPStatus.BAD_REQUEST),
+    ],
+)
+def test_executor_errors_get_a_response(error, status):
+    service = QRService(executor=FailingExecutor(error), max_pending=4)
+    [(response_status, _, _)] = run_requests(service, QR_TARGET)
+
+    assert response_status == status
+    assert service.pending == 0 and service.counters["failed"] == 1
+
+
+def test_too_long_header_is_answered_with_400():
+    async def run():
+        service = QRService(executor=FailingExecutor(RuntimeError()), max_pending=4)
+        server = await asyncio.start_server(service.handle_connection, "127.0.0.1", 0)
+        async with server:
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(
+                b"GET /health HTTP/1.1\r\nX-Long: " + b"a" * 2**17 + b"\r\n\r\n"
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+            writer.close()
+            return status_line
+
+    assert asyncio.run(run()).startswith(b"HTTP/1.1 400")
+
+
+def test_unusable_disk_cache_still_serves(tmp_path):
+    not_a_directory = tmp_path / "file"
+    not_a_directory.write_bytes(b"")
+    cache = ResultCache(directory=not_a_directory)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        service = QRService(executor=executor, max_pending=4, cache=cache)
+        first, second = run_requests(service, QR_TARGET, QR_TARGET)
+
+    assert first[0] == second[0] == HTTPStatus.OK
+    assert first[2] == second[2]
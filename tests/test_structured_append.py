@@ -0,0 +1,58 @@
+import pytest
+
+from qr_code.custom_generator.qr_generator.error_correction_level import (
+    ErrorCorrectionLevel,
+)
+from qr_code.custom_generator.qr_generator.structured_append import (
+    MAX_SYMBOLS,
+    get_parity,
+    split_payload,
+)
+from qr_code.custom_generator.qr_generator.structured_append.structured_append import (
+    fits_in_parts,
+    get_part_bits_capacity,
+)
+
+
+def test_parity():
+    assert get_parity("") == 0
+    assert get_parity("A") == 0x41
+    assert get_parity("AB") == 0x41 ^ 0x42
+    assert get_parity("ABAB") == 0
+
+
+@pytest.mark.parametrize(
+    "url, max_version",
+    [
+        ("https://example.com/?id=" + "0123456789" * 20, 3),
+        ("Lorem ipsum dolor sit amet, " * 30, 10),
+        ("9" * 2000, 7),
+        ("short", 40),
+    ],
+    ids=["url", "text", "digits", "single"],
+)
+def test_split_parts_reassemble_to_the_payload(url, max_version):
+    error_correction_level = ErrorCorrectionLevel.Q
+    parts = split_payload(url, error_correction_level, max_version=max_version)
+
+    assert "".join(parts) == url
+    assert 1 <= len(parts) <= MAX_SYMBOLS
+    capacity = get_part_bits_capacity(max_version, error_correction_level)
+    assert not fits_in_parts(url, max_version, capacity, len(parts) - 1)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"max_version": 1, "max_symbols": 2},
+        {"max_version": 40, "max_symbols": 1, "url": "x" * 3000},
+        {"max_symbols": MAX_SYMBOLS + 1},
+        {"max_symbols": 0},
+        {"max_version": 0},
+        {"max_version": 41},
+    ],
+)
+def test_split_errors(kwargs):
+    kwargs.setdefault("url", "https://example.com/" + "a" * 200)
+    with pytest.raises(ValueError):
+        split_payload(error_correction_level=ErrorCorrectionLevel.H, **kwargs)